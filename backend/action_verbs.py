@@ -0,0 +1,190 @@
+"""
+Local action verb analyzer for ATS Resume Expert
+Counts action verb usage per resume bullet with a lemmatizing tokenizer built on ACTION_VERB_INDEX,
+so repeated verbs, their locations and the diversity score need no AI call.
+"""
+
+import re
+
+from prompts import ACTION_VERB_INDEX, ACTION_VERBS_BY_CATEGORY
+
+# A verb used at least this many times is reported as repeated
+REPEATED_VERB_THRESHOLD = 2
+
+# Replacement suggestions offered per repeated verb
+MAX_SUGGESTIONS = 3
+
+# Display names for the categories used in suggested replacements
+CATEGORY_LABELS = {
+    "management_leadership": "Management/Leadership",
+    "technical": "Technical",
+    "communication_people": "Communication",
+    "research": "Research",
+    "creative": "Creative",
+    "accomplishments": "Accomplishments",
+}
+
+# Present tense forms of the irregular verbs in the action verb list
+IRREGULAR_VERBS = {
+    "led": ["lead", "leads", "leading"],
+    "oversaw": ["oversee", "oversees", "overseeing"],
+    "spoke": ["speak", "speaks", "speaking"],
+    "wrote": ["write", "writes", "writing"],
+    "built": ["build", "builds", "building"],
+    "taught": ["teach", "teaches", "teaching"],
+    "began": ["begin", "begins", "beginning"],
+    "drew": ["draw", "draws", "drawing"],
+    "won": ["win", "wins", "winning"],
+    "set": ["set", "sets", "setting"],
+}
+
+BULLET_PATTERN = re.compile(r"^\s*(?:[-*•●▪◦‣–—·>]+|\d+[.)])\s*")
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+
+def _present_forms(base: str) -> list:
+    # base, third person and -ing forms of a verb ("manage" -> manages, managing)
+    if base.endswith("ie"):
+        ing = base[:-2] + "ying"
+    elif base.endswith("e") and not base.endswith("ee"):
+        ing = base[:-1] + "ing"
+    else:
+        ing = base + "ing"
+    if base.endswith(("s", "sh", "ch", "x", "z")):
+        third = base + "es"
+    elif base.endswith("y") and base[-2:-1] not in "aeiou":
+        third = base[:-1] + "ies"
+    else:
+        third = base + "s"
+    return [base, third, ing]
+
+
+def _base_forms(verb: str) -> list:
+    if verb.endswith("ied"):
+        return [verb[:-3] + "y"]
+    if not verb.endswith("ed"):
+        return []
+    stem = verb[:-2]
+    candidates = [stem, stem + "e"]
+    if len(stem) > 2 and stem[-1] == stem[-2] and stem[-1] not in "ls":
+        # planned -> plan, but not installed -> instal
+        candidates.append(stem[:-1])
+    return [candidate for candidate in candidates if len(candidate) > 2]
+
+
+def _build_lemma_index() -> dict:
+    """
+    Map every inflected form of an action verb to the past tense form used in ACTION_VERB_INDEX
+    """
+    lemmas = {}
+    for verb in ACTION_VERB_INDEX:
+        words = verb.split(" ")
+        if words[0] in IRREGULAR_VERBS:
+            forms = IRREGULAR_VERBS[words[0]]
+        else:
+            forms = [form for base in _base_forms(words[0]) for form in _present_forms(base)]
+        for form in forms:
+            lemmas.setdefault(" ".join([form, *words[1:]]), verb)
+    # Exact past tense forms always win over derived ones
+    lemmas.update({verb: verb for verb in ACTION_VERB_INDEX})
+    return lemmas
+
+
+# Built once at import
+VERB_LEMMAS = _build_lemma_index()
+PHRASE_VERBS = {form for form in VERB_LEMMAS if " " in form}
+
+
+def _bullet_text(line: str) -> tuple:
+    """
+    Strip bullet markers from a line
+
+    Returns:
+        Tuple of (text, whether the line started with a bullet marker)
+    """
+    match = BULLET_PATTERN.match(line)
+    if match:
+        return line[match.end():].strip(), True
+    return line.strip(), False
+
+
+def _verbs_in_bullet(tokens: list) -> list:
+    """
+    Find action verbs in a tokenized bullet. The leading word may be in any tense
+    ("Develop", "Developing"); elsewhere only the past tense form counts, so nouns
+    such as "project" or "design" are not mistaken for verbs.
+    """
+    verbs = []
+    index = 0
+    while index < len(tokens):
+        phrase = " ".join(tokens[index:index + 2])
+        forms = VERB_LEMMAS if index == 0 else ACTION_VERB_INDEX
+        if phrase in PHRASE_VERBS and (index == 0 or phrase in ACTION_VERB_INDEX):
+            verbs.append(VERB_LEMMAS[phrase])
+            index += 2
+            continue
+        if tokens[index] in forms:
+            verbs.append(VERB_LEMMAS[tokens[index]])
+        index += 1
+    return verbs
+
+
+def _suggest_replacements(verb: str, used: set) -> dict:
+    categories = ACTION_VERB_INDEX.get(verb, [])
+    category = next((name for name in categories if name in CATEGORY_LABELS), categories[0] if categories else None)
+    alternatives = []
+    for candidate in ACTION_VERBS_BY_CATEGORY.get(category, []):
+        if candidate != verb and candidate not in used and candidate not in alternatives:
+            alternatives.append(candidate)
+        if len(alternatives) == MAX_SUGGESTIONS:
+            break
+    return {
+        "original_verb": verb,
+        "suggestions": alternatives,
+        "category": CATEGORY_LABELS.get(category, "General")
+    }
+
+
+def analyze_action_verbs(resume_text: str) -> dict:
+    """
+    Count action verb usage in resume bullets
+
+    Args:
+        resume_text: Resume text extracted from the PDF
+
+    Returns:
+        Dict shaped like the parsed action_verb_analysis with repeated_verbs (including the
+        bullets each verb appears in), suggested_replacements, verb_diversity_score and verb totals
+    """
+    usage = {}
+    total = 0
+    for line in (resume_text or "").splitlines():
+        text, marked = _bullet_text(line)
+        tokens = WORD_PATTERN.findall(text.lower())
+        if not tokens:
+            continue
+        # Unmarked lines only count as bullets when they open with an action verb,
+        # because PDF extraction often drops the bullet characters
+        if not marked and tokens[0] not in VERB_LEMMAS:
+            continue
+        location = text if len(text) <= 80 else text[:77] + "..."
+        for verb in _verbs_in_bullet(tokens):
+            entry = usage.setdefault(verb, {"count": 0, "locations": []})
+            entry["count"] += 1
+            if location not in entry["locations"]:
+                entry["locations"].append(location)
+            total += 1
+
+    repeated = sorted(
+        ({"verb": verb, "count": entry["count"], "locations": entry["locations"]} for verb, entry in usage.items() if entry["count"] >= REPEATED_VERB_THRESHOLD),
+        key=lambda item: -item["count"]
+    )
+    used = set(usage)
+
+    return {
+        "repeated_verbs": repeated,
+        "suggested_replacements": [_suggest_replacements(item["verb"], used) for item in repeated],
+        "verb_diversity_score": int(len(usage) / total * 100) if total else 0,
+        "total_verbs": total,
+        "unique_verbs": len(usage)
+    }
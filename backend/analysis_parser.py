@@ -0,0 +1,279 @@
+"""
+Parser for structured AI analysis responses
+Splits the response into "## " sections in one pass and extracts fields with precompiled patterns.
+"""
+
+import re
+
+from prompts import ACTION_VERB_INDEX
+
+# Section headers the parser understands, as they appear after "## " in the response
+SECTION_HEADERS = [
+    "KEYWORD ANALYSIS",
+    "SECTION-WISE SCORING",
+    "JOB REQUIREMENTS ANALYSIS",
+    "TECHNICAL SKILLS MATCHING",
+    "EXPERIENCE MATCHING",
+    "WORK EXPERIENCE REQUIREMENTS",
+    "EXPERIENCE MATCH PERCENTAGE",
+    "OVERALL MATCH SCORE",
+    "ACTION VERB REPETITION ANALYSIS",
+]
+
+# These sections run to the end of the response (or a repeat of their own header) instead of stopping at the next "##"
+OPEN_ENDED_SECTIONS = {"EXPERIENCE MATCH PERCENTAGE", "OVERALL MATCH SCORE"}
+
+HEADER_PATTERN = re.compile("## (" + "|".join(re.escape(header) for header in SECTION_HEADERS) + ")")
+NUMBER_PATTERN = re.compile(r"\d+")
+
+
+def _line_pattern(label):
+    # Captures the rest of the line after the label
+    return re.compile(re.escape(label) + r"([^\n]*)")
+
+
+# Simple fields: (section header, result group, field name, label, kind)
+# kind is "list" (comma separated), "percent" (X%), "score" (X/100), "text" or "yes_no"
+FIELD_TABLE = [
+    ("KEYWORD ANALYSIS", "keyword_analysis", "keywords_found", "**Job Description Keywords Found**:", "list"),
+    ("KEYWORD ANALYSIS", "keyword_analysis", "missing_keywords", "**Missing Keywords**:", "list"),
+    ("KEYWORD ANALYSIS", "keyword_analysis", "match_score", "**Keyword Match Score**:", "percent"),
+    ("TECHNICAL SKILLS MATCHING", "technical_skills_matching", "required_skills", "**Required Technical Skills**:", "list"),
+    ("TECHNICAL SKILLS MATCHING", "technical_skills_matching", "matched_skills", "**Matched Technical Skills**:", "list"),
+    ("TECHNICAL SKILLS MATCHING", "technical_skills_matching", "missing_skills", "**Missing Technical Skills**:", "list"),
+    ("TECHNICAL SKILLS MATCHING", "technical_skills_matching", "match_percentage", "**Technical Skills Match Percentage**:", "percent"),
+    ("EXPERIENCE MATCHING", "work_experience_matching", "matched_experience", "**Matched Experience**:", "list"),
+    ("EXPERIENCE MATCHING", "work_experience_matching", "missing_experience", "**Missing Experience**:", "list"),
+    ("EXPERIENCE MATCHING", "work_experience_matching", "experience_level_match", "**Experience Level Match**:", "text"),
+    ("EXPERIENCE MATCHING", "work_experience_matching", "years_experience_match", "**Years Experience Match**:", "yes_no"),
+    ("EXPERIENCE MATCHING", "work_experience_matching", "industry_relevance", "**Industry Relevance Score**:", "score"),
+    ("WORK EXPERIENCE REQUIREMENTS", "work_experience_matching", "required_experience", "**Required Experience Areas**:", "list"),
+    ("EXPERIENCE MATCH PERCENTAGE", "work_experience_matching", "match_percentage", "**Overall Experience Match**:", "percent"),
+    ("OVERALL MATCH SCORE", "overall", "overall_score", "**Total Match Percentage**:", "percent"),
+]
+
+# Fields grouped by section with their compiled patterns
+FIELDS_BY_SECTION = {}
+for section, group, name, label, kind in FIELD_TABLE:
+    FIELDS_BY_SECTION.setdefault(section, []).append((group, name, label, _line_pattern(label), kind))
+
+# Scored sections: (name in the response, result key, default when no score is found)
+SECTION_SCORE_TABLE = [
+    ("Professional Summary", "professional_summary", 70),
+    ("Technical Skills", "technical_skills", 75),
+    ("Work Experience", "work_experience", 80),
+    ("Education", "education", 85),
+    ("Projects", "projects", 70),
+    ("Certifications", "certifications", 60),
+    ("Soft Skills", "soft_skills", 75),
+]
+
+JOB_REQUIREMENT_SCORE_TABLE = [
+    ("Technical Skills Requirements", "technical_skills", 85),
+    ("Work Experience Requirements", "work_experience", 80),
+    ("Education Requirements", "education", 75),
+    ("Project Requirements", "projects", 70),
+    ("Certification Requirements", "certifications", 60),
+    ("Soft Skills Requirements", "soft_skills", 75),
+]
+
+
+def _score_patterns(name):
+    # Tried in order until one yields a number
+    labels = [f"**{name}**:", f"- **{name}**:", f"*{name}*:", f"{name}:", f"**{name}**"]
+    return [(label, _line_pattern(label)) for label in labels]
+
+
+SCORE_PATTERNS = {name: _score_patterns(name) for name, _, _ in SECTION_SCORE_TABLE + JOB_REQUIREMENT_SCORE_TABLE}
+
+ACTION_VERB_LABELS = {
+    "repeated": "**Repeated Action Verbs**:",
+    "suggestions": "**Verb Replacement Suggestions**:",
+    "diversity": "**Verb Diversity Score**:",
+    "improvement": "**Improvement Suggestions**:",
+}
+ACTION_VERB_PATTERNS = {key: _line_pattern(label) for key, label in ACTION_VERB_LABELS.items()}
+
+# Replacement verb categories, checked in order
+SUGGESTION_CATEGORIES = [
+    ("management_leadership", "Management/Leadership"),
+    ("technical", "Technical"),
+    ("communication_people", "Communication"),
+    ("research", "Research"),
+    ("creative", "Creative"),
+    ("accomplishments", "Accomplishments"),
+]
+
+EMPTY_VALUES = ("None", "N/A")
+
+
+def split_sections(analysis_text):
+    """
+    Find the body of every known section in a single pass
+
+    Args:
+        analysis_text: Full AI analysis response
+
+    Returns:
+        Dict mapping section header to the (start, end) span of its body
+    """
+    spans = {}
+    for match in HEADER_PATTERN.finditer(analysis_text):
+        header = match.group(1)
+        if header in spans:
+            continue
+        start = match.end()
+        end = analysis_text.find(match.group(0) if header in OPEN_ENDED_SECTIONS else "##", start)
+        spans[header] = (start, len(analysis_text) if end == -1 else end)
+    return spans
+
+
+def _field_value(text, span, label, pattern):
+    match = pattern.search(text, *span)
+    if match is None:
+        return None
+    return match.group(1).replace(label, "")
+
+
+def _convert(value, kind):
+    if kind == "list":
+        value = value.strip()
+        return value.split(", ") if value else []
+    if kind == "percent":
+        value = value.replace("%", "").strip()
+        return int(value) if value.isdigit() else 0
+    if kind == "score":
+        value = value.replace("/100", "").strip()
+        return int(value) if value.isdigit() else 0
+    if kind == "yes_no":
+        return value.strip().lower() == "yes"
+    return value.strip()
+
+
+def _extract_fields(text, spans, header, results):
+    for group, name, label, pattern, kind in FIELDS_BY_SECTION[header]:
+        value = _field_value(text, spans[header], label, pattern)
+        if value is not None:
+            results[group][name] = _convert(value, kind)
+
+
+def _extract_scores(text, span, table, scores):
+    for name, key, default in table:
+        scores[key] = default
+        for label, pattern in SCORE_PATTERNS[name]:
+            value = _field_value(text, span, label, pattern)
+            if value is None:
+                continue
+            number = NUMBER_PATTERN.search(value.replace("/100", ""))
+            if number:
+                scores[key] = int(number.group())
+                break
+
+
+def _suggestion_category(alternatives):
+    # One dict lookup per alternative instead of a list scan per category
+    matched = {category_key for alt in alternatives for category_key in ACTION_VERB_INDEX.get(alt, ())}
+    for category_key, category in SUGGESTION_CATEGORIES:
+        if category_key in matched:
+            return category
+    return "General"
+
+
+def _extract_action_verbs(text, span, action_verb_analysis):
+    repeated_verbs_text = _field_value(text, span, ACTION_VERB_LABELS["repeated"], ACTION_VERB_PATTERNS["repeated"])
+    if repeated_verbs_text is not None:
+        repeated_verbs_text = repeated_verbs_text.strip()
+        if repeated_verbs_text and repeated_verbs_text not in EMPTY_VALUES:
+            # Format: "verb1 (count1), verb2 (count2)"
+            repeated_verbs = []
+            for entry in repeated_verbs_text.split(", "):
+                if "(" in entry and ")" in entry:
+                    verb = entry.split("(")[0].strip()
+                    count_str = entry.split("(")[1].split(")")[0].strip()
+                    count = int(count_str) if count_str.isdigit() else 1
+                    repeated_verbs.append({"verb": verb, "count": count, "locations": []})
+            action_verb_analysis["repeated_verbs"] = repeated_verbs
+
+    suggestions_content = _field_value(text, span, ACTION_VERB_LABELS["suggestions"], ACTION_VERB_PATTERNS["suggestions"])
+    if suggestions_content is not None:
+        suggestions_content = suggestions_content.strip()
+        if suggestions_content and suggestions_content not in EMPTY_VALUES:
+            # Format: "verb1: suggestion1, suggestion2; verb2: suggestion3"
+            suggestions = []
+            for entry in suggestions_content.split("; "):
+                if ":" in entry:
+                    parts = entry.split(":")
+                    alternatives = [alt.strip() for alt in parts[1].strip().split(",")]
+                    suggestions.append({
+                        "original_verb": parts[0].strip(),
+                        "suggestions": alternatives,
+                        "category": _suggestion_category(alternatives)
+                    })
+            action_verb_analysis["suggested_replacements"] = suggestions
+
+    diversity_value = _field_value(text, span, ACTION_VERB_LABELS["diversity"], ACTION_VERB_PATTERNS["diversity"])
+    if diversity_value is not None:
+        action_verb_analysis["verb_diversity_score"] = _convert(diversity_value, "score")
+
+    improvement_content = _field_value(text, span, ACTION_VERB_LABELS["improvement"], ACTION_VERB_PATTERNS["improvement"])
+    if improvement_content is not None:
+        improvement_content = improvement_content.strip()
+        if improvement_content and improvement_content not in EMPTY_VALUES:
+            action_verb_analysis["improvement_suggestions"] = improvement_content.split(", ")
+
+
+def parse_analysis_response(analysis_text):
+    """
+    Parse the structured analysis response to extract keyword analysis, section scores, overall score, technical skills matching, work experience matching, and action verb analysis
+    """
+    results = {
+        "keyword_analysis": {},
+        "section_scores": {},
+        "job_requirements_scores": {},
+        "overall": {},
+        "technical_skills_matching": {},
+        "work_experience_matching": {},
+        "action_verb_analysis": {},
+    }
+
+    try:
+        spans = split_sections(analysis_text)
+
+        if "KEYWORD ANALYSIS" in spans:
+            _extract_fields(analysis_text, spans, "KEYWORD ANALYSIS", results)
+
+        if "SECTION-WISE SCORING" in spans:
+            _extract_scores(analysis_text, spans["SECTION-WISE SCORING"], SECTION_SCORE_TABLE, results["section_scores"])
+
+        if "JOB REQUIREMENTS ANALYSIS" in spans:
+            _extract_scores(analysis_text, spans["JOB REQUIREMENTS ANALYSIS"], JOB_REQUIREMENT_SCORE_TABLE, results["job_requirements_scores"])
+
+        if "TECHNICAL SKILLS MATCHING" in spans:
+            technical_skills_matching = results["technical_skills_matching"]
+            _extract_fields(analysis_text, spans, "TECHNICAL SKILLS MATCHING", results)
+            if "match_percentage" not in technical_skills_matching:
+                # Fallback: calculate match percentage from matched vs required skills
+                required_skills = technical_skills_matching.get("required_skills", [])
+                matched_skills = technical_skills_matching.get("matched_skills", [])
+                if required_skills and matched_skills:
+                    technical_skills_matching["match_percentage"] = int((len(matched_skills) / len(required_skills)) * 100)
+
+        for header in ["EXPERIENCE MATCHING", "WORK EXPERIENCE REQUIREMENTS", "EXPERIENCE MATCH PERCENTAGE", "OVERALL MATCH SCORE"]:
+            if header in spans:
+                _extract_fields(analysis_text, spans, header, results)
+
+        if "ACTION VERB REPETITION ANALYSIS" in spans:
+            _extract_action_verbs(analysis_text, spans["ACTION VERB REPETITION ANALYSIS"], results["action_verb_analysis"])
+
+    except Exception as e:
+        print(f"Error parsing analysis response: {e}")
+
+    return (
+        results["keyword_analysis"],
+        results["section_scores"],
+        results["job_requirements_scores"],
+        results["overall"].get("overall_score"),
+        results["technical_skills_matching"],
+        results["work_experience_matching"],
+        results["action_verb_analysis"],
+    )
@@ -0,0 +1,78 @@
+"""
+Tiered analysis policy for ATS Resume Expert
+Scores a resume locally (skills, keywords, resume sections and semantic similarity) into a
+provisional overall score, then decides whether that is enough, whether a smaller model should
+write the analysis, or whether it needs the full model. Clear mismatches never reach the AI.
+"""
+
+from typing import Optional
+
+TIER_LOCAL = "local"
+TIER_LIGHT = "light"
+TIER_FULL = "full"
+
+# Share of the provisional score from technical skills matched, keywords matched, resume sections
+# present and semantic similarity. Skills are left out (and the rest rescaled) when the job
+# description names no known skills.
+PROVISIONAL_WEIGHTS = {"skills": 0.45, "keywords": 0.25, "sections": 0.1, "semantic": 0.2}
+
+# Sections an ATS expects every resume to have
+EXPECTED_SECTIONS = ("experience", "skills", "education")
+
+
+def provisional_score(local_match: dict, sections: dict, semantic_score: int) -> int:
+    """
+    Combine local matching results into a provisional overall score
+
+    Args:
+        local_match: Result of skills_matcher.match_resume
+        sections: Section map from resume_sections.segment_resume
+        semantic_score: semantic_match_score of the resume and job description
+
+    Returns:
+        Score from 0 to 100
+    """
+    skills = local_match["technical_skills_matching"]
+    weights = dict(PROVISIONAL_WEIGHTS)
+    if not skills["required_skills"]:
+        weights["skills"] = 0
+    shares = {
+        "skills": skills["match_percentage"] / 100,
+        "keywords": local_match["keyword_analysis"]["match_score"] / 100,
+        "sections": sum(1 for section in EXPECTED_SECTIONS if sections.get(section)) / len(EXPECTED_SECTIONS),
+        "semantic": semantic_score / 100,
+    }
+    score = sum(weights[name] * shares[name] for name in weights) / sum(weights.values())
+    return int(round(score * 100))
+
+
+class TierPolicy:
+    """
+    Thresholds on the provisional score: below local_below the local result is returned,
+    below light_below the analysis goes to light_model, and anything else to the full model.
+    A threshold of 0 (or no light_model) turns that tier off.
+    """
+
+    def __init__(self, local_below: int = 0, light_below: int = 0, light_model: Optional[str] = None):
+        self.local_below = local_below
+        self.light_below = light_below
+        self.light_model = light_model or None
+
+    @property
+    def enabled(self) -> bool:
+        return self.local_below > 0 or (self.light_model is not None and self.light_below > 0)
+
+    def choose(self, score: int) -> str:
+        if score < self.local_below:
+            return TIER_LOCAL
+        if self.light_model is not None and score < self.light_below:
+            return TIER_LIGHT
+        return TIER_FULL
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "local_below": self.local_below,
+            "light_below": self.light_below,
+            "light_model": self.light_model
+        }
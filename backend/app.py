@@ -1,21 +1,231 @@
+import asyncio
 import base64
-import io
+import contextvars
+import hashlib
+import json
+import math
+import re
+import threading
+import time
+import zipfile
 from dotenv import load_dotenv
 load_dotenv()
 
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Query
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import os
-import PyPDF2 as pdf
-import google.generativeai as genai
-from typing import Optional
-from prompts import get_prompt, get_available_categories, PROMPT_CATEGORIES, ACTION_VERBS_BY_CATEGORY, ALL_ACTION_VERBS
+from typing import Dict, List, Optional
+from prompts import get_prompt, get_prompt_sections, get_available_categories, PROMPT_CATEGORIES, ACTION_VERBS_BY_CATEGORY, ALL_ACTION_VERBS
+from cache import LRUCache, SingleFlight, make_cache_key, normalize_text
+from model_pool import ModelPool
+from analysis_parser import parse_analysis_response
+from pdf_extract import PDF_MAX_BYTES, PdfLimitError, extract_pdf_text_async
+from jobs import InMemoryJobStore, JobManager, SQLiteJobStore
+from skills_matcher import match_resume
+from action_verbs import analyze_action_verbs
+from metrics import MetricsRegistry
+from token_budget import count_tokens, fit_to_budget
+from resume_sections import segment_resume, select_sections
+from candidate_index import CandidateIndex
+from analysis_tiers import TIER_LIGHT, TIER_LOCAL, TierPolicy, provisional_score
+from incremental import LOCAL_FIELDS, affected_fields, change_ratio, changed_sections, reanalysis_targets, rematch_fields, target_sections
+from embeddings import VectorCache, embed_resume, load_embedder, semantic_match_score
+from rate_limiter import BATCH, INTERACTIVE, RateLimiter, RateLimitExceeded
+from structured_output import ANALYSIS_SCHEMAS, StructuredOutputError, build_field_update_prompt, build_repair_prompt, field_update_schema, json_output_instructions, parse_structured_output, refresh_markdown_fields, structured_fields, to_markdown
 
 # API key will be configured per request
 
-app = FastAPI(title="ATS Resume Expert", description="AI-powered resume analysis system")
+# Limit on concurrent LLM calls per worker and per-call timeout (seconds)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "120"))
+llm_semaphore = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+
+MODEL_NAME = "models/gemma-3-27b-it"
+
+# "json" asks the model for JSON matching the analysis type's schema in structured_output.ANALYSIS_SCHEMAS instead of markdown
+ANALYSIS_OUTPUT_FORMAT = os.getenv("ANALYSIS_OUTPUT_FORMAT", "markdown").lower()
+# Gemma models have no JSON mode, so for them the schema is enforced by the prompt and local validation only
+def json_generation_config(model_name, schema):
+    return {"response_mime_type": "application/json", "response_schema": schema} if model_name.startswith("models/gemini") else None
+
+# Serve local keyword/skills matching instead of an error when the AI call times out
+LOCAL_FALLBACK_ON_TIMEOUT = os.getenv("LOCAL_FALLBACK_ON_TIMEOUT", "false").lower() == "true"
+
+# Model clients are bound to one API key each and reused across requests
+model_pool = ModelPool(
+    MODEL_NAME,
+    max_clients=int(os.getenv("MODEL_POOL_SIZE", "64")),
+    idle_seconds=float(os.getenv("MODEL_POOL_IDLE_SECONDS", "900"))
+)
+
+# Tiered analysis of structured analysis types: resumes whose provisional local score is below
+# TIER_LOCAL_BELOW get the local result only, and below TIER_LIGHT_BELOW are analyzed by
+# TIER_LIGHT_MODEL instead of MODEL_NAME (0 or an empty model turns a tier off)
+tier_policy = TierPolicy(
+    local_below=int(os.getenv("TIER_LOCAL_BELOW", "0")),
+    light_below=int(os.getenv("TIER_LIGHT_BELOW", "0")),
+    light_model=os.getenv("TIER_LIGHT_MODEL")
+)
+model_pools = {MODEL_NAME: model_pool}
+if tier_policy.light_model and tier_policy.light_model != MODEL_NAME:
+    model_pools[tier_policy.light_model] = ModelPool(
+        tier_policy.light_model,
+        max_clients=int(os.getenv("MODEL_POOL_SIZE", "64")),
+        idle_seconds=float(os.getenv("MODEL_POOL_IDLE_SECONDS", "900"))
+    )
+
+# Rows kept in each SQLite cache tier; expired and surplus rows are swept periodically
+CACHE_DB_MAX_ENTRIES = int(os.getenv("CACHE_DB_MAX_ENTRIES", "100000"))
+
+# Cache of AI analysis text keyed by (resume, job description, prompt, model)
+result_cache = LRUCache(
+    max_entries=int(os.getenv("RESULT_CACHE_SIZE", "256")),
+    ttl_seconds=float(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600")),
+    db_path=os.getenv("RESULT_CACHE_DB"),
+    max_disk_entries=CACHE_DB_MAX_ENTRIES,
+    table="analysis_results"
+)
+
+# Cache of extracted PDF text keyed by the SHA-256 of the uploaded bytes
+pdf_text_cache = LRUCache(
+    max_entries=int(os.getenv("PDF_CACHE_SIZE", "512")),
+    ttl_seconds=float(os.getenv("PDF_CACHE_TTL_SECONDS", "86400")),
+    db_path=os.getenv("PDF_CACHE_DB"),
+    max_disk_entries=CACHE_DB_MAX_ENTRIES,
+    table="pdf_text"
+)
+
+# Section map of each resume (JSON), keyed by its exact text: headers are found by line, so
+# whitespace normalization would give a pasted single-line copy the map of the original
+section_cache = LRUCache(
+    max_entries=int(os.getenv("SECTION_CACHE_SIZE", "512")),
+    ttl_seconds=float(os.getenv("SECTION_CACHE_TTL_SECONDS", "86400"))
+)
+
+# Local sentence embedding model loaded from EMBEDDING_MODEL_PATH, or feature hashing when it is unset
+embedder = load_embedder(os.getenv("EMBEDDING_MODEL_PATH"))
+
+# Local embeddings of resumes and job descriptions keyed by a hash of their text, memory-mapped
+# from a subdirectory of EMBEDDING_CACHE_DIR per embedder (vectors of different models never mix)
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR")
+embedding_cache = VectorCache(
+    os.path.join(EMBEDDING_CACHE_DIR, embedder.name) if EMBEDDING_CACHE_DIR else None,
+    max_entries=int(os.getenv("EMBEDDING_CACHE_SIZE", "100000")),
+    dim=embedder.dim
+)
+
+# Last full analysis of each (resume_id, analysis type, job description), so small resume edits
+# are re-analyzed incrementally; kept in SQLite when ANALYSIS_HISTORY_DB is set
+analysis_history = LRUCache(
+    max_entries=int(os.getenv("ANALYSIS_HISTORY_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("ANALYSIS_HISTORY_TTL_SECONDS", "86400")),
+    db_path=os.getenv("ANALYSIS_HISTORY_DB"),
+    max_disk_entries=CACHE_DB_MAX_ENTRIES,
+    table="analysis_history"
+)
+# Largest share of edited words re-analyzed incrementally; bigger edits get a full analysis
+INCREMENTAL_MAX_CHANGE = float(os.getenv("INCREMENTAL_MAX_CHANGE", "0.2"))
+
+# Results of /validate-api-key keyed by a hash of the key; invalid keys are re-checked sooner
+valid_key_cache = LRUCache(
+    max_entries=int(os.getenv("API_KEY_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("API_KEY_VALID_TTL_SECONDS", "3600"))
+)
+invalid_key_cache = LRUCache(
+    max_entries=int(os.getenv("API_KEY_CACHE_SIZE", "1024")),
+    ttl_seconds=float(os.getenv("API_KEY_INVALID_TTL_SECONDS", "300"))
+)
+# Concurrent validations of the same key share one upstream call
+key_validations = SingleFlight()
+
+# Identical analyses in flight at the same time (double submits, batch duplicates) share one AI call
+analysis_flights = SingleFlight()
+
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Estimated prompt tokens allowed per analysis; longer resumes and job descriptions are trimmed (0 only cleans them)
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "8000"))
+
+# Batch screening limits
+BATCH_MAX_FILES = int(os.getenv("BATCH_MAX_FILES", "500"))
+BATCH_MAX_ARCHIVE_BYTES = int(os.getenv("BATCH_MAX_ARCHIVE_BYTES", str(200 * 1024 * 1024)))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "8"))
+BATCH_MAX_RETRIES = int(os.getenv("BATCH_MAX_RETRIES", "3"))
+
+# Per-API-key pacing of Gemini calls with backoff on quota errors (GEMINI_REQUESTS_PER_MINUTE=0 disables pacing).
+# Interactive requests go ahead of batch and background work and get a 429 with Retry-After
+# instead of waiting longer than LLM_MAX_WAIT_SECONDS.
+rate_limiter = RateLimiter(
+    requests_per_minute=float(os.getenv("GEMINI_REQUESTS_PER_MINUTE", "30")),
+    burst=float(os.getenv("GEMINI_BURST", "5")),
+    backoff_base_seconds=float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "2")),
+    backoff_max_seconds=float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "60")),
+    max_retries={INTERACTIVE: int(os.getenv("LLM_MAX_RETRIES", "2")), BATCH: BATCH_MAX_RETRIES},
+    max_wait_seconds={INTERACTIVE: float(os.getenv("LLM_MAX_WAIT_SECONDS", "10")), BATCH: float(os.getenv("LLM_BATCH_MAX_WAIT_SECONDS", "300"))}
+)
+
+# Background analysis jobs, stored in SQLite when JOB_STORE_DB is set
+job_manager = JobManager(
+    SQLiteJobStore(os.getenv("JOB_STORE_DB")) if os.getenv("JOB_STORE_DB") else InMemoryJobStore(),
+    max_workers=int(os.getenv("JOB_WORKERS", "4")),
+    result_ttl_seconds=float(os.getenv("JOB_RESULT_TTL_SECONDS", "3600"))
+)
+
+# Ingested resumes for ranking against new job descriptions, stored in SQLite when CANDIDATE_INDEX_DB is set
+candidate_index = CandidateIndex(os.getenv("CANDIDATE_INDEX_DB"), embedder)
+# Largest shortlist one ranking request may return or send to the AI
+CANDIDATE_MAX_TOP_K = int(os.getenv("CANDIDATE_MAX_TOP_K", "200"))
+
+# Metrics exposed at /metrics in the Prometheus text format
+metrics = MetricsRegistry()
+STAGE_SECONDS = metrics.histogram("ats_stage_duration_seconds", "Time spent in each stage of the analysis pipeline", ["stage", "analysis_type", "outcome"])
+LLM_TOKENS = metrics.counter("ats_llm_tokens_total", "Tokens reported by Gemini usage metadata", ["kind"])
+LLM_IN_FLIGHT = metrics.gauge("ats_llm_requests_in_flight", "Gemini calls currently holding the LLM concurrency semaphore")
+ANALYSIS_TIERS = metrics.counter("ats_analysis_tier_total", "Analyses answered by each tier (local, light or full model)", ["tier"])
+INCREMENTAL_ANALYSES = metrics.counter("ats_incremental_analysis_total", "Analyses with an earlier version of the resume, by whether they were updated incrementally or run in full", ["result"])
+TIER_SECONDS = metrics.histogram("ats_analysis_tier_duration_seconds", "Time to produce an analysis in each tier", ["tier", "outcome"])
+HTTP_IN_FLIGHT = metrics.gauge("ats_http_requests_in_flight", "HTTP requests currently being handled")
+HTTP_REQUESTS = metrics.counter("ats_http_requests_total", "HTTP requests handled", ["method", "route", "status"])
+STRUCTURED_REPAIRS = metrics.counter("ats_structured_output_repairs_total", "JSON analyses that failed validation and were sent back for repair", ["result"])
+PROMPT_TOKENS = metrics.counter("ats_prompt_tokens_total", "Estimated prompt tokens before (original) and after (sent) token budgeting", ["kind"])
+
+# Cache, client pool and job counters are read from their own stats at scrape time
+CACHES = {"result": result_cache, "pdf_text": pdf_text_cache, "sections": section_cache, "analysis_history": analysis_history, "api_key_valid": valid_key_cache, "api_key_invalid": invalid_key_cache}
+metrics.callback("ats_cache_hits_total", "counter", "Cache lookups served from memory or the SQLite tier", lambda: [
+    ({"cache": name, "tier": tier}, cache.stats()[field]) for name, cache in CACHES.items() for tier, field in (("memory", "hits"), ("disk", "disk_hits"))
+])
+metrics.callback("ats_cache_misses_total", "counter", "Cache lookups that found nothing", lambda: [({"cache": name}, cache.stats()["misses"]) for name, cache in CACHES.items()])
+metrics.callback("ats_cache_entries", "gauge", "Entries held in memory by each cache", lambda: [({"cache": name}, cache.stats()["entries"]) for name, cache in CACHES.items()])
+metrics.callback("ats_model_clients", "gauge", "Gemini clients held by the model pool", lambda: [({}, model_pool.stats()["clients"])])
+metrics.callback("ats_llm_rate_limited_total", "counter", "Gemini quota errors", lambda: [({}, rate_limiter.stats()["rate_limited"])])
+metrics.callback("ats_llm_retries_total", "counter", "Gemini calls retried after a quota error", lambda: [({}, rate_limiter.stats()["retries"])])
+metrics.callback("ats_llm_shed_total", "counter", "Gemini calls rejected with a 429 instead of waiting for the rate limit", lambda: [({}, rate_limiter.stats()["shed"])])
+metrics.callback("ats_llm_waiting", "gauge", "Gemini calls waiting for the per-key rate limit", lambda: [
+    ({"lane": "interactive"}, rate_limiter.stats()["waiting_interactive"]), ({"lane": "batch"}, rate_limiter.stats()["waiting_batch"])
+])
+metrics.callback("ats_analysis_deduplicated_total", "counter", "Analyses that joined an identical analysis already in flight", lambda: [({}, analysis_flights.stats()["shared"])])
+metrics.callback("ats_jobs_active", "gauge", "Background analysis jobs queued or running", lambda: [({}, job_manager.stats()["active_jobs"])])
+
+# Analysis type recorded on stage metrics for the current request
+current_analysis_type = contextvars.ContextVar("current_analysis_type", default="none")
+
+def time_stage(stage):
+    return STAGE_SECONDS.time(stage=stage, analysis_type=current_analysis_type.get())
+
+class MetricsJSONResponse(JSONResponse):
+    """
+    JSONResponse that records JSON rendering of analysis responses as the serialize stage
+    """
+
+    def render(self, content):
+        if current_analysis_type.get() == "none":
+            return super().render(content)
+        with time_stage("serialize"):
+            return super().render(content)
+
+app = FastAPI(title="ATS Resume Expert", description="AI-powered resume analysis system", default_response_class=MetricsJSONResponse)
 
 # Configure CORS
 app.add_middleware(
@@ -26,12 +236,27 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def track_requests(request: Request, call_next):
+    HTTP_IN_FLIGHT.inc()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        HTTP_IN_FLIGHT.dec()
+        # Label by route template so /jobs/{job_id} does not create one series per job
+        route = request.scope.get("route")
+        HTTP_REQUESTS.inc(method=request.method, route=getattr(route, "path", "unmatched"), status=status)
+
 
 class ResumeAnalysisRequest(BaseModel):
     job_description: str
     resume_text: str
     analysis_type: Optional[str] = "comprehensive_analysis"
     api_key: Optional[str] = None
+    resume_id: Optional[str] = None
 
 class ResumeAnalysisResponse(BaseModel):
     analysis: str
@@ -44,6 +269,11 @@ class ResumeAnalysisResponse(BaseModel):
     technical_skills_matching: Optional[dict] = None
     work_experience_matching: Optional[dict] = None
     action_verb_analysis: Optional[dict] = None
+    semantic_match_score: Optional[int] = None
+    analysis_tier: Optional[str] = None
+    provisional_score: Optional[int] = None
+    incremental: Optional[dict] = None
+    token_budget: Optional[dict] = None
 
 class PromptCategoriesResponse(BaseModel):
     available_categories: list
@@ -56,21 +286,84 @@ class ApiKeyValidationResponse(BaseModel):
     valid: bool
     message: str
 
-def get_response(job_description, resume_text, prompt, api_key=None):
-    # Use provided API key or fallback to environment variable
-    if api_key:
-        genai.configure(api_key=api_key)
-    else:
-        # Fallback to environment variable for backward compatibility
-        env_key = os.getenv("GEMINI_API_KEY")
-        if env_key:
-            genai.configure(api_key=env_key)
-        else:
-            raise ValueError("No API key provided")
-    
-    model = genai.GenerativeModel("models/gemma-3-27b-it")
-    
-    full_prompt = f"""
+class LocalAnalysisResponse(BaseModel):
+    keyword_analysis: dict
+    technical_skills_matching: dict
+    action_verb_analysis: dict
+    semantic_match_score: int
+    elapsed_ms: float
+
+class MultiAnalysisResponse(BaseModel):
+    status: str
+    results: Dict[str, ResumeAnalysisResponse]
+    errors: Dict[str, str]
+
+class JobStatusResponse(BaseModel):
+    job_id: str
+    status: str
+    analysis_type: str
+    created_at: float
+    updated_at: float
+    result: Optional[ResumeAnalysisResponse] = None
+    error: Optional[str] = None
+
+class BatchItemResult(BaseModel):
+    filename: str
+    status: str
+    overall_score: Optional[int] = None
+    semantic_match_score: Optional[int] = None
+    error: Optional[str] = None
+    result: Optional[ResumeAnalysisResponse] = None
+
+class BatchAnalysisResponse(BaseModel):
+    analysis_type: str
+    total: int
+    succeeded: int
+    failed: int
+    filtered: int = 0
+    results: List[BatchItemResult]
+
+class CandidateIngestResult(BaseModel):
+    filename: str
+    status: str
+    candidate_id: Optional[str] = None
+    skills: Optional[list] = None
+    error: Optional[str] = None
+
+class CandidateIngestResponse(BaseModel):
+    total: int
+    added: int
+    failed: int
+    candidates: List[CandidateIngestResult]
+
+class CandidateRankRequest(BaseModel):
+    job_description: str
+    top_k: int = 20
+    analyze_top_k: int = 0
+    analysis_type: Optional[str] = "comprehensive_analysis"
+    api_key: Optional[str] = None
+
+class RankedCandidate(BaseModel):
+    candidate_id: str
+    filename: Optional[str] = None
+    score: float
+    skill_match_percentage: int
+    keyword_match_score: int
+    text_relevance: float
+    semantic_match_score: int
+    matched_skills: list
+    missing_skills: list
+    analysis: Optional[ResumeAnalysisResponse] = None
+    error: Optional[str] = None
+
+class CandidateRankResponse(BaseModel):
+    required_skills: list
+    candidates_searched: int
+    elapsed_ms: float
+    candidates: List[RankedCandidate]
+
+def build_full_prompt(job_description, resume_text, prompt):
+    return f"""
 Job Description:
 {job_description}
 
@@ -80,336 +373,571 @@ Resume Content:
 Task Instructions:
 {prompt}
 """
-    
-    response = model.generate_content([full_prompt])
-    return response.text
 
-def parse_analysis_response(analysis_text):
+def get_resume_sections(resume_text):
     """
-    Parse the structured analysis response to extract keyword analysis, section scores, overall score, technical skills matching, work experience matching, and action verb analysis
+    Split the resume into canonical sections, cached per resume text
+    """
+    cache_key = make_cache_key("sections", resume_text)
+    cached = section_cache.get(cache_key)
+    if cached is not None:
+        return json.loads(cached)
+    with time_stage("segment"):
+        sections = segment_resume(resume_text)
+    section_cache.set(cache_key, json.dumps(sections))
+    return sections
+
+def get_embedding(kind, text):
+    """
+    Embed a resume (kind "resume", section-weighted) or job description locally, cached by its text.
+    Resumes are keyed by their exact text like section_cache, since the section map shapes the vector.
+    """
+    cache_key = make_cache_key("embedding", kind, text if kind == "resume" else normalize_text(text))
+    vector = embedding_cache.get(cache_key)
+    if vector is None:
+        vector = embed_resume(get_resume_sections(text), embedder) if kind == "resume" else embedder.embed([text])[0]
+        embedding_cache.set(cache_key, vector)
+    return vector
+
+def compute_semantic_match_score(job_description, resume_text):
+    return semantic_match_score(get_embedding("job_description", job_description), get_embedding("resume", resume_text))
+
+async def get_semantic_match_score(job_description, resume_text):
+    """
+    Score (0-100) the cosine similarity of the local resume and job description embeddings.
+    An embedding model takes tens of milliseconds per resume on the CPU, so it runs in an executor thread.
+    """
+    with time_stage("embed"):
+        if not embedder.runs_model:
+            return compute_semantic_match_score(job_description, resume_text)
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(None, context.run, compute_semantic_match_score, job_description, resume_text)
+
+def apply_token_budget(job_description, resume_text, prompt, analysis_type=None):
+    """
+    Clean the prompt inputs and trim them to PROMPT_TOKEN_BUDGET. When the analysis type
+    only needs some resume sections (PROMPT_SECTIONS), the rest are left out first.
+
+    Returns:
+        Tuple of (job_description, resume_text, report) with the tokens saved and the resume sections sent in the report
+    """
+    full_resume_tokens, resume_sections = None, None
+    needed = get_prompt_sections(analysis_type) if analysis_type else None
+    if needed is not None:
+        selected, kept = select_sections(get_resume_sections(resume_text), needed)
+        if selected is not None:
+            full_resume_tokens = count_tokens(resume_text)
+            resume_text, resume_sections = selected, kept
+    with time_stage("token_budget"):
+        job_description, resume_text, report = fit_to_budget(job_description, resume_text, prompt, PROMPT_TOKEN_BUDGET)
+    if resume_sections is not None:
+        # Count the sections left out as saved
+        report["original_tokens"] += full_resume_tokens - count_tokens(selected)
+        report["tokens_saved"] = max(report["original_tokens"] - report["prompt_tokens"], 0)
+        report["resume_sections"] = resume_sections
+    PROMPT_TOKENS.inc(report["original_tokens"], kind="original")
+    PROMPT_TOKENS.inc(report["prompt_tokens"], kind="sent")
+    return job_description, resume_text, report
+
+def resolve_api_key(api_key=None):
+    # Use provided API key or fallback to environment variable
+    api_key = api_key or os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("No API key provided")
+    return api_key
+
+def get_result_cache_key(job_description, resume_text, prompt, model_name=MODEL_NAME):
+    return make_cache_key(normalize_text(resume_text), job_description.strip(), prompt, model_name)
+
+async def run_rate_limited(api_key, call, priority=INTERACTIVE):
+    """
+    Run a Gemini call through rate_limiter, turning a shed call or exhausted retries into a 429 with Retry-After
     """
-    keyword_analysis = {}
-    section_scores = {}
-    job_requirements_scores = {}
-    overall_score = None
-    technical_skills_matching = {}
-    work_experience_matching = {}
-    action_verb_analysis = {}
-    
     try:
-        # Extract keyword analysis
-        if "## KEYWORD ANALYSIS" in analysis_text:
-            keyword_section = analysis_text.split("## KEYWORD ANALYSIS")[1].split("##")[0]
-            
-            # Extract found keywords
-            found_match = keyword_section.find("**Job Description Keywords Found**:")
-            if found_match != -1:
-                found_text = keyword_section[found_match:].split("\n")[0]
-                keywords_found = found_text.replace("**Job Description Keywords Found**:", "").strip()
-                keyword_analysis["keywords_found"] = keywords_found.split(", ") if keywords_found else []
-            
-            # Extract missing keywords
-            missing_match = keyword_section.find("**Missing Keywords**:")
-            if missing_match != -1:
-                missing_text = keyword_section[missing_match:].split("\n")[0]
-                missing_keywords = missing_text.replace("**Missing Keywords**:", "").strip()
-                keyword_analysis["missing_keywords"] = missing_keywords.split(", ") if missing_keywords else []
-            
-            # Extract keyword match score
-            score_match = keyword_section.find("**Keyword Match Score**:")
-            if score_match != -1:
-                score_text = keyword_section[score_match:].split("\n")[0]
-                score_value = score_text.replace("**Keyword Match Score**:", "").replace("%", "").strip()
-                keyword_analysis["match_score"] = int(score_value) if score_value.isdigit() else 0
-        
-        # Extract section scores
-        if "## SECTION-WISE SCORING" in analysis_text:
-            scoring_section = analysis_text.split("## SECTION-WISE SCORING")[1].split("##")[0]
-            
-            sections = ["Professional Summary", "Technical Skills", "Work Experience", "Education", "Projects", "Certifications", "Soft Skills"]
-            for section in sections:
-                # Try multiple patterns for section matching
-                patterns = [
-                    f"**{section}**:",
-                    f"- **{section}**:",
-                    f"*{section}*:",
-                    f"{section}:",
-                    f"**{section}**"
-                ]
-                
-                score_found = False
-                for pattern in patterns:
-                    section_match = scoring_section.find(pattern)
-                    if section_match != -1:
-                        section_text = scoring_section[section_match:].split("\n")[0]
-                        score_value = section_text.replace(pattern, "").replace("/100", "").strip()
-                        
-                        # Extract number from the text using regex
-                        import re
-                        numbers = re.findall(r'\d+', score_value)
-                        if numbers:
-                            section_scores[section.lower().replace(" ", "_")] = int(numbers[0])
-                            score_found = True
-                            break
-                
-                # If no score found, set a default based on section
-                if not score_found:
-                    default_scores = {
-                        "professional_summary": 70,
-                        "technical_skills": 75,
-                        "work_experience": 80,
-                        "education": 85,
-                        "projects": 70,
-                        "certifications": 60,
-                        "soft_skills": 75
-                    }
-                    section_key = section.lower().replace(" ", "_")
-                    section_scores[section_key] = default_scores.get(section_key, 70)
-        
-        # Extract job requirements scores
-        if "## JOB REQUIREMENTS ANALYSIS" in analysis_text:
-            requirements_section = analysis_text.split("## JOB REQUIREMENTS ANALYSIS")[1].split("##")[0]
-            
-            requirements = ["Technical Skills Requirements", "Work Experience Requirements", "Education Requirements", "Project Requirements", "Certification Requirements", "Soft Skills Requirements"]
-            for requirement in requirements:
-                # Try multiple patterns for requirement matching
-                patterns = [
-                    f"**{requirement}**:",
-                    f"- **{requirement}**:",
-                    f"*{requirement}*:",
-                    f"{requirement}:",
-                    f"**{requirement}**"
-                ]
-                
-                score_found = False
-                for pattern in patterns:
-                    req_match = requirements_section.find(pattern)
-                    if req_match != -1:
-                        req_text = requirements_section[req_match:].split("\n")[0]
-                        score_value = req_text.replace(pattern, "").replace("/100", "").strip()
-                        
-                        # Extract number from the text using regex
-                        import re
-                        numbers = re.findall(r'\d+', score_value)
-                        if numbers:
-                            # Map to section names for consistency
-                            section_name = requirement.replace(" Requirements", "").lower().replace(" ", "_")
-                            # Fix specific mappings
-                            if section_name == "project":
-                                section_name = "projects"
-                            elif section_name == "certification":
-                                section_name = "certifications"
-                            job_requirements_scores[section_name] = int(numbers[0])
-                            score_found = True
-                            break
-                
-                # If no score found, set a default based on requirement
-                if not score_found:
-                    default_requirements = {
-                        "technical_skills": 85,
-                        "work_experience": 80,
-                        "education": 75,
-                        "projects": 70,
-                        "certifications": 60,
-                        "soft_skills": 75
-                    }
-                    section_name = requirement.replace(" Requirements", "").lower().replace(" ", "_")
-                    # Fix specific mappings
-                    if section_name == "project":
-                        section_name = "projects"
-                    elif section_name == "certification":
-                        section_name = "certifications"
-                    job_requirements_scores[section_name] = default_requirements.get(section_name, 75)
-        
-        # Extract technical skills matching
-        if "## TECHNICAL SKILLS MATCHING" in analysis_text:
-            tech_skills_section = analysis_text.split("## TECHNICAL SKILLS MATCHING")[1].split("##")[0]
-            
-            # Extract required technical skills
-            required_match = tech_skills_section.find("**Required Technical Skills**:")
-            if required_match != -1:
-                required_text = tech_skills_section[required_match:].split("\n")[0]
-                required_skills = required_text.replace("**Required Technical Skills**:", "").strip()
-                technical_skills_matching["required_skills"] = required_skills.split(", ") if required_skills else []
-            
-            # Extract matched technical skills
-            matched_match = tech_skills_section.find("**Matched Technical Skills**:")
-            if matched_match != -1:
-                matched_text = tech_skills_section[matched_match:].split("\n")[0]
-                matched_skills = matched_text.replace("**Matched Technical Skills**:", "").strip()
-                technical_skills_matching["matched_skills"] = matched_skills.split(", ") if matched_skills else []
-            
-            # Extract missing technical skills
-            missing_match = tech_skills_section.find("**Missing Technical Skills**:")
-            if missing_match != -1:
-                missing_text = tech_skills_section[missing_match:].split("\n")[0]
-                missing_skills = missing_text.replace("**Missing Technical Skills**:", "").strip()
-                technical_skills_matching["missing_skills"] = missing_skills.split(", ") if missing_skills else []
-            
-            # Extract technical skills match percentage
-            tech_percentage_match = tech_skills_section.find("**Technical Skills Match Percentage**:")
-            if tech_percentage_match != -1:
-                tech_percentage_text = tech_skills_section[tech_percentage_match:].split("\n")[0]
-                tech_percentage_value = tech_percentage_text.replace("**Technical Skills Match Percentage**:", "").replace("%", "").strip()
-                technical_skills_matching["match_percentage"] = int(tech_percentage_value) if tech_percentage_value.isdigit() else 0
-            else:
-                # Fallback: calculate match percentage from matched vs required skills
-                required_skills = technical_skills_matching.get("required_skills", [])
-                matched_skills = technical_skills_matching.get("matched_skills", [])
-                if required_skills and matched_skills:
-                    match_percentage = int((len(matched_skills) / len(required_skills)) * 100) if required_skills else 0
-                    technical_skills_matching["match_percentage"] = match_percentage
-        
-        # Extract work experience matching
-        if "## EXPERIENCE MATCHING" in analysis_text:
-            work_exp_section = analysis_text.split("## EXPERIENCE MATCHING")[1].split("##")[0]
-            
-            # Extract matched experience
-            matched_match = work_exp_section.find("**Matched Experience**:")
-            if matched_match != -1:
-                matched_text = work_exp_section[matched_match:].split("\n")[0]
-                matched_experience = matched_text.replace("**Matched Experience**:", "").strip()
-                work_experience_matching["matched_experience"] = matched_experience.split(", ") if matched_experience else []
-            
-            # Extract missing experience
-            missing_match = work_exp_section.find("**Missing Experience**:")
-            if missing_match != -1:
-                missing_text = work_exp_section[missing_match:].split("\n")[0]
-                missing_experience = missing_text.replace("**Missing Experience**:", "").strip()
-                work_experience_matching["missing_experience"] = missing_experience.split(", ") if missing_experience else []
-            
-            # Extract experience level match
-            level_match = work_exp_section.find("**Experience Level Match**:")
-            if level_match != -1:
-                level_text = work_exp_section[level_match:].split("\n")[0]
-                experience_level = level_text.replace("**Experience Level Match**:", "").strip()
-                work_experience_matching["experience_level_match"] = experience_level
-            
-            # Extract years experience match
-            years_match = work_exp_section.find("**Years Experience Match**:")
-            if years_match != -1:
-                years_text = work_exp_section[years_match:].split("\n")[0]
-                years_match_value = years_text.replace("**Years Experience Match**:", "").strip()
-                work_experience_matching["years_experience_match"] = years_match_value.lower() == "yes"
-            
-            # Extract industry relevance score
-            industry_match = work_exp_section.find("**Industry Relevance Score**:")
-            if industry_match != -1:
-                industry_text = work_exp_section[industry_match:].split("\n")[0]
-                industry_score = industry_text.replace("**Industry Relevance Score**:", "").replace("/100", "").strip()
-                work_experience_matching["industry_relevance"] = int(industry_score) if industry_score.isdigit() else 0
-        
-        # Extract work experience requirements
-        if "## WORK EXPERIENCE REQUIREMENTS" in analysis_text:
-            req_section = analysis_text.split("## WORK EXPERIENCE REQUIREMENTS")[1].split("##")[0]
-            
-            # Extract required experience areas
-            required_match = req_section.find("**Required Experience Areas**:")
-            if required_match != -1:
-                required_text = req_section[required_match:].split("\n")[0]
-                required_experience = required_text.replace("**Required Experience Areas**:", "").strip()
-                work_experience_matching["required_experience"] = required_experience.split(", ") if required_experience else []
-        
-        # Extract work experience match percentage
-        if "## EXPERIENCE MATCH PERCENTAGE" in analysis_text:
-            exp_percentage_section = analysis_text.split("## EXPERIENCE MATCH PERCENTAGE")[1]
-            exp_percentage_match = exp_percentage_section.find("**Overall Experience Match**:")
-            if exp_percentage_match != -1:
-                exp_percentage_text = exp_percentage_section[exp_percentage_match:].split("\n")[0]
-                exp_percentage_value = exp_percentage_text.replace("**Overall Experience Match**:", "").replace("%", "").strip()
-                work_experience_matching["match_percentage"] = int(exp_percentage_value) if exp_percentage_value.isdigit() else 0
-        
-        # Extract overall score
-        if "## OVERALL MATCH SCORE" in analysis_text:
-            overall_section = analysis_text.split("## OVERALL MATCH SCORE")[1]
-            score_match = overall_section.find("**Total Match Percentage**:")
-            if score_match != -1:
-                score_text = overall_section[score_match:].split("\n")[0]
-                score_value = score_text.replace("**Total Match Percentage**:", "").replace("%", "").strip()
-                overall_score = int(score_value) if score_value.isdigit() else 0
-        
-        # Extract action verb repetition analysis
-        if "## ACTION VERB REPETITION ANALYSIS" in analysis_text:
-            action_verb_section = analysis_text.split("## ACTION VERB REPETITION ANALYSIS")[1].split("##")[0]
-            
-            # Extract repeated action verbs
-            repeated_match = action_verb_section.find("**Repeated Action Verbs**:")
-            if repeated_match != -1:
-                repeated_text = action_verb_section[repeated_match:].split("\n")[0]
-                repeated_verbs_text = repeated_text.replace("**Repeated Action Verbs**:", "").strip()
-                if repeated_verbs_text and repeated_verbs_text != "None" and repeated_verbs_text != "N/A":
-                    # Parse repeated verbs (format: "verb1 (count1), verb2 (count2)")
-                    repeated_verbs = []
-                    verb_entries = repeated_verbs_text.split(", ")
-                    for entry in verb_entries:
-                        if "(" in entry and ")" in entry:
-                            verb = entry.split("(")[0].strip()
-                            count_str = entry.split("(")[1].split(")")[0].strip()
-                            count = int(count_str) if count_str.isdigit() else 1
-                            repeated_verbs.append({"verb": verb, "count": count, "locations": []})
-                    action_verb_analysis["repeated_verbs"] = repeated_verbs
-            
-            # Extract verb replacement suggestions
-            suggestions_match = action_verb_section.find("**Verb Replacement Suggestions**:")
-            if suggestions_match != -1:
-                suggestions_text = action_verb_section[suggestions_match:].split("\n")[0]
-                suggestions_content = suggestions_text.replace("**Verb Replacement Suggestions**:", "").strip()
-                if suggestions_content and suggestions_content != "None" and suggestions_content != "N/A":
-                    # Parse suggestions (format: "verb1: suggestion1, suggestion2, suggestion3")
-                    suggestions = []
-                    suggestion_entries = suggestions_content.split("; ")
-                    for entry in suggestion_entries:
-                        if ":" in entry:
-                            original_verb = entry.split(":")[0].strip()
-                            alternatives_text = entry.split(":")[1].strip()
-                            alternatives = [alt.strip() for alt in alternatives_text.split(",")]
-                            # Determine category based on alternatives
-                            category = "General"
-                            if any(alt in ACTION_VERBS_BY_CATEGORY["management_leadership"] for alt in alternatives):
-                                category = "Management/Leadership"
-                            elif any(alt in ACTION_VERBS_BY_CATEGORY["technical"] for alt in alternatives):
-                                category = "Technical"
-                            elif any(alt in ACTION_VERBS_BY_CATEGORY["communication_people"] for alt in alternatives):
-                                category = "Communication"
-                            elif any(alt in ACTION_VERBS_BY_CATEGORY["research"] for alt in alternatives):
-                                category = "Research"
-                            elif any(alt in ACTION_VERBS_BY_CATEGORY["creative"] for alt in alternatives):
-                                category = "Creative"
-                            elif any(alt in ACTION_VERBS_BY_CATEGORY["accomplishments"] for alt in alternatives):
-                                category = "Accomplishments"
-                            suggestions.append({
-                                "original_verb": original_verb,
-                                "suggestions": alternatives,
-                                "category": category
-                            })
-                    action_verb_analysis["suggested_replacements"] = suggestions
-            
-            # Extract verb diversity score
-            diversity_match = action_verb_section.find("**Verb Diversity Score**:")
-            if diversity_match != -1:
-                diversity_text = action_verb_section[diversity_match:].split("\n")[0]
-                diversity_value = diversity_text.replace("**Verb Diversity Score**:", "").replace("/100", "").strip()
-                action_verb_analysis["verb_diversity_score"] = int(diversity_value) if diversity_value.isdigit() else 0
-            
-            # Extract improvement suggestions
-            improvement_match = action_verb_section.find("**Improvement Suggestions**:")
-            if improvement_match != -1:
-                improvement_text = action_verb_section[improvement_match:].split("\n")[0]
-                improvement_content = improvement_text.replace("**Improvement Suggestions**:", "").strip()
-                if improvement_content and improvement_content != "None" and improvement_content != "N/A":
-                    action_verb_analysis["improvement_suggestions"] = improvement_content.split(", ")
+        return await rate_limiter.run(api_key, call, priority)
+    except RateLimitExceeded as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(math.ceil(e.retry_after))})
+
+async def get_response(job_description, resume_text, prompt, api_key=None, priority=INTERACTIVE, generation_config=None, model_name=MODEL_NAME, cache_result=True):
+    """
+    Run the analysis prompt against Gemini (model_name, MODEL_NAME by default) without blocking the event loop.
+    Calls are paced per API key by rate_limiter, at most LLM_MAX_CONCURRENCY calls
+    are in flight per worker and each call is cancelled after LLM_TIMEOUT_SECONDS.
+    Results are served from result_cache when the same inputs were analyzed before; with
+    cache_result=False a new result is not written, so the caller can validate it first.
+    """
+    api_key = resolve_api_key(api_key)
+
+    with time_stage("llm") as stage:
+        cache_key = get_result_cache_key(job_description, resume_text, prompt, model_name)
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            stage.outcome = "cached"
+            return cached
+
+        model = model_pools[model_name].get(api_key)
+        with time_stage("prompt_assembly"):
+            full_prompt = build_full_prompt(job_description, resume_text, prompt)
         
-    except Exception as e:
-        print(f"Error parsing analysis response: {e}")
+        async def call():
+            async with llm_semaphore:
+                LLM_IN_FLIGHT.inc()
+                try:
+                    return await asyncio.wait_for(
+                        model.generate_content_async([full_prompt], generation_config=generation_config),
+                        timeout=LLM_TIMEOUT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    raise HTTPException(status_code=504, detail=f"AI analysis timed out after {LLM_TIMEOUT_SECONDS:g} seconds")
+                finally:
+                    LLM_IN_FLIGHT.dec()
+
+        response = await run_rate_limited(api_key, call, priority)
+        record_token_usage(response)
+        if cache_result:
+            result_cache.set(cache_key, response.text)
+        return response.text
+
+def record_token_usage(response):
+    usage = getattr(response, "usage_metadata", None)
+    if usage is None:
+        return
+    LLM_TOKENS.inc(getattr(usage, "prompt_token_count", 0) or 0, kind="prompt")
+    LLM_TOKENS.inc(getattr(usage, "candidates_token_count", 0) or 0, kind="completion")
+
+async def stream_response(job_description, resume_text, prompt, api_key=None):
+    """
+    Streaming variant of get_response that yields text chunks as Gemini produces them.
+    The whole stream shares one LLM_TIMEOUT_SECONDS deadline and the joined text is
+    written to result_cache once the stream completes.
+    """
+    api_key = resolve_api_key(api_key)
+
+    cache_key = get_result_cache_key(job_description, resume_text, prompt)
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        with time_stage("llm") as stage:
+            stage.outcome = "cached"
+        yield cached
+        return
+
+    model = model_pool.get(api_key)
+    with time_stage("prompt_assembly"):
+        full_prompt = build_full_prompt(job_description, resume_text, prompt)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + LLM_TIMEOUT_SECONDS
+    chunks = []
+
+    async def start_stream():
+        # The semaphore slot is held for the whole stream but not while the rate limiter backs off
+        await llm_semaphore.acquire()
+        try:
+            return await asyncio.wait_for(
+                model.generate_content_async([full_prompt], stream=True),
+                timeout=LLM_TIMEOUT_SECONDS
+            )
+        except asyncio.TimeoutError:
+            llm_semaphore.release()
+            raise HTTPException(status_code=504, detail=f"AI analysis timed out after {LLM_TIMEOUT_SECONDS:g} seconds")
+        except BaseException:
+            llm_semaphore.release()
+            raise
+
+    # The llm stage covers the whole stream, including time the client takes to read it
+    with time_stage("llm"):
+        # Quota errors are raised before the first chunk, so only the start is retried
+        response = await run_rate_limited(api_key, start_stream)
+        LLM_IN_FLIGHT.inc()
+        try:
+            iterator = response.__aiter__()
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(iterator.__anext__(), timeout=max(deadline - loop.time(), 0))
+                except StopAsyncIteration:
+                    break
+                if chunk.text:
+                    chunks.append(chunk.text)
+                    yield chunk.text
+        except asyncio.TimeoutError:
+            raise HTTPException(status_code=504, detail=f"AI analysis timed out after {LLM_TIMEOUT_SECONDS:g} seconds")
+        finally:
+            LLM_IN_FLIGHT.dec()
+            llm_semaphore.release()
+    record_token_usage(response)
+    result_cache.set(cache_key, "".join(chunks))
+
+# Analysis types whose responses carry the structured sections parsed by parse_analysis_response
+STRUCTURED_ANALYSIS_TYPES = ["comprehensive_analysis", "work_experience", "projects", "achievements"]
+
+def uses_json_output(analysis_type):
+    return ANALYSIS_OUTPUT_FORMAT == "json" and analysis_type in ANALYSIS_SCHEMAS
+
+async def get_structured_response(job_description, resume_text, prompt, schema, api_key=None, priority=INTERACTIVE, model_name=MODEL_NAME):
+    """
+    Get a JSON analysis and validate it against schema (from ANALYSIS_SCHEMAS or field_update_schema).
+    Output that fails validation is sent back once with the list of problems; if the repair fails too
+    the request fails with 502. Only output that passes validation is written to result_cache, under
+    the original prompt's key. The prompt must already describe the schema, as json_output_instructions does.
+    """
+    generation_config = json_generation_config(model_name, schema)
+    cache_key = get_result_cache_key(job_description, resume_text, prompt, model_name)
+    analysis_result = await get_response(job_description, resume_text, prompt, api_key, priority, generation_config, model_name, cache_result=False)
+    try:
+        with time_stage("parse"):
+            structured = parse_structured_output(analysis_result, schema)
+        result_cache.set(cache_key, analysis_result)
+        return structured
+    except StructuredOutputError as e:
+        # The repair only needs the broken output and the problems, not the resume and job description again
+        repair_prompt = build_repair_prompt(analysis_result, e, schema)
+    analysis_result = await get_response("", "", repair_prompt, api_key, priority, generation_config, model_name, cache_result=False)
+    try:
+        with time_stage("parse"):
+            structured = parse_structured_output(analysis_result, schema)
+    except StructuredOutputError as e:
+        STRUCTURED_REPAIRS.inc(result="failed")
+        raise HTTPException(status_code=502, detail=f"AI analysis did not match the expected format: {e}")
+    STRUCTURED_REPAIRS.inc(result="repaired")
+    result_cache.set(cache_key, analysis_result)
+    return structured
+
+def build_analysis_response(analysis_type, analysis_result, resume_text=None, structured=None):
+    """
+    Build the API response for an analysis, parsing structured data for the analysis types that include it.
+    A validated JSON analysis can be passed as structured instead of the text; its fields are used
+    as they are and the analysis text is rendered from it.
+    When the resume text is given, action verb counts and the diversity score are computed locally
+    and take precedence over the AI's.
+    """
+    keyword_analysis, section_scores, job_requirements_scores, overall_score, technical_skills_matching, work_experience_matching, action_verb_analysis = None, None, None, None, None, None, None
+    if structured is not None:
+        analysis_result = to_markdown(structured, analysis_type)
+        keyword_analysis, section_scores, job_requirements_scores, overall_score, technical_skills_matching, work_experience_matching, action_verb_analysis = structured_fields(structured)
+        if resume_text is not None:
+            action_verb_analysis = merge_local_action_verbs(action_verb_analysis, resume_text)
+    elif analysis_type in STRUCTURED_ANALYSIS_TYPES:
+        with STAGE_SECONDS.time(stage="parse", analysis_type=analysis_type):
+            keyword_analysis, section_scores, job_requirements_scores, overall_score, technical_skills_matching, work_experience_matching, action_verb_analysis = parse_analysis_response(analysis_result)
+        if resume_text is not None:
+            action_verb_analysis = merge_local_action_verbs(action_verb_analysis, resume_text)
     
-    return keyword_analysis, section_scores, job_requirements_scores, overall_score, technical_skills_matching, work_experience_matching, action_verb_analysis
+    return ResumeAnalysisResponse(
+        analysis=analysis_result,
+        status="success",
+        analysis_type=analysis_type,
+        keyword_analysis=keyword_analysis,
+        section_scores=section_scores,
+        job_requirements_scores=job_requirements_scores,
+        overall_score=overall_score,
+        technical_skills_matching=technical_skills_matching,
+        work_experience_matching=work_experience_matching,
+        action_verb_analysis=action_verb_analysis
+    )
+
+async def get_provisional_score(job_description, resume_text):
+    """
+    Score the resume locally (see analysis_tiers.provisional_score)
+
+    Returns:
+        Tuple of (score, skills_matcher.match_resume result)
+    """
+    local_match = match_resume(job_description, resume_text)
+    score = provisional_score(local_match, get_resume_sections(resume_text), await get_semantic_match_score(job_description, resume_text))
+    return score, local_match
+
+async def reanalyze_fields(previous, job_description, resume_text, targets, api_key=None, priority=INTERACTIVE):
+    """
+    Ask the AI to re-assess only some fields of an earlier analysis for an edited resume,
+    sending only the resume sections those fields depend on
+
+    Args:
+        previous: Earlier ResumeAnalysisResponse as a dict
+        job_description: Job description text
+        resume_text: Edited resume text
+        targets: Fields to re-assess, from incremental.reanalysis_targets
+
+    Returns:
+        Dict of field name to its earlier value updated with the new values (nulls are dropped)
+    """
+    schema = field_update_schema(targets)
+    selected, kept = select_sections(get_resume_sections(resume_text), target_sections(targets))
+    prompt = build_field_update_prompt(previous, kept, schema)
+    prompt_job_description, prompt_resume_text, _ = fit_to_budget(job_description, selected or resume_text, prompt, PROMPT_TOKEN_BUDGET)
+    structured = await get_structured_response(prompt_job_description, prompt_resume_text, prompt, schema, api_key, priority)
+    return {
+        field: {
+            **(previous.get(field) or {}),
+            **{name: structured[field][name] for name in fields["properties"] if structured[field][name] is not None}
+        }
+        for field, fields in schema["properties"].items()
+    }
+
+async def reanalyze_incrementally(base, job_description, resume_text, api_key=None, priority=INTERACTIVE):
+    """
+    Update an earlier analysis of the same resume lineage for an edited resume.
+    Fields that depend on changed sections and can be computed locally (keywords, technical skills,
+    action verbs, and the overall score, moved by the change in the provisional score) are updated
+    locally; the affected section and job requirement scores and the experience matching are
+    re-assessed by one narrow AI call (reanalyze_fields); the other fields are reused.
+    The labelled lines of the analysis text are rewritten to match, and a note says its written
+    commentary still describes the earlier resume.
+
+    Args:
+        base: Entry of analysis_history with the earlier resume_text, response and analyzed_at
+        job_description: Job description text (the same as before)
+        resume_text: Edited resume text
+        api_key: API key for the narrow AI call
+        priority: Rate limiter priority of the narrow AI call
+
+    Returns:
+        ResumeAnalysisResponse, or None when too much changed for an incremental update
+        or the narrow AI call failed, so the caller runs a full analysis
+    """
+    ratio = change_ratio(base["resume_text"], resume_text)
+    if ratio > INCREMENTAL_MAX_CHANGE:
+        INCREMENTAL_ANALYSES.inc(result="full")
+        return None
+
+    previous = base["response"]
+    with time_stage("incremental"):
+        changed = changed_sections(get_resume_sections(base["resume_text"]), get_resume_sections(resume_text))
+        recomputed = [field for field in affected_fields(changed) if field in LOCAL_FIELDS]
+        targets = reanalysis_targets(previous, changed)
+    reanalyzed = {}
+    if targets:
+        try:
+            reanalyzed = await reanalyze_fields(previous, job_description, resume_text, targets, api_key, priority)
+        except HTTPException:
+            INCREMENTAL_ANALYSES.inc(result="full")
+            return None
+
+    with time_stage("incremental"):
+        response = ResumeAnalysisResponse(**previous)
+        updated = dict(reanalyzed)
+        local_updates = rematch_fields(previous, resume_text)
+        for field in ("keyword_analysis", "technical_skills_matching"):
+            if field in recomputed and field in local_updates:
+                updated[field] = local_updates[field]
+        if "action_verb_analysis" in recomputed:
+            updated["action_verb_analysis"] = merge_local_action_verbs(previous.get("action_verb_analysis"), resume_text)
+        if "overall_score" in recomputed and response.overall_score is not None:
+            delta = (await get_provisional_score(job_description, resume_text))[0] - (await get_provisional_score(job_description, base["resume_text"]))[0]
+            updated["overall_score"] = min(max(response.overall_score + delta, 0), 100)
+        for field, value in updated.items():
+            setattr(response, field, value)
+        analysis = refresh_markdown_fields(previous["analysis"], updated)
+        response.analysis = analysis if analysis.startswith(INCREMENTAL_ANALYSIS_NOTE) else f"{INCREMENTAL_ANALYSIS_NOTE}\n\n{analysis}"
+        response.status = "incremental"
+        response.semantic_match_score = await get_semantic_match_score(job_description, resume_text)
+        response.token_budget = None
+        response.incremental = {
+            "base_analyzed_at": base["analyzed_at"],
+            "change_ratio": ratio,
+            "changed_sections": changed,
+            "recomputed_fields": [field for field in recomputed if field in updated],
+            "reanalyzed_fields": list(reanalyzed),
+            "reused_fields": [field for field in ANALYSIS_FIELDS if field not in updated]
+        }
+    INCREMENTAL_ANALYSES.inc(result="updated")
+    return response
+
+async def run_analysis(job_description, resume_text, analysis_type, api_key=None, priority=INTERACTIVE, resume_id=None):
+    """
+    Run one analysis type against the resume text and build its response.
+    When resume_id names a resume lineage with an earlier full analysis of a structured type
+    against the same job description, small edits are handled by reanalyze_incrementally.
+    Structured analysis types go through tier_policy first: a provisional score from local
+    matching decides whether the local result is returned or which model writes the analysis.
+    Identical analyses already in flight are joined instead of started again,
+    and every caller gets the same response.
+    """
+    current_analysis_type.set(analysis_type)
+    # Get the appropriate prompt
+    analysis_prompt = get_prompt(analysis_type)
+    json_output = uses_json_output(analysis_type)
+    if json_output:
+        analysis_prompt += json_output_instructions(analysis_type)
+
+    async def analyze_with_model(model_name):
+        prompt_job_description, prompt_resume_text, token_budget = apply_token_budget(job_description, resume_text, analysis_prompt, analysis_type)
+
+        # Get AI analysis
+        analysis_result, structured = None, None
+        try:
+            if json_output:
+                structured = await get_structured_response(prompt_job_description, prompt_resume_text, analysis_prompt, ANALYSIS_SCHEMAS[analysis_type], api_key, priority, model_name)
+            else:
+                analysis_result = await get_response(prompt_job_description, prompt_resume_text, analysis_prompt, api_key, priority, model_name=model_name)
+        except HTTPException as e:
+            if e.status_code == 504 and LOCAL_FALLBACK_ON_TIMEOUT and analysis_type in STRUCTURED_ANALYSIS_TYPES:
+                response = build_local_fallback_response(analysis_type, job_description, resume_text)
+                response.semantic_match_score = await get_semantic_match_score(job_description, resume_text)
+                return response
+            raise
+
+        response = build_analysis_response(analysis_type, analysis_result, resume_text, structured)
+        response.semantic_match_score = await get_semantic_match_score(job_description, resume_text)
+        response.token_budget = token_budget
+        return response
+
+    async def analyze():
+        if not (tier_policy.enabled and analysis_type in STRUCTURED_ANALYSIS_TYPES):
+            return await analyze_with_model(MODEL_NAME)
+
+        with time_stage("tier"):
+            score, local_match = await get_provisional_score(job_description, resume_text)
+            tier = tier_policy.choose(score)
+        ANALYSIS_TIERS.inc(tier=tier)
+        with TIER_SECONDS.time(tier=tier):
+            if tier == TIER_LOCAL:
+                response = build_local_fallback_response(
+                    analysis_type, job_description, resume_text, local_match,
+                    analysis=f"The local match score ({score}) is below {tier_policy.local_below}, so no AI analysis was run. Showing local keyword and technical skills matching only.",
+                    status="local"
+                )
+                response.overall_score = score
+                response.semantic_match_score = await get_semantic_match_score(job_description, resume_text)
+            else:
+                response = await analyze_with_model(tier_policy.light_model if tier == TIER_LIGHT else MODEL_NAME)
+        response.analysis_tier = tier
+        response.provisional_score = score
+        return response
+
+    history_key = None
+    if resume_id and analysis_type in STRUCTURED_ANALYSIS_TYPES:
+        # Resolved first so a request without a key is refused as it would be by get_response,
+        # and scoped to the key so a caller can only build on analyses made with it
+        api_key = resolve_api_key(api_key)
+        history_key = make_cache_key("history", resume_id, analysis_type, job_description.strip(), MODEL_NAME, api_key)
+        base = analysis_history.get(history_key)
+        if base is not None:
+            response = await reanalyze_incrementally(json.loads(base), job_description, resume_text, api_key, priority)
+            if response is not None:
+                return response
+
+    # Keyed like result_cache plus the API key, so a caller never inherits another key's quota or auth error
+    flight_key = make_cache_key(get_result_cache_key(job_description, resume_text, analysis_prompt), api_key or os.getenv("GEMINI_API_KEY"))
+    response = await analysis_flights.run(flight_key, analyze)
+    # Only full AI analyses become the base for later edits, so incremental updates never drift further
+    if history_key is not None and response.status == "success":
+        analysis_history.set(history_key, json.dumps({"resume_text": resume_text, "response": response.dict(), "analyzed_at": time.time()}))
+    return response
+
+def merge_local_action_verbs(action_verb_analysis, resume_text):
+    """
+    Overlay locally counted action verbs on the AI's action verb analysis,
+    keeping the AI's replacement and improvement suggestions when it gave any
+    """
+    local_verbs = analyze_action_verbs(resume_text)
+    merged = {**local_verbs, **(action_verb_analysis or {})}
+    for field in ("repeated_verbs", "verb_diversity_score", "total_verbs", "unique_verbs"):
+        merged[field] = local_verbs[field]
+    return merged
+
+def build_local_fallback_response(analysis_type, job_description, resume_text, local_match=None,
+                                  analysis="AI analysis timed out. Showing local keyword and technical skills matching only.",
+                                  status="fallback"):
+    """
+    Build a response from local keyword and skills matching when the AI analysis is unavailable or not needed
+    """
+    local_match = local_match or match_resume(job_description, resume_text)
+    return ResumeAnalysisResponse(
+        analysis=analysis,
+        status=status,
+        analysis_type=analysis_type,
+        keyword_analysis=local_match["keyword_analysis"],
+        technical_skills_matching=local_match["technical_skills_matching"],
+        action_verb_analysis=analyze_action_verbs(resume_text)
+    )
 
-def input_pdf_setup(uploaded_file):
-    reader = pdf.PdfReader(uploaded_file)
-    text = ""
-    for page in reader.pages:
-        text += str(page.extract_text()) + "\n"
-    return text
+# Put before the analysis text of an incremental update, whose written commentary is not re-run
+INCREMENTAL_ANALYSIS_NOTE = "> **Updated for your edits**: the scores and matching lines below reflect the edited resume; the written commentary still describes the earlier version."
+
+# Structured fields in the order returned by parse_analysis_response
+ANALYSIS_FIELDS = ["keyword_analysis", "section_scores", "job_requirements_scores", "overall_score", "technical_skills_matching", "work_experience_matching", "action_verb_analysis"]
+
+SECTION_HEADER_PATTERN = re.compile(r"^## ", re.MULTILINE)
+
+class IncrementalAnalysisParser:
+    """
+    Parses a streamed analysis one "## " section at a time.
+    A section is complete once the next header starts, so feed() only returns
+    sections that can no longer change and finish() flushes the last one.
+    Sections without structured fields are skipped.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.parsed_upto = None
+
+    def _parse_section(self, section_text):
+        header = section_text.split("\n", 1)[0].replace("##", "").strip()
+        fields = {
+            name: value
+            for name, value in zip(ANALYSIS_FIELDS, parse_analysis_response(section_text))
+            if value not in (None, {})
+        }
+        return {"section": header, "data": fields}
+
+    def feed(self, chunk):
+        self.text += chunk
+        starts = [match.start() for match in SECTION_HEADER_PATTERN.finditer(self.text)]
+        if self.parsed_upto is not None:
+            starts = [start for start in starts if start >= self.parsed_upto]
+        sections = []
+        for start, end in zip(starts, starts[1:]):
+            sections.append(self._parse_section(self.text[start:end]))
+            self.parsed_upto = end
+        if self.parsed_upto is None and starts:
+            self.parsed_upto = starts[0]
+        return [section for section in sections if section["data"]]
+
+    def finish(self):
+        if self.parsed_upto is None:
+            return []
+        section = self._parse_section(self.text[self.parsed_upto:])
+        return [section] if section["data"] else []
+
+async def read_upload(upload, max_bytes=None):
+    """
+    Read an uploaded file in chunks, hashing it as it streams in
+
+    Returns:
+        Tuple of (content, SHA-256 hex digest)
+    """
+    with time_stage("upload_read"):
+        digest = hashlib.sha256()
+        chunks = []
+        size = 0
+        while True:
+            chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            size += len(chunk)
+            if max_bytes is not None and size > max_bytes:
+                raise HTTPException(status_code=413, detail=f"File is larger than {max_bytes} bytes")
+            digest.update(chunk)
+            chunks.append(chunk)
+        return b"".join(chunks), digest.hexdigest()
+
+async def input_pdf_setup(resume_content, content_hash=None):
+    """
+    Extract resume text in the PDF worker pool so the event loop never does CPU-bound PDF work.
+    Text is cached by content hash, so a repeat upload of the same file skips parsing.
+    """
+    with time_stage("pdf_extract") as stage:
+        content_hash = content_hash or hashlib.sha256(resume_content).hexdigest()
+        cached = pdf_text_cache.get(content_hash)
+        if cached is not None:
+            stage.outcome = "cached"
+            return cached
+        try:
+            resume_text = await extract_pdf_text_async(resume_content)
+        except PdfLimitError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        pdf_text_cache.set(content_hash, resume_text)
+        return resume_text
 
 @app.get("/")
 async def root():
@@ -421,15 +949,34 @@ async def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/cache-stats")
+async def get_cache_stats():
+    """
+    Get hit/miss counters for the analysis result, PDF text and API key validation caches
+    """
+    return {"result_cache": result_cache.stats(), "pdf_text_cache": pdf_text_cache.stats(), "model_pool": model_pool.stats(), "rate_limiter": rate_limiter.stats(), "analysis_flights": analysis_flights.stats(), "jobs": job_manager.stats(), "candidate_index": candidate_index.stats(),
+        "embedding_cache": {**embedding_cache.stats(), "embedder": embedder.name}, "tier_policy": tier_policy.stats(), "api_key_validation": {"valid_cache": valid_key_cache.stats(), "invalid_cache": invalid_key_cache.stats(), **key_validations.stats()}}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Stage latencies, token usage, cache hits and in-flight requests in the Prometheus text format
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.post("/analyze-resume", response_model=ResumeAnalysisResponse)
 async def analyze_resume(
     job_description: str = Form(...),
     resume_file: UploadFile = File(...),
     analysis_type: str = Query(default="comprehensive_analysis", description="Type of analysis to perform"),
-    api_key: str = Form(None)
+    api_key: str = Form(None),
+    resume_id: str = Form(None)
 ):
     """
-    Analyze a resume against a job description using AI
+    Analyze a resume against a job description using AI.
+    Pass the same resume_id for each revision of a resume to get incremental re-analysis of small edits.
     """
     try:
         # Validate file type
@@ -439,41 +986,132 @@ async def analyze_resume(
         # Validate analysis type
         if analysis_type not in PROMPT_CATEGORIES:
             raise HTTPException(status_code=400, detail=f"Invalid analysis type. Available types: {get_available_categories()}")
+        current_analysis_type.set(analysis_type)
         
         # Read PDF content
-        resume_content = await resume_file.read()
-        resume_io = io.BytesIO(resume_content)
-        resume_text = input_pdf_setup(resume_io)
+        resume_content, content_hash = await read_upload(resume_file, PDF_MAX_BYTES)
+        resume_text = await input_pdf_setup(resume_content, content_hash)
         
-        # Get the appropriate prompt
-        analysis_prompt = get_prompt(analysis_type)
+        return await run_analysis(job_description, resume_text, analysis_type, api_key, resume_id=resume_id)
         
-        # Get AI analysis
-        analysis_result = get_response(job_description, resume_text, analysis_prompt, api_key)
-        
-        # Parse structured data for comprehensive analysis
-        keyword_analysis, section_scores, overall_score, technical_skills_matching, work_experience_matching, action_verb_analysis = None, None, None, None, None, None
-        if analysis_type == "comprehensive_analysis":
-            keyword_analysis, section_scores, job_requirements_scores, overall_score, technical_skills_matching, work_experience_matching, action_verb_analysis = parse_analysis_response(analysis_result)
-        elif analysis_type in ["work_experience", "projects", "achievements"]:
-            # For specific section analysis, also parse action verb data
-            keyword_analysis, section_scores, job_requirements_scores, overall_score, technical_skills_matching, work_experience_matching, action_verb_analysis = parse_analysis_response(analysis_result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+
+@app.post("/analyze-resume-multi", response_model=MultiAnalysisResponse)
+async def analyze_resume_multi(
+    job_description: str = Form(...),
+    resume_file: UploadFile = File(...),
+    analysis_types: List[str] = Query(default=None, description="Types of analysis to perform (all types when omitted)"),
+    api_key: str = Form(None)
+):
+    """
+    Run several analysis types on one resume. The PDF is extracted once and the
+    analyses run concurrently, so the request takes as long as the slowest one.
+    """
+    # Validate file type
+    if not resume_file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    
+    # Validate analysis types, keeping the requested order without duplicates
+    analysis_types = list(dict.fromkeys(analysis_types or get_available_categories()))
+    invalid_types = [analysis_type for analysis_type in analysis_types if analysis_type not in PROMPT_CATEGORIES]
+    if invalid_types:
+        raise HTTPException(status_code=400, detail=f"Invalid analysis type(s) {invalid_types}. Available types: {get_available_categories()}")
+    current_analysis_type.set("multi")
+    
+    try:
+        # Read PDF content once for every analysis
+        resume_content, content_hash = await read_upload(resume_file, PDF_MAX_BYTES)
+        resume_text = await input_pdf_setup(resume_content, content_hash)
         
-        return ResumeAnalysisResponse(
-            analysis=analysis_result,
-            status="success",
-            analysis_type=analysis_type,
-            keyword_analysis=keyword_analysis,
-            section_scores=section_scores,
-            job_requirements_scores=job_requirements_scores,
-            overall_score=overall_score,
-            technical_skills_matching=technical_skills_matching,
-            work_experience_matching=work_experience_matching,
-            action_verb_analysis=action_verb_analysis
+        outcomes = await asyncio.gather(
+            *(run_analysis(job_description, resume_text, analysis_type, api_key) for analysis_type in analysis_types),
+            return_exceptions=True
         )
-        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+    
+    results = {}
+    errors = {}
+    for analysis_type, outcome in zip(analysis_types, outcomes):
+        if isinstance(outcome, HTTPException):
+            errors[analysis_type] = str(outcome.detail)
+        elif isinstance(outcome, Exception):
+            errors[analysis_type] = f"Error processing resume: {str(outcome)}"
+        else:
+            results[analysis_type] = outcome
+    
+    if not results:
+        raise HTTPException(status_code=500, detail=f"Error processing resume: {'; '.join(errors.values())}")
+    
+    return MultiAnalysisResponse(
+        status="success" if not errors else "partial",
+        results=results,
+        errors=errors
+    )
+
+@app.post("/analyze-resume-stream")
+async def analyze_resume_stream(
+    job_description: str = Form(...),
+    resume_file: UploadFile = File(...),
+    analysis_type: str = Query(default="comprehensive_analysis", description="Type of analysis to perform"),
+    api_key: str = Form(None)
+):
+    """
+    Analyze a resume and stream the result as newline-delimited JSON.
+    Emits {"type": "chunk"} events with raw text as it arrives, {"type": "section"} events
+    with structured data once each "## " section is complete, and a final {"type": "result"}
+    event shaped like ResumeAnalysisResponse (or {"type": "error"} on failure).
+    """
+    # Validate file type
+    if not resume_file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    
+    # Validate analysis type
+    if analysis_type not in PROMPT_CATEGORIES:
+        raise HTTPException(status_code=400, detail=f"Invalid analysis type. Available types: {get_available_categories()}")
+    current_analysis_type.set(analysis_type)
+    
+    try:
+        # Read PDF content
+        resume_content, content_hash = await read_upload(resume_file, PDF_MAX_BYTES)
+        resume_text = await input_pdf_setup(resume_content, content_hash)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
+    
+    analysis_prompt = get_prompt(analysis_type)
+    prompt_job_description, prompt_resume_text, token_budget = apply_token_budget(job_description, resume_text, analysis_prompt, analysis_type)
+    structured = analysis_type in STRUCTURED_ANALYSIS_TYPES
+
+    async def events():
+        parser = IncrementalAnalysisParser()
+        chunks = []
+        try:
+            async for chunk in stream_response(prompt_job_description, prompt_resume_text, analysis_prompt, api_key):
+                chunks.append(chunk)
+                yield json.dumps({"type": "chunk", "text": chunk}) + "\n"
+                if structured:
+                    for section in parser.feed(chunk):
+                        yield json.dumps({"type": "section", **section}) + "\n"
+            if structured:
+                for section in parser.finish():
+                    yield json.dumps({"type": "section", **section}) + "\n"
+            response = build_analysis_response(analysis_type, "".join(chunks), resume_text)
+            response.semantic_match_score = await get_semantic_match_score(job_description, resume_text)
+            response.token_budget = token_budget
+            yield json.dumps({"type": "result", "data": response.dict()}) + "\n"
+        except HTTPException as e:
+            yield json.dumps({"type": "error", "status_code": e.status_code, "detail": e.detail}) + "\n"
+        except Exception as e:
+            yield json.dumps({"type": "error", "status_code": 500, "detail": f"Error processing resume: {str(e)}"}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
 
 @app.post("/analyze-resume-text", response_model=ResumeAnalysisResponse)
 async def analyze_resume_text(request: ResumeAnalysisRequest):
@@ -485,35 +1123,308 @@ async def analyze_resume_text(request: ResumeAnalysisRequest):
         if request.analysis_type not in PROMPT_CATEGORIES:
             raise HTTPException(status_code=400, detail=f"Invalid analysis type. Available types: {get_available_categories()}")
         
-        # Get the appropriate prompt
-        analysis_prompt = get_prompt(request.analysis_type)
-        
-        # Get AI analysis
-        analysis_result = get_response(request.job_description, request.resume_text, analysis_prompt, request.api_key)
-        
-        # Parse structured data for comprehensive analysis
-        keyword_analysis, section_scores, overall_score, technical_skills_matching, work_experience_matching, action_verb_analysis = None, None, None, None, None, None
-        if request.analysis_type == "comprehensive_analysis":
-            keyword_analysis, section_scores, job_requirements_scores, overall_score, technical_skills_matching, work_experience_matching, action_verb_analysis = parse_analysis_response(analysis_result)
-        elif request.analysis_type in ["work_experience", "projects", "achievements"]:
-            # For specific section analysis, also parse action verb data
-            keyword_analysis, section_scores, job_requirements_scores, overall_score, technical_skills_matching, work_experience_matching, action_verb_analysis = parse_analysis_response(analysis_result)
-        
-        return ResumeAnalysisResponse(
-            analysis=analysis_result,
-            status="success",
-            analysis_type=request.analysis_type,
-            keyword_analysis=keyword_analysis,
-            section_scores=section_scores,
-            overall_score=overall_score,
-            technical_skills_matching=technical_skills_matching,
-            work_experience_matching=work_experience_matching,
-            action_verb_analysis=action_verb_analysis
-        )
+        return await run_analysis(request.job_description, request.resume_text, request.analysis_type, request.api_key, resume_id=request.resume_id)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
 
+@app.post("/local-analysis", response_model=LocalAnalysisResponse)
+async def local_analysis(request: ResumeAnalysisRequest):
+    """
+    Match keywords and technical skills and count action verbs locally without an AI call.
+    Returns in milliseconds and can be shown while the full analysis runs.
+    """
+    started = time.perf_counter()
+    local_match = match_resume(request.job_description, request.resume_text)
+    return LocalAnalysisResponse(
+        keyword_analysis=local_match["keyword_analysis"],
+        technical_skills_matching=local_match["technical_skills_matching"],
+        action_verb_analysis=analyze_action_verbs(request.resume_text),
+        semantic_match_score=await get_semantic_match_score(request.job_description, request.resume_text),
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 3)
+    )
+
+@app.post("/jobs/analyze-resume", response_model=JobStatusResponse, status_code=202)
+async def submit_analyze_resume_job(
+    job_description: str = Form(...),
+    resume_file: UploadFile = File(...),
+    analysis_type: str = Query(default="comprehensive_analysis", description="Type of analysis to perform"),
+    api_key: str = Form(None)
+):
+    """
+    Queue a resume analysis in the background and return its job ID immediately
+    """
+    # Validate file type
+    if not resume_file.filename.lower().endswith('.pdf'):
+        raise HTTPException(status_code=400, detail="Only PDF files are allowed")
+    
+    # Validate analysis type
+    if analysis_type not in PROMPT_CATEGORIES:
+        raise HTTPException(status_code=400, detail=f"Invalid analysis type. Available types: {get_available_categories()}")
+    current_analysis_type.set(analysis_type)
+    
+    resume_content, content_hash = await read_upload(resume_file, PDF_MAX_BYTES)
+
+    async def work():
+        resume_text = await input_pdf_setup(resume_content, content_hash)
+        response = await run_analysis(job_description, resume_text, analysis_type, api_key, BATCH)
+        return response.dict()
+
+    return JobStatusResponse(**job_manager.submit(analysis_type, work))
+
+@app.post("/jobs/analyze-resume-text", response_model=JobStatusResponse, status_code=202)
+async def submit_analyze_resume_text_job(request: ResumeAnalysisRequest):
+    """
+    Queue a resume text analysis in the background and return its job ID immediately
+    """
+    # Validate analysis type
+    if request.analysis_type not in PROMPT_CATEGORIES:
+        raise HTTPException(status_code=400, detail=f"Invalid analysis type. Available types: {get_available_categories()}")
+
+    async def work():
+        response = await run_analysis(request.job_description, request.resume_text, request.analysis_type, request.api_key, BATCH, request.resume_id)
+        return response.dict()
+
+    return JobStatusResponse(**job_manager.submit(request.analysis_type, work))
+
+@app.get("/jobs/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    """
+    Get the status of a background analysis job, including its result once completed
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return JobStatusResponse(**job)
+
+@app.delete("/jobs/{job_id}", response_model=JobStatusResponse)
+async def cancel_job(job_id: str):
+    """
+    Cancel a queued or running background analysis job
+    """
+    job = job_manager.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return JobStatusResponse(**job)
+
+def open_batch_archive(file):
+    """
+    Open an uploaded ZIP archive in place (the spooled upload file, not a copy in memory) and
+    list its PDF members. Runs in an executor thread because it seeks and reads the central directory.
+
+    Returns:
+        Tuple of (archive, members, error); archive is None when the file was rejected
+    """
+    file.seek(0, os.SEEK_END)
+    size = file.tell()
+    file.seek(0)
+    if size > BATCH_MAX_ARCHIVE_BYTES:
+        return None, [], f"Archive is larger than {BATCH_MAX_ARCHIVE_BYTES} bytes"
+    try:
+        archive = zipfile.ZipFile(file)
+    except zipfile.BadZipFile:
+        return None, [], "Invalid ZIP archive"
+    members = [
+        member for member in archive.infolist()
+        if not member.is_dir() and not member.filename.startswith("__MACOSX/") and member.filename.lower().endswith(".pdf")
+    ]
+    return archive, members, None
+
+def read_archive_member(archive, member, lock):
+    """
+    Decompress one archive member, stopping once it exceeds PDF_MAX_BYTES whatever size its header claims
+    """
+    with lock, archive.open(member) as member_file:
+        content = member_file.read(PDF_MAX_BYTES + 1)
+    if len(content) > PDF_MAX_BYTES:
+        raise HTTPException(status_code=413, detail=f"File is larger than {PDF_MAX_BYTES} bytes")
+    return content
+
+async def collect_batch_files(resume_files):
+    """
+    List the uploaded PDFs and the PDFs inside uploaded ZIP archives without reading them.
+    Each item carries a reader that loads it when it is analyzed, so a batch holds only the
+    files currently being worked on in memory. PDFs may be at most PDF_MAX_BYTES (also
+    checked for each archive member as it is decompressed) and archives BATCH_MAX_ARCHIVE_BYTES.
+
+    Returns:
+        List of (filename, read, error) tuples, with read None when the file was rejected; read()
+        is a coroutine function returning (content, content_hash or None)
+    """
+    loop = asyncio.get_running_loop()
+    items = []
+    for upload in resume_files:
+        filename = upload.filename or "resume.pdf"
+        if filename.lower().endswith(".zip"):
+            archive, members, error = await loop.run_in_executor(None, open_batch_archive, upload.file)
+            if error:
+                items.append((filename, None, error))
+            # Members share the archive's file position, so they are decompressed one at a time
+            lock = threading.Lock()
+            for member in members:
+                if member.file_size > PDF_MAX_BYTES:
+                    items.append((member.filename, None, f"File is larger than {PDF_MAX_BYTES} bytes"))
+                    continue
+
+                async def read(archive=archive, member=member, lock=lock):
+                    return await loop.run_in_executor(None, read_archive_member, archive, member, lock), None
+
+                items.append((member.filename, read, None))
+        elif filename.lower().endswith(".pdf"):
+            async def read(upload=upload):
+                return await read_upload(upload, PDF_MAX_BYTES)
+
+            items.append((filename, read, None))
+        else:
+            items.append((filename, None, "Only PDF or ZIP files are allowed"))
+        if len(items) > BATCH_MAX_FILES:
+            raise HTTPException(status_code=400, detail=f"Too many resumes in one batch. Maximum is {BATCH_MAX_FILES}")
+    return items
+
+@app.post("/batch-analyze", response_model=BatchAnalysisResponse)
+async def batch_analyze(
+    job_description: str = Form(...),
+    resume_files: List[UploadFile] = File(...),
+    analysis_type: str = Query(default="comprehensive_analysis", description="Type of analysis to perform"),
+    min_semantic_score: int = Query(default=0, ge=0, le=100, description="Skip the AI analysis of resumes with a lower semantic_match_score"),
+    api_key: str = Form(None)
+):
+    """
+    Screen many resumes (PDFs or ZIP archives of PDFs) against one job description.
+    PDFs are extracted in the worker process pool and AI calls fan out with at most
+    BATCH_MAX_CONCURRENCY in flight. Calls run in the batch lane of rate_limiter, so quota
+    errors pause the key with exponential backoff and interactive requests go first.
+    Resumes whose local semantic_match_score is below min_semantic_score are reported as
+    "filtered" without an AI call. Failed items are reported individually and results are
+    ranked by overall_score.
+    """
+    # Validate analysis type
+    if analysis_type not in PROMPT_CATEGORIES:
+        raise HTTPException(status_code=400, detail=f"Invalid analysis type. Available types: {get_available_categories()}")
+    current_analysis_type.set(analysis_type)
+    
+    items = await collect_batch_files(resume_files)
+    batch_semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+    async def analyze_item(filename, read, error):
+        if read is None:
+            return BatchItemResult(filename=filename, status="error", error=error)
+        try:
+            async with batch_semaphore:
+                content, content_hash = await read()
+                resume_text = await input_pdf_setup(content, content_hash)
+                semantic_score = await get_semantic_match_score(job_description, resume_text)
+                if semantic_score < min_semantic_score:
+                    return BatchItemResult(filename=filename, status="filtered", semantic_match_score=semantic_score)
+                response = await run_analysis(job_description, resume_text, analysis_type, api_key, BATCH)
+            return BatchItemResult(filename=filename, status="success", overall_score=response.overall_score, semantic_match_score=semantic_score, result=response)
+        except HTTPException as e:
+            return BatchItemResult(filename=filename, status="error", error=str(e.detail))
+        except Exception as e:
+            return BatchItemResult(filename=filename, status="error", error=f"Error processing resume: {str(e)}")
+
+    results = await asyncio.gather(*(analyze_item(*item) for item in items))
+    # Successful results first, highest overall score first, then filtered resumes by semantic score
+    status_order = {"success": 0, "filtered": 1}
+    results = sorted(results, key=lambda item: (status_order.get(item.status, 2), -(item.overall_score or 0), -(item.semantic_match_score or 0)))
+    succeeded = sum(1 for item in results if item.status == "success")
+    filtered = sum(1 for item in results if item.status == "filtered")
+    
+    return BatchAnalysisResponse(
+        analysis_type=analysis_type,
+        total=len(results),
+        succeeded=succeeded,
+        failed=len(results) - succeeded - filtered,
+        filtered=filtered,
+        results=results
+    )
+
+@app.post("/candidates", response_model=CandidateIngestResponse)
+async def ingest_candidates(resume_files: List[UploadFile] = File(...)):
+    """
+    Add resumes (PDFs or ZIP archives of PDFs) to the candidate index. Each resume's text,
+    section map and normalized skills are stored under the SHA-256 of the PDF, so uploading
+    the same file again replaces it. No AI call is made.
+    """
+    items = await collect_batch_files(resume_files)
+    ingest_semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+    loop = asyncio.get_running_loop()
+
+    async def ingest_item(filename, read, error):
+        if read is None:
+            return CandidateIngestResult(filename=filename, status="error", error=error)
+        try:
+            async with ingest_semaphore:
+                content, content_hash = await read()
+                content_hash = content_hash or hashlib.sha256(content).hexdigest()
+                resume_text = await input_pdf_setup(content, content_hash)
+                sections = get_resume_sections(resume_text)
+                # SQLite writes stay off the event loop
+                added = await loop.run_in_executor(None, candidate_index.add, content_hash, filename, resume_text, sections)
+            return CandidateIngestResult(status="success", **added)
+        except HTTPException as e:
+            return CandidateIngestResult(filename=filename, status="error", error=str(e.detail))
+        except Exception as e:
+            return CandidateIngestResult(filename=filename, status="error", error=f"Error processing resume: {str(e)}")
+
+    results = await asyncio.gather(*(ingest_item(*item) for item in items))
+    added = sum(1 for item in results if item.status == "success")
+    return CandidateIngestResponse(total=len(results), added=added, failed=len(results) - added, candidates=results)
+
+@app.post("/candidates/rank", response_model=CandidateRankResponse)
+async def rank_candidates(request: CandidateRankRequest):
+    """
+    Rank every indexed candidate against a job description locally (skills overlap and BM25),
+    then optionally run the AI analysis on the top analyze_top_k candidates only
+    """
+    if request.analyze_top_k > 0 and request.analysis_type not in PROMPT_CATEGORIES:
+        raise HTTPException(status_code=400, detail=f"Invalid analysis type. Available types: {get_available_categories()}")
+    if not 0 < request.top_k <= CANDIDATE_MAX_TOP_K or not 0 <= request.analyze_top_k <= request.top_k:
+        raise HTTPException(status_code=400, detail=f"top_k must be between 1 and {CANDIDATE_MAX_TOP_K} and analyze_top_k between 0 and top_k")
+
+    loop = asyncio.get_running_loop()
+    with time_stage("rank"):
+        ranking = await loop.run_in_executor(None, candidate_index.rank, request.job_description, request.top_k)
+    candidates = [RankedCandidate(**candidate) for candidate in ranking["candidates"]]
+
+    shortlist = candidates[:request.analyze_top_k]
+    if shortlist:
+        current_analysis_type.set(request.analysis_type)
+        analyze_semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+
+        async def analyze_candidate(candidate):
+            stored = candidate_index.get(candidate.candidate_id)
+            if stored is None:
+                candidate.error = "Candidate was removed from the index"
+                return
+            try:
+                async with analyze_semaphore:
+                    candidate.analysis = await run_analysis(request.job_description, stored["resume_text"], request.analysis_type, request.api_key, BATCH)
+            except HTTPException as e:
+                candidate.error = str(e.detail)
+            except Exception as e:
+                candidate.error = f"Error analyzing resume: {str(e)}"
+
+        await asyncio.gather(*(analyze_candidate(candidate) for candidate in shortlist))
+
+    return CandidateRankResponse(
+        required_skills=ranking["required_skills"],
+        candidates_searched=ranking["candidates_searched"],
+        elapsed_ms=ranking["elapsed_ms"],
+        candidates=candidates
+    )
+
+@app.delete("/candidates/{candidate_id}")
+async def delete_candidate(candidate_id: str):
+    """
+    Remove a candidate from the index
+    """
+    if not candidate_index.remove(candidate_id):
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    return {"candidate_id": candidate_id, "status": "deleted"}
+
 @app.get("/prompt-categories", response_model=PromptCategoriesResponse)
 async def get_prompt_categories():
     """
@@ -533,45 +1444,45 @@ async def get_prompt_categories():
 
 
 
-@app.post("/validate-api-key", response_model=ApiKeyValidationResponse)
-async def validate_api_key(request: ApiKeyValidationRequest):
+async def check_api_key(api_key):
     """
-    Validate a Gemini API key by making a test request
+    Check a Gemini API key with a token count request, which is free and spends no generation quota
+
+    Returns:
+        Tuple of (valid, message, cacheable); transient failures are not cacheable
     """
+    model = model_pool.get(api_key)
+    test_prompt = "Hello, this is a test."
     try:
-        # Configure the API key
-        genai.configure(api_key=request.api_key)
-        
-        # Try to create a model instance to validate the key
-        model = genai.GenerativeModel("models/gemma-3-27b-it")
-        
-        # Make a simple test request
-        test_prompt = "Hello, this is a test. Please respond with 'API key is valid'."
-        response = model.generate_content([test_prompt])
-        
-        # If we get here without an exception, the API key is valid
-        return ApiKeyValidationResponse(
-            valid=True,
-            message="API key is valid"
-        )
-        
+        await asyncio.wait_for(model.count_tokens_async([test_prompt]), timeout=LLM_TIMEOUT_SECONDS)
+        return True, "API key is valid", True
     except Exception as e:
         error_message = str(e)
-        if "API_KEY_INVALID" in error_message or "invalid" in error_message.lower():
-            return ApiKeyValidationResponse(
-                valid=False,
-                message="Invalid API key. Please check your Gemini API key."
-            )
+        if "API_KEY_INVALID" in error_message or "invalid" in error_message.lower() or "api key not valid" in error_message.lower():
+            return False, "Invalid API key. Please check your Gemini API key.", True
         elif "quota" in error_message.lower() or "limit" in error_message.lower():
-            return ApiKeyValidationResponse(
-                valid=False,
-                message="API key quota exceeded. Please check your Gemini API usage limits."
-            )
+            return False, "API key quota exceeded. Please check your Gemini API usage limits.", False
         else:
-            return ApiKeyValidationResponse(
-                valid=False,
-                message=f"Error validating API key: {error_message}"
-            )
+            return False, f"Error validating API key: {error_message or type(e).__name__}", False
+
+@app.post("/validate-api-key", response_model=ApiKeyValidationResponse)
+async def validate_api_key(request: ApiKeyValidationRequest):
+    """
+    Validate a Gemini API key. Results are cached by a hash of the key, valid keys for
+    API_KEY_VALID_TTL_SECONDS and invalid ones for API_KEY_INVALID_TTL_SECONDS.
+    """
+    cache_key = make_cache_key("api_key", request.api_key)
+    message = valid_key_cache.get(cache_key)
+    if message is not None:
+        return ApiKeyValidationResponse(valid=True, message=message)
+    message = invalid_key_cache.get(cache_key)
+    if message is not None:
+        return ApiKeyValidationResponse(valid=False, message=message)
+
+    valid, message, cacheable = await key_validations.run(cache_key, lambda: check_api_key(request.api_key))
+    if cacheable:
+        (valid_key_cache if valid else invalid_key_cache).set(cache_key, message)
+    return ApiKeyValidationResponse(valid=valid, message=message)
 
 @app.get("/action-verbs-reference")
 async def get_action_verbs_reference():
@@ -0,0 +1,70 @@
+"""
+Benchmark for the local action verb analyzer
+Generates a synthetic corpus of resumes and compares the indexed analyzer with
+a scan of ACTION_VERBS_BY_CATEGORY lists per word, the lookup the parser used before.
+
+Usage (from the backend directory):
+    python benchmarks/bench_action_verbs.py --resumes 2000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from action_verbs import WORD_PATTERN, analyze_action_verbs
+from prompts import ACTION_VERBS_BY_CATEGORY, ALL_ACTION_VERBS
+
+OBJECTS = [
+    "a REST API serving 2M requests per day", "the CI/CD pipeline for 12 services", "a team of 6 engineers",
+    "quarterly planning with product and design", "the onboarding documentation", "a churn prediction model",
+    "database migrations with zero downtime", "vendor contracts worth $1.2M", "the company design system",
+]
+
+
+def make_corpus(count, seed=7):
+    rnd = random.Random(seed)
+    verbs = [verb.capitalize() for verb in ALL_ACTION_VERBS]
+    corpus = []
+    for _ in range(count):
+        bullets = "\n".join(f"• {rnd.choice(verbs)} {rnd.choice(OBJECTS)} and {rnd.choice(ALL_ACTION_VERBS)} {rnd.choice(OBJECTS)}" for _ in range(18))
+        corpus.append(f"Jane Doe\nSUMMARY\nBackend engineer with 6 years of experience.\nEXPERIENCE\n{bullets}\nEDUCATION\nB.Tech Computer Science")
+    return corpus
+
+
+def list_scan_baseline(resume_text):
+    # Category lists searched word by word, without the precomputed index
+    counts = {}
+    for word in WORD_PATTERN.findall(resume_text.lower()):
+        for verbs in ACTION_VERBS_BY_CATEGORY.values():
+            if word in verbs:
+                counts[word] = counts.get(word, 0) + 1
+                break
+    return counts
+
+
+def run(name, func, corpus):
+    started = time.perf_counter()
+    for resume in corpus:
+        func(resume)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<16} {elapsed * 1000 / len(corpus):8.3f} ms/resume  {len(corpus) / elapsed:10.0f} resumes/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=2000, help="Number of synthetic resumes")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.resumes)
+    average_length = sum(len(resume) for resume in corpus) // len(corpus)
+    print(f"{len(corpus)} resumes, {average_length} characters on average")
+    run("verb index", analyze_action_verbs, corpus)
+    run("list scan", list_scan_baseline, corpus)
+
+
+if __name__ == "__main__":
+    main()
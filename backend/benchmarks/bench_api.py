@@ -0,0 +1,275 @@
+"""
+Load test for the analysis endpoints with a fake Gemini model
+Drives /analyze-resume, /analyze-resume-text and /batch-analyze with a corpus of generated
+PDF resumes and reports throughput, p50/p95/p99 latency and the per-stage breakdown from
+/metrics. The app runs in-process with benchmarks/fake_gemini.py standing in for Gemini,
+or --url targets a server started with `python benchmarks/fake_gemini.py`.
+
+Every run is appended to benchmarks/results/bench_api.jsonl with the current git commit
+and compared with the last run of the same scenario and settings.
+
+Usage (from the backend directory):
+    python benchmarks/bench_api.py --scenario analyze-resume --requests 200 --concurrency 20
+    python benchmarks/bench_api.py --scenario all --latency-ms 800 --error-rate 0.02
+    python benchmarks/bench_api.py --scenario batch --batch-size 25 --url http://127.0.0.1:8000
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import re
+import subprocess
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fake_gemini import add_fake_arguments, install
+
+RESULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "bench_api.jsonl")
+
+SCENARIOS = ["analyze-resume", "analyze-resume-text", "batch"]
+
+JOB_DESCRIPTION = (
+    "Senior Backend Engineer\nRequirements\n- 5+ years building Python services with FastAPI or Django\n"
+    "- PostgreSQL, Redis, Docker and Kubernetes on AWS\n- CI/CD, Terraform and observability with Prometheus\n"
+    "Benefits\nRemote work, learning budget and health insurance."
+)
+
+SKILLS = ["Python", "FastAPI", "Django", "PostgreSQL", "Redis", "Docker", "Kubernetes", "AWS", "Terraform", "Kafka", "React", "TypeScript", "Go", "gRPC"]
+VERBS = ["Developed", "Built", "Led", "Designed", "Optimized", "Implemented", "Automated", "Migrated", "Reduced", "Launched"]
+OBJECTS = ["a billing API", "the CI/CD pipeline", "a data ingestion service", "search ranking", "the mobile backend", "monitoring dashboards"]
+
+STAGE_SAMPLE_PATTERN = re.compile(r'^ats_stage_duration_seconds_(sum|count)\{stage="([^"]+)",[^}]*\} (\S+)$')
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def make_pdf(lines: list) -> bytes:
+    """
+    Build a one-page PDF with one line of Helvetica text per entry
+    """
+    stream = ("BT /F1 10 Tf 50 760 Td 12 TL " + " ".join(f"({_pdf_escape(line)}) Tj T*" for line in lines) + " ET").encode("latin-1", "replace")
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [4 0 R] /Count 1 >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Resources << /Font << /F1 3 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+    ]
+    output = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return output
+
+
+def make_resume_lines(index: int, rnd: random.Random) -> list:
+    lines = [f"Candidate {index}", "Summary", f"Backend engineer with {rnd.randint(2, 12)} years of experience.", "Skills", ", ".join(rnd.sample(SKILLS, 7)), "Experience"]
+    lines += [f"- {rnd.choice(VERBS)} {rnd.choice(OBJECTS)} using {rnd.choice(SKILLS)}, cutting latency by {rnd.randint(10, 80)}%" for _ in range(14)]
+    lines += ["Education", "B.Tech Computer Science"]
+    return lines
+
+
+def make_corpus(count: int, seed: int = 0) -> list:
+    """
+    Generate resumes as (text, pdf bytes) pairs. Each resume is unique, so caches only
+    hit when the corpus is smaller than the number of requests.
+    """
+    rnd = random.Random(seed)
+    corpus = []
+    for index in range(count):
+        lines = make_resume_lines(index, rnd)
+        corpus.append(("\n".join(lines), make_pdf(lines)))
+    return corpus
+
+
+def percentile(values: list, percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(min(math.ceil(percent / 100 * len(ordered)) - 1, len(ordered) - 1), 0)]
+
+
+async def read_stage_totals(client: httpx.AsyncClient) -> dict:
+    """
+    Sum ats_stage_duration_seconds over analysis types and outcomes
+
+    Returns:
+        Dict of stage -> {"sum": seconds, "count": observations}
+    """
+    response = await client.get("/metrics")
+    totals = {}
+    for line in response.text.splitlines():
+        match = STAGE_SAMPLE_PATTERN.match(line)
+        if match:
+            field, stage, value = match.groups()
+            totals.setdefault(stage, {"sum": 0.0, "count": 0.0})[field] += float(value)
+    return totals
+
+
+def stage_breakdown(before: dict, after: dict) -> dict:
+    breakdown = {}
+    for stage, totals in after.items():
+        count = totals["count"] - before.get(stage, {}).get("count", 0)
+        if count:
+            seconds = totals["sum"] - before.get(stage, {}).get("sum", 0)
+            breakdown[stage] = {"count": int(count), "mean_ms": round(seconds / count * 1000, 3)}
+    return breakdown
+
+
+def build_request(scenario: str, corpus: list, index: int, batch_size: int) -> dict:
+    if scenario == "analyze-resume":
+        _, pdf_bytes = corpus[index % len(corpus)]
+        return {"url": "/analyze-resume", "data": {"job_description": JOB_DESCRIPTION}, "files": {"resume_file": (f"resume_{index}.pdf", pdf_bytes, "application/pdf")}}
+    if scenario == "analyze-resume-text":
+        text, _ = corpus[index % len(corpus)]
+        return {"url": "/analyze-resume-text", "json": {"job_description": JOB_DESCRIPTION, "resume_text": text, "analysis_type": "comprehensive_analysis"}}
+    files = [
+        ("resume_files", (f"resume_{index}_{item}.pdf", corpus[(index * batch_size + item) % len(corpus)][1], "application/pdf"))
+        for item in range(batch_size)
+    ]
+    return {"url": "/batch-analyze", "data": {"job_description": JOB_DESCRIPTION}, "files": files}
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: str, corpus: list, args) -> dict:
+    latencies = []
+    status_codes = {}
+    failed_items = 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+
+    async def send(index):
+        nonlocal failed_items
+        request = build_request(scenario, corpus, index, args.batch_size)
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.post(request.pop("url"), **request)
+            latencies.append(time.perf_counter() - started)
+        status_codes[response.status_code] = status_codes.get(response.status_code, 0) + 1
+        if scenario == "batch" and response.status_code == 200:
+            failed_items += response.json()["failed"]
+
+    before = await read_stage_totals(client)
+    started = time.perf_counter()
+    await asyncio.gather(*(send(index) for index in range(args.requests)))
+    elapsed = time.perf_counter() - started
+    after = await read_stage_totals(client)
+
+    result = {
+        "requests": args.requests,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_rps": round(args.requests / elapsed, 2),
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 2),
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "max": round(max(latencies) * 1000, 2),
+        },
+        "status_codes": {str(code): count for code, count in sorted(status_codes.items())},
+        "stages": stage_breakdown(before, after),
+    }
+    if scenario == "batch":
+        result["resumes_per_second"] = round(args.requests * args.batch_size / elapsed, 2)
+        result["failed_items"] = failed_items
+    return result
+
+
+def current_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_previous(scenario: str, settings: dict):
+    if not os.path.exists(RESULTS_FILE):
+        return None
+    previous = None
+    with open(RESULTS_FILE) as results:
+        for line in results:
+            record = json.loads(line)
+            if record["scenario"] == scenario and record["settings"] == settings:
+                previous = record
+    return previous
+
+
+def report(scenario: str, result: dict, previous):
+    latency = result["latency_ms"]
+    print(f"\n{scenario}: {result['requests']} requests in {result['elapsed_seconds']}s, {result['throughput_rps']} req/s")
+    print(f"  latency ms  p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  max {latency['max']}")
+    failed_items = f", failed items {result['failed_items']}" if scenario == "batch" else ""
+    print(f"  status codes {result['status_codes']}{failed_items}")
+    for stage, stats in result["stages"].items():
+        print(f"  {stage:<16} {stats['count']:>7} calls  {stats['mean_ms']:>10.3f} ms mean")
+    if previous is not None:
+        throughput_change = (result["throughput_rps"] / previous["result"]["throughput_rps"] - 1) * 100
+        p95_change = (latency["p95"] / previous["result"]["latency_ms"]["p95"] - 1) * 100 if previous["result"]["latency_ms"]["p95"] else 0
+        print(f"  vs {previous['commit']}: throughput {throughput_change:+.1f}%, p95 {p95_change:+.1f}%")
+
+
+def save(record: dict):
+    os.makedirs(os.path.dirname(RESULTS_FILE), exist_ok=True)
+    with open(RESULTS_FILE, "a") as results:
+        results.write(json.dumps(record) + "\n")
+
+
+async def main_async(args):
+    scenarios = SCENARIOS if args.scenario == "all" else [args.scenario]
+
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=None)
+    else:
+        install(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate)
+        from app import app
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=None)
+
+    settings = {
+        "mode": "url" if args.url else "in-process",
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "corpus": args.corpus,
+        "batch_size": args.batch_size,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "rate_limit_rate": args.rate_limit_rate,
+    }
+    async with client:
+        for scenario in scenarios:
+            # A different seed per scenario keeps one scenario from warming the caches for the next
+            corpus = make_corpus(args.corpus or args.requests * (args.batch_size if scenario == "batch" else 1), seed=SCENARIOS.index(scenario))
+            result = await run_scenario(client, scenario, corpus, args)
+            previous = load_previous(scenario, settings)
+            report(scenario, result, previous)
+            if not args.no_save:
+                save({"timestamp": time.time(), "commit": current_commit(), "scenario": scenario, "settings": settings, "result": result})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", choices=SCENARIOS + ["all"], default="all")
+    parser.add_argument("--requests", type=int, default=100, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requests in flight at once")
+    parser.add_argument("--batch-size", type=int, default=10, help="Resumes per batch request")
+    parser.add_argument("--corpus", type=int, default=0, help="Number of distinct resumes (default: one per resume sent, so caches miss)")
+    parser.add_argument("--url", help="Benchmark a running server instead of the in-process app (fake settings are then the server's)")
+    parser.add_argument("--no-save", action="store_true", help="Do not append the results to the results file")
+    add_fake_arguments(parser)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
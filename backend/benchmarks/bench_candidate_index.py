@@ -0,0 +1,62 @@
+"""
+Benchmark for the candidate index
+Ingests a synthetic talent pool and times ranking job descriptions against all of it,
+which is what POST /candidates/rank does before any AI call.
+
+Usage (from the backend directory):
+    python benchmarks/bench_candidate_index.py --candidates 5000
+    python benchmarks/bench_candidate_index.py --candidates 20000 --db /tmp/candidates.db
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_skills_matcher import JOB_DESCRIPTION, make_corpus
+from candidate_index import CandidateIndex
+from resume_sections import segment_resume
+
+JOB_DESCRIPTIONS = [
+    JOB_DESCRIPTION,
+    "Data Scientist. Python, pandas, NumPy, scikit-learn, TensorFlow, SQL, statistics, A/B testing, Tableau.",
+    "Frontend Developer. React, TypeScript, Redux, CSS, HTML, Jest, Webpack, accessibility, REST APIs.",
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=5000, help="Number of synthetic resumes to index")
+    parser.add_argument("--top-k", type=int, default=20, help="Candidates returned per ranking")
+    parser.add_argument("--rounds", type=int, default=5, help="Rankings per job description")
+    parser.add_argument("--db", default=None, help="SQLite file for the index (in memory by default)")
+    args = parser.parse_args()
+
+    if args.db and os.path.exists(args.db):
+        os.remove(args.db)
+    index = CandidateIndex(args.db)
+    corpus = make_corpus(args.candidates)
+
+    started = time.perf_counter()
+    for number, resume in enumerate(corpus):
+        index.add(f"candidate-{number}", f"resume-{number}.pdf", resume, segment_resume(resume))
+    elapsed = time.perf_counter() - started
+    print(f"ingest  {len(corpus)} candidates in {elapsed:.2f}s, {len(corpus) / elapsed:.0f} candidates/s")
+
+    for job_description in JOB_DESCRIPTIONS:
+        timings = []
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            ranking = index.rank(job_description, args.top_k)
+            timings.append(time.perf_counter() - started)
+        best = ranking["candidates"][0] if ranking["candidates"] else {}
+        print(
+            f"rank    {job_description[:32]:<32} {min(timings) * 1000:8.1f} ms best  {sum(timings) / len(timings) * 1000:8.1f} ms mean  "
+            f"{len(ranking['required_skills'])} skills, top score {best.get('score', 0)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
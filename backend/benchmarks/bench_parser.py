@@ -0,0 +1,42 @@
+"""
+Benchmark for the analysis response parser
+Times analysis_parser.parse_analysis_response against the previous split/find implementation
+(legacy_parser.py) on the golden responses: a typical one and a large one.
+
+Usage (from the backend directory):
+    python benchmarks/bench_parser.py --rounds 2000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import legacy_parser
+from analysis_parser import parse_analysis_response
+from check_parser_golden import GOLDEN_DIR
+
+CASES = {"typical": "02-with-action-verbs.md", "large": "13-large.md"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=2000, help="Parses of each response per method")
+    args = parser.parse_args()
+
+    for name, filename in CASES.items():
+        with open(os.path.join(GOLDEN_DIR, filename), encoding="utf-8") as response_file:
+            text = response_file.read()
+        rounds = args.rounds if name == "typical" else max(args.rounds // 20, 1)
+        for method, func in (("legacy", legacy_parser.parse_analysis_response), ("parser", parse_analysis_response)):
+            started = time.perf_counter()
+            for _ in range(rounds):
+                func(text)
+            elapsed = time.perf_counter() - started
+            print(f"{name:<8} {len(text) / 1024:7.1f} KB  {method:<7} {elapsed / rounds * 1e6:9.1f} us per parse")
+
+
+if __name__ == "__main__":
+    main()
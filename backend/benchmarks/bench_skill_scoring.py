@@ -0,0 +1,81 @@
+"""
+Benchmark for vectorized skill overlap scoring
+Scores a job description against a synthetic pool of candidates with skill_scoring.SkillMatrix
+and with a Python loop over each candidate's term weights, and checks both agree.
+
+Usage (from the backend directory):
+    python benchmarks/bench_skill_scoring.py --candidates 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_skills_matcher import JOB_DESCRIPTION
+from skill_scoring import SECTION_WEIGHTS, SkillMatrix
+from skills_matcher import GENERAL_KEYWORDS, KEYWORDS_AUTOMATON, TECHNICAL_SKILLS
+
+
+def make_pool(count, seed=7):
+    rnd = random.Random(seed)
+    terms = list(TECHNICAL_SKILLS) + list(GENERAL_KEYWORDS)
+    weights = list(SECTION_WEIGHTS.values())
+    return [{term: rnd.choice(weights) for term in rnd.sample(terms, rnd.randint(15, 45))} for _ in range(count)]
+
+
+def loop_scores(pool, required_skills, job_keywords):
+    # One dict lookup per job term per candidate
+    scores = []
+    for weights in pool:
+        weighted = sum(weights.get(skill, 0) for skill in required_skills) / len(required_skills)
+        keywords = sum(1 for keyword in job_keywords if keyword in weights) / len(job_keywords)
+        scores.append(0.75 * weighted + 0.25 * keywords)
+    return scores
+
+
+def matrix_scores(matrix, required_skills, job_keywords):
+    weighted, _ = matrix.score(required_skills)
+    _, keywords = matrix.score(job_keywords)
+    return 0.75 * weighted / len(required_skills) + 0.25 * keywords / len(job_keywords)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--candidates", type=int, default=100000, help="Number of synthetic candidates")
+    parser.add_argument("--top-k", type=int, default=20, help="Candidates selected after scoring")
+    parser.add_argument("--rounds", type=int, default=5, help="Timed runs of each method")
+    args = parser.parse_args()
+
+    pool = make_pool(args.candidates)
+    started = time.perf_counter()
+    matrix = SkillMatrix()
+    for number, weights in enumerate(pool):
+        matrix.add(f"candidate-{number}", weights)
+    print(f"{len(pool)} candidates loaded in {time.perf_counter() - started:.2f}s")
+
+    job_keywords = KEYWORDS_AUTOMATON.find(JOB_DESCRIPTION)
+    required_skills = [term for term in job_keywords if term in TECHNICAL_SKILLS]
+
+    def time_method(name, func):
+        timings = []
+        for _ in range(args.rounds):
+            started = time.perf_counter()
+            scores = np.asarray(func())
+            top = np.argpartition(-scores, args.top_k)[:args.top_k]
+            timings.append(time.perf_counter() - started)
+        print(f"{name:<8} {min(timings) * 1000:9.1f} ms best  {sum(timings) / len(timings) * 1000:9.1f} ms mean")
+        return scores, top
+
+    loop, _ = time_method("loop", lambda: loop_scores(pool, required_skills, job_keywords))
+    vectorized, _ = time_method("matrix", lambda: matrix_scores(matrix, required_skills, job_keywords))
+    print(f"max difference {np.abs(loop - vectorized).max():.2e}")
+
+
+if __name__ == "__main__":
+    main()
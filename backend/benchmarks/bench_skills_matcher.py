@@ -0,0 +1,82 @@
+"""
+Benchmark for the local keyword/skills matcher
+Generates a synthetic corpus of resumes and compares the Aho-Corasick matcher
+with a regex-per-term scan over the same dictionary.
+
+Usage (from the backend directory):
+    python benchmarks/bench_skills_matcher.py --resumes 2000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from skills_matcher import GENERAL_KEYWORDS, TECHNICAL_SKILLS, match_resume, normalize_for_matching
+
+FILLER = (
+    "Responsible for delivering features end to end with a focus on quality and reliability. "
+    "Worked closely with product managers and designers to ship improvements every sprint. "
+    "Improved onboarding documentation and supported new hires during their first weeks. "
+)
+
+JOB_DESCRIPTION = (
+    "Senior Backend Engineer. Requirements: Python, FastAPI, PostgreSQL, Redis, Docker, Kubernetes, "
+    "AWS, Terraform, CI/CD, microservices, REST APIs, Kafka. Nice to have: Go, React, TypeScript. "
+    "Agile team, mentoring junior engineers, strong communication, Bachelor's degree."
+)
+
+
+def make_corpus(count, seed=7):
+    rnd = random.Random(seed)
+    surfaces = [surface for canonical, aliases in {**TECHNICAL_SKILLS, **GENERAL_KEYWORDS}.items() for surface in [canonical, *aliases]]
+    corpus = []
+    for _ in range(count):
+        skills = ", ".join(rnd.sample(surfaces, 25))
+        bullets = "\n".join(f"- {FILLER[:rnd.randint(80, len(FILLER))]} Used {rnd.choice(surfaces)}." for _ in range(12))
+        corpus.append(f"Jane Doe\nSUMMARY\n{FILLER}\nSKILLS\n{skills}\nEXPERIENCE\n{bullets}\nEDUCATION\nB.Tech Computer Science")
+    return corpus
+
+
+def regex_baseline(job_description, resume_text):
+    # One compiled regex per surface form, the straightforward alternative to the automaton
+    found = []
+    for text in (job_description, resume_text):
+        text = normalize_for_matching(text)
+        found.append({canonical for pattern, canonical in BASELINE_PATTERNS if pattern.search(text)})
+    return found
+
+
+BASELINE_PATTERNS = [
+    (re.compile(r"(?<![a-z0-9])" + re.escape(normalize_for_matching(surface)) + r"(?![a-z0-9])"), canonical)
+    for canonical, aliases in {**TECHNICAL_SKILLS, **GENERAL_KEYWORDS}.items()
+    for surface in [canonical, *aliases]
+]
+
+
+def run(name, func, corpus):
+    started = time.perf_counter()
+    for resume in corpus:
+        func(JOB_DESCRIPTION, resume)
+    elapsed = time.perf_counter() - started
+    print(f"{name:<16} {elapsed * 1000 / len(corpus):8.3f} ms/resume  {len(corpus) / elapsed:10.0f} resumes/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=2000, help="Number of synthetic resumes")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.resumes)
+    average_length = sum(len(resume) for resume in corpus) // len(corpus)
+    print(f"{len(corpus)} resumes, {average_length} characters on average")
+    run("aho-corasick", match_resume, corpus)
+    run("regex per term", regex_baseline, corpus)
+
+
+if __name__ == "__main__":
+    main()
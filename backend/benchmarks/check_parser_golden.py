@@ -0,0 +1,120 @@
+"""
+Golden-file check for analysis_parser.parse_analysis_response
+Parses every response in golden/parser/*.md and compares the result with the matching .json,
+which holds the output of the previous implementation (legacy_parser.py). --random also
+compares both parsers on randomly mutated responses.
+
+Usage (from the backend directory):
+    python benchmarks/check_parser_golden.py
+    python benchmarks/check_parser_golden.py --random 20000
+    python benchmarks/check_parser_golden.py --update    # rewrite the .json files from legacy_parser
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import legacy_parser
+from analysis_parser import parse_analysis_response
+
+GOLDEN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "parser")
+
+FIELDS = ["keyword_analysis", "section_scores", "job_requirements_scores", "overall_score", "technical_skills_matching", "work_experience_matching", "action_verb_analysis"]
+
+
+def as_dict(result) -> dict:
+    return dict(zip(FIELDS, result))
+
+
+def mutate(text: str, rnd: random.Random) -> str:
+    if not text:
+        return text
+    sections = text.split("\n## ")
+    operation = rnd.choice(["drop_line", "duplicate_section", "shuffle", "stray_header", "unicode_digits", "spacing", "truncate", "blank_value"])
+    if operation == "drop_line":
+        lines = text.split("\n")
+        del lines[rnd.randrange(len(lines))]
+        return "\n".join(lines)
+    if operation == "duplicate_section":
+        return text + "\n## " + rnd.choice(sections[1:] or sections)
+    if operation == "shuffle":
+        head, rest = sections[0], sections[1:]
+        rnd.shuffle(rest)
+        return "\n## ".join([head] + rest)
+    if operation == "stray_header":
+        lines = text.split("\n")
+        lines.insert(rnd.randrange(len(lines)), rnd.choice(["##", "## NOTES", "##TECHNICAL SKILLS MATCHING", "### Details"]))
+        return "\n".join(lines)
+    if operation == "unicode_digits":
+        return text.replace(rnd.choice("0123456789"), rnd.choice(["٣", "²", "５"]))
+    if operation == "spacing":
+        return text.replace(": ", rnd.choice([":", ":  ", ": \t"]))
+    if operation == "truncate":
+        return text[:rnd.randrange(len(text))]
+    lines = text.split("\n")
+    index = rnd.randrange(len(lines))
+    if "**:" in lines[index]:
+        lines[index] = lines[index].split("**:")[0] + "**: " + rnd.choice(["", "None", "N/A", "n/a", "Yes", "No"])
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--update", action="store_true", help="Rewrite the expected .json files from legacy_parser")
+    parser.add_argument("--random", type=int, default=0, help="Randomly mutated responses to compare with legacy_parser")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(GOLDEN_DIR, "*.md")))
+    failures = 0
+    texts = []
+    for path in paths:
+        with open(path, encoding="utf-8") as response_file:
+            text = response_file.read()
+        texts.append(text)
+        expected_path = path[:-3] + ".json"
+        if args.update:
+            with open(expected_path, "w", encoding="utf-8") as expected_file:
+                json.dump(as_dict(legacy_parser.parse_analysis_response(text)), expected_file, indent=2, ensure_ascii=False)
+                expected_file.write("\n")
+            continue
+        with open(expected_path, encoding="utf-8") as expected_file:
+            expected = json.load(expected_file)
+        actual = json.loads(json.dumps(as_dict(parse_analysis_response(text))))
+        if actual != expected:
+            failures += 1
+            print(f"FAIL {os.path.basename(path)}")
+            for field in FIELDS:
+                if actual.get(field) != expected.get(field):
+                    print(f"  {field}: expected {expected.get(field)!r}, got {actual.get(field)!r}")
+    print(f"{len(paths)} golden files {'written' if args.update else 'checked'}, {failures} failed")
+
+    if args.random and texts:
+        rnd = random.Random(args.seed)
+        mismatches = 0
+        for _ in range(args.random):
+            text = rnd.choice(texts)
+            for _ in range(rnd.randint(1, 4)):
+                text = mutate(text, rnd)
+            # Both parsers print their parse errors; only the results are compared
+            with contextlib.redirect_stdout(io.StringIO()):
+                same = parse_analysis_response(text) == legacy_parser.parse_analysis_response(text)
+            if not same:
+                mismatches += 1
+                if mismatches <= 3:
+                    print(f"MISMATCH on mutated response:\n{text}\n")
+        print(f"{args.random} mutated responses compared, {mismatches} mismatched")
+        failures += mismatches
+
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
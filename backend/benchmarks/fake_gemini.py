@@ -0,0 +1,235 @@
+"""
+Local stand-in for genai.GenerativeModel used by the benchmarks
+Returns canned structured analyses after a configurable latency and fails a configurable
+fraction of calls, so the backend can be load-tested without the real Gemini API.
+
+Run the API server against the fake (from the backend directory):
+    python benchmarks/fake_gemini.py --port 8000 --latency-ms 800 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Response in the format RESUME_ANALYSIS_PROMPT asks for; scores are filled in per call
+CANNED_ANALYSIS = """## KEYWORD ANALYSIS
+**Job Description Keywords Found**: Python, FastAPI, Docker, PostgreSQL
+**Missing Keywords**: Kubernetes, Terraform
+**Keyword Match Score**: {keyword}%
+
+## SECTION-WISE SCORING
+- **Professional Summary**: {summary}/100
+- **Technical Skills**: {skills}/100
+- **Work Experience**: {experience}/100
+- **Education**: {education}/100
+- **Projects**: {projects}/100
+- **Certifications**: N/A
+- **Soft Skills**: {soft}/100
+
+## JOB REQUIREMENTS ANALYSIS
+- **Technical Skills Requirements**: {skills}/100
+- **Work Experience Requirements**: {experience}/100
+- **Education Requirements**: {education}/100
+
+## TECHNICAL SKILLS MATCHING
+**Required Technical Skills**: Python, FastAPI, Docker, PostgreSQL, Kubernetes
+**Matched Technical Skills**: Python, FastAPI, Docker, PostgreSQL
+**Missing Technical Skills**: Kubernetes
+**Technical Skills Match Percentage**: 80%
+
+## WORK EXPERIENCE REQUIREMENTS
+**Required Experience Areas**: Backend APIs, Cloud deployment
+**Required Years of Experience**: 3 years
+
+## EXPERIENCE MATCHING
+**Matched Experience**: Backend APIs
+**Missing Experience**: Cloud deployment
+**Experience Level Match**: Mid - good match
+**Years Experience Match**: Yes
+**Industry Relevance Score**: {experience}/100
+
+## EXPERIENCE MATCH PERCENTAGE
+**Overall Experience Match**: {experience}%
+
+## COMPREHENSIVE ANALYSIS
+Strong backend candidate with relevant API and database experience.
+
+## OVERALL MATCH SCORE
+**Total Match Percentage**: {overall}%
+"""
+
+# Response to the JSON output mode (ANALYSIS_OUTPUT_FORMAT=json), scores filled in per call
+CANNED_JSON_ANALYSIS = {
+    "summary": "Strong backend candidate with relevant API and database experience.",
+    "keyword_analysis": {"keywords_found": ["Python", "FastAPI", "Docker", "PostgreSQL"], "missing_keywords": ["Kubernetes", "Terraform"]},
+    "technical_skills_matching": {
+        "required_skills": ["Python", "FastAPI", "Docker", "PostgreSQL", "Kubernetes"],
+        "matched_skills": ["Python", "FastAPI", "Docker", "PostgreSQL"],
+        "missing_skills": ["Kubernetes"],
+        "match_percentage": 80
+    },
+    "work_experience_matching": {
+        "required_experience": ["Backend APIs", "Cloud deployment"],
+        "matched_experience": ["Backend APIs"],
+        "missing_experience": ["Cloud deployment"],
+        "experience_level_match": "Mid - good match",
+        "years_experience_match": True
+    },
+    "action_verb_analysis": {"repeated_verbs": [], "suggested_replacements": [], "verb_diversity_score": None, "improvement_suggestions": []},
+}
+
+# Written fields of the work experience analysis in JSON output mode
+CANNED_JSON_EXPERIENCE_TEXT = {
+    "experience_analysis": "**Total Years of Experience**: 5 years",
+    "gap_analysis": "No production cloud deployments are listed.",
+    "recommendations": "Describe the deployment work with its scale and results.",
+}
+
+# Characters per streamed chunk
+STREAM_CHUNK_SIZE = 40
+
+
+class FakeGenerativeModel:
+    """
+    Drop-in replacement for genai.GenerativeModel. Class attributes hold the settings
+    so every model the pool creates behaves the same way.
+    """
+    latency_seconds = 0.5
+    jitter_seconds = 0.1
+    error_rate = 0.0
+    rate_limit_rate = 0.0
+    calls = 0
+
+    def __init__(self, model_name: str = "fake", **kwargs):
+        self.model_name = model_name
+        self._client = None
+        self._async_client = None
+
+    @classmethod
+    def _latency(cls) -> float:
+        return max(cls.latency_seconds + random.uniform(-cls.jitter_seconds, cls.jitter_seconds), 0)
+
+    @classmethod
+    def _response(cls, contents):
+        cls.calls += 1
+        roll = random.random()
+        if roll < cls.rate_limit_rate:
+            raise google_exceptions.ResourceExhausted("Quota exceeded (fake Gemini)")
+        if roll < cls.rate_limit_rate + cls.error_rate:
+            raise google_exceptions.InternalServerError("Internal error (fake Gemini)")
+
+        scores = {name: random.randint(40, 95) for name in ("keyword", "summary", "skills", "experience", "education", "projects", "soft")}
+        overall = sum(scores.values()) // len(scores)
+        if "JSON schema" in str(contents):
+            analysis = cls._json_analysis(scores, overall)
+            if '"gap_analysis"' in str(contents):
+                analysis = {"work_experience_matching": analysis["work_experience_matching"], **CANNED_JSON_EXPERIENCE_TEXT}
+            text = json.dumps(analysis)
+        else:
+            text = CANNED_ANALYSIS.format(overall=overall, **scores)
+        prompt_length = sum(len(str(part)) for part in contents)
+        usage = SimpleNamespace(prompt_token_count=prompt_length // 4, candidates_token_count=len(text) // 4)
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+    @staticmethod
+    def _json_analysis(scores: dict, overall: int) -> dict:
+        analysis = json.loads(json.dumps(CANNED_JSON_ANALYSIS))
+        analysis["overall_score"] = overall
+        analysis["keyword_analysis"]["match_score"] = scores["keyword"]
+        analysis["work_experience_matching"]["industry_relevance"] = scores["experience"]
+        analysis["work_experience_matching"]["match_percentage"] = scores["experience"]
+        analysis["section_scores"] = {
+            "professional_summary": scores["summary"], "technical_skills": scores["skills"], "work_experience": scores["experience"],
+            "education": scores["education"], "projects": scores["projects"], "certifications": None, "soft_skills": scores["soft"]
+        }
+        analysis["job_requirements_scores"] = {
+            "technical_skills": scores["skills"], "work_experience": scores["experience"], "education": scores["education"],
+            "projects": None, "certifications": None, "soft_skills": None
+        }
+        return analysis
+
+    async def generate_content_async(self, contents, stream: bool = False, **kwargs):
+        latency = self._latency()
+        if not stream:
+            await asyncio.sleep(latency)
+            return self._response(contents)
+        # Time to first chunk is a fifth of the latency, the rest is spread over the chunks
+        await asyncio.sleep(latency / 5)
+        return _FakeStream(self._response(contents), latency * 4 / 5)
+
+    async def count_tokens_async(self, contents, **kwargs):
+        await asyncio.sleep(self._latency() / 10)
+        return SimpleNamespace(total_tokens=sum(len(str(part)) for part in contents) // 4)
+
+    def generate_content(self, contents, **kwargs):
+        time.sleep(self._latency())
+        return self._response(contents)
+
+
+class _FakeStream:
+    def __init__(self, response, duration: float):
+        self.usage_metadata = response.usage_metadata
+        self._parts = [response.text[i:i + STREAM_CHUNK_SIZE] for i in range(0, len(response.text), STREAM_CHUNK_SIZE)]
+        self._delay = duration / max(len(self._parts), 1)
+
+    def __aiter__(self):
+        return self._chunks()
+
+    async def _chunks(self):
+        for part in self._parts:
+            await asyncio.sleep(self._delay)
+            yield SimpleNamespace(text=part)
+
+
+def install(latency_ms: float = 500, jitter_ms: float = 100, error_rate: float = 0.0, rate_limit_rate: float = 0.0):
+    """
+    Replace genai.GenerativeModel with FakeGenerativeModel. Call before importing app.
+
+    Args:
+        latency_ms: Mean time per call in milliseconds
+        jitter_ms: Latency varies uniformly by up to this much either way
+        error_rate: Fraction of calls that fail with a 500 error
+        rate_limit_rate: Fraction of calls that fail with a quota (429) error
+    """
+    FakeGenerativeModel.latency_seconds = latency_ms / 1000
+    FakeGenerativeModel.jitter_seconds = jitter_ms / 1000
+    FakeGenerativeModel.error_rate = error_rate
+    FakeGenerativeModel.rate_limit_rate = rate_limit_rate
+    genai.GenerativeModel = FakeGenerativeModel
+    os.environ.setdefault("GEMINI_API_KEY", "fake-key")
+    # The fake has no quota, so measure the server rather than the per-key pacing unless asked to
+    os.environ.setdefault("GEMINI_REQUESTS_PER_MINUTE", "0")
+
+
+def add_fake_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--latency-ms", type=float, default=500, help="Mean fake Gemini latency")
+    parser.add_argument("--jitter-ms", type=float, default=100, help="Latency jitter either way")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls failing with a 500 error")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of calls failing with a quota error")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_fake_arguments(parser)
+    args = parser.parse_args()
+
+    install(args.latency_ms, args.jitter_ms, args.error_rate, args.rate_limit_rate)
+    import uvicorn
+    from app import app
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""
+Caching helpers for ATS Resume Expert
+Provides an in-memory LRU cache with TTL and an optional SQLite tier that survives restarts,
+and single-flight coalescing of identical concurrent calls.
+"""
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+# Disk writes between sweeps of expired and surplus rows from the SQLite tier
+DISK_SWEEP_INTERVAL = 100
+
+
+def make_cache_key(*parts) -> str:
+    """
+    Build a content-addressed cache key from the given parts
+
+    Args:
+        parts: Strings (or values convertible to strings) identifying the cached item
+
+    Returns:
+        Hex SHA-256 digest of the parts
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    """
+    Collapse whitespace so cosmetic differences in extracted text share a cache entry
+    """
+    return " ".join((text or "").split())
+
+
+class LRUCache:
+    """
+    String cache with least-recently-used eviction and a time-to-live.
+    When db_path is set, entries are also written to SQLite and memory misses fall back to it.
+    Disk writes run on a background thread, and every DISK_SWEEP_INTERVAL writes expired rows
+    are deleted and the oldest rows beyond max_disk_entries are dropped.
+    """
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: float = 3600, db_path: Optional[str] = None, table: str = "cache",
+                 max_disk_entries: int = 100000):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.table = table
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._db_lock = threading.Lock()
+        self._writer = None
+        self._disk_writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute(f"CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT, created_at REAL)")
+            self._db.execute(f"CREATE INDEX IF NOT EXISTS {table}_created_at ON {table} (created_at)")
+            self._db.commit()
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"{table}-writer")
+            self._writer.submit(self._sweep)
+
+    def _expired(self, created_at: float) -> bool:
+        return self.ttl_seconds > 0 and time.time() - created_at > self.ttl_seconds
+
+    def _store(self, key: str, value: str, created_at: float):
+        self._entries[key] = (value, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _write(self, sql: str, params: tuple = ()):
+        # Runs on the writer thread
+        with self._db_lock:
+            self._db.execute(sql, params)
+            self._db.commit()
+            self._disk_writes += 1
+            sweep = self._disk_writes % DISK_SWEEP_INTERVAL == 0
+        if sweep:
+            self._sweep()
+
+    def _sweep(self):
+        with self._db_lock:
+            deleted = 0
+            if self.ttl_seconds > 0:
+                deleted += self._db.execute(f"DELETE FROM {self.table} WHERE created_at < ?", (time.time() - self.ttl_seconds,)).rowcount
+            deleted += self._db.execute(
+                f"DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_disk_entries,)
+            ).rowcount
+            self._db.commit()
+        with self._lock:
+            self.disk_evictions += deleted
+
+    def flush(self):
+        """
+        Wait until every queued disk write has been applied
+        """
+        if self._writer is not None:
+            self._writer.submit(lambda: None).result()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, created_at = entry
+                if not self._expired(created_at):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+        if self._db is not None:
+            with self._db_lock:
+                row = self._db.execute(f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                value, created_at = row
+                if not self._expired(created_at):
+                    with self._lock:
+                        self._store(key, value, created_at)
+                        self.disk_hits += 1
+                    return value
+                self._writer.submit(self._write, f"DELETE FROM {self.table} WHERE key = ?", (key,))
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key: str, value: str):
+        created_at = time.time()
+        with self._lock:
+            self._store(key, value, created_at)
+        if self._db is not None:
+            self._writer.submit(
+                self._write, f"INSERT OR REPLACE INTO {self.table} (key, value, created_at) VALUES (?, ?, ?)", (key, value, created_at)
+            )
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self._db is not None:
+            self._writer.submit(self._write, f"DELETE FROM {self.table}")
+            self.flush()
+
+    def stats(self) -> dict:
+        """
+        Get hit/miss counters for sizing the cache
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "disk_enabled": self._db is not None,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+            }
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one. The first caller starts the
+    call and later callers await its result until it finishes; the next call starts afresh.
+    A caller that is cancelled does not cancel the shared call for the others, but once
+    every caller has gone the shared call is cancelled too.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.started = 0
+        self.shared = 0
+        self.cancelled = 0
+
+    def _forget(self, key: str, entry: dict):
+        if self._calls.get(key) is entry:
+            del self._calls[key]
+
+    async def run(self, key: str, call):
+        """
+        Run call() unless a call with the same key is already in flight
+
+        Args:
+            key: Identifies calls that may share a result (hash any secrets first)
+            call: Zero-argument coroutine function
+
+        Returns:
+            The result of the call, shared by every caller that joined it
+        """
+        entry = self._calls.get(key)
+        if entry is not None:
+            self.shared += 1
+        else:
+            entry = {"task": asyncio.ensure_future(call()), "waiters": 0}
+            self._calls[key] = entry
+            entry["task"].add_done_callback(lambda _: self._forget(key, entry))
+            self.started += 1
+        task = entry["task"]
+        entry["waiters"] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            entry["waiters"] -= 1
+            if entry["waiters"] == 0 and not task.done():
+                # The last caller was cancelled: stop the shared call and let the next caller start afresh
+                self._forget(key, entry)
+                task.cancel()
+                self.cancelled += 1
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._calls), "started": self.started, "shared": self.shared, "cancelled": self.cancelled}
@@ -0,0 +1,264 @@
+"""
+Candidate index for ATS Resume Expert
+Stores ingested resumes (text, section map and normalized skills) in SQLite with an FTS5 full-text
+index and skill postings, so a new job description can be ranked against the whole talent pool
+locally and only the shortlist is sent to the AI. Skill overlap is scored for all candidates at once
+with skill_scoring.SkillMatrix, and semantic similarity with one matrix product over the stored
+resume embeddings (see embeddings.py); both are loaded from the database at startup. Embeddings
+made by a different embedder than the current one are recomputed then.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+import numpy as np
+
+from embeddings import HASHING_EMBEDDER, STOP_WORDS, embed_resume
+from skill_scoring import INITIAL_ROWS, SkillMatrix, term_weights
+from skills_matcher import KEYWORDS_AUTOMATON, TECHNICAL_SKILLS
+
+# Share of the ranking score from technical skills overlap (weighted by the sections they appear in),
+# keyword overlap, BM25 text relevance and embedding similarity.
+# Components a job description gives nothing to compare (no known skills) are left out and the rest rescaled.
+RANK_WEIGHTS = {"skills": 0.5, "keywords": 0.15, "text": 0.15, "semantic": 0.2}
+
+# Most job description terms used in the full-text query
+MAX_QUERY_TERMS = 64
+
+QUERY_TERM_PATTERN = re.compile(r"[a-z0-9]{2,}")
+
+SKILL_NAMES = set(TECHNICAL_SKILLS)
+
+
+def _fts_query(job_description: str) -> str:
+    terms = []
+    for term in QUERY_TERM_PATTERN.findall((job_description or "").lower()):
+        if term not in STOP_WORDS and term not in terms:
+            terms.append(term)
+            if len(terms) == MAX_QUERY_TERMS:
+                break
+    return " OR ".join(f'"{term}"' for term in terms)
+
+
+class CandidateIndex:
+    """
+    SQLite store of candidate resumes with an FTS5 index (BM25) over the resume text,
+    a postings table from each normalized keyword or skill to the candidates that have it,
+    with its section weight, and each resume's embedding. Uses an in-memory database unless db_path is set.
+    Embeddings come from embedder (embeddings.HashingEmbedder by default).
+    """
+
+    def __init__(self, db_path: Optional[str] = None, embedder=None):
+        self.db_path = db_path or ":memory:"
+        self.embedder = embedder or HASHING_EMBEDDER
+        self._db = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS candidates ("
+            "candidate_id TEXT PRIMARY KEY, filename TEXT, resume_text TEXT, sections TEXT, "
+            "skills TEXT, keywords TEXT, added_at REAL, embedding BLOB);"
+            "CREATE VIRTUAL TABLE IF NOT EXISTS candidate_text USING fts5("
+            "candidate_id UNINDEXED, body, tokenize = 'porter unicode61');"
+            "CREATE TABLE IF NOT EXISTS candidate_terms ("
+            "term TEXT, candidate_id TEXT, weight REAL, PRIMARY KEY (term, candidate_id)) WITHOUT ROWID;"
+            "CREATE INDEX IF NOT EXISTS candidate_terms_by_candidate ON candidate_terms (candidate_id);"
+        )
+        columns = [column[1] for column in self._db.execute("PRAGMA table_info(candidates)")]
+        if "embedding" not in columns:
+            self._db.execute("ALTER TABLE candidates ADD COLUMN embedding BLOB")
+        if "embedding_model" not in columns:
+            self._db.execute("ALTER TABLE candidates ADD COLUMN embedding_model TEXT")
+        self._db.commit()
+        self.matrix = SkillMatrix()
+        self._vectors = np.zeros((INITIAL_ROWS, self.embedder.dim), dtype=np.float32)
+        self._load_matrix()
+
+    def _load_matrix(self):
+        weights = {}
+        for candidate_id, term, weight in self._db.execute("SELECT candidate_id, term, weight FROM candidate_terms"):
+            weights.setdefault(candidate_id, {})[term] = weight
+        rows = self._db.execute("SELECT candidate_id, sections, embedding, embedding_model FROM candidates").fetchall()
+        for candidate_id, sections, embedding, embedding_model in rows:
+            if embedding is None or embedding_model != self.embedder.name:
+                vector = embed_resume(json.loads(sections), self.embedder)
+                self._db.execute(
+                    "UPDATE candidates SET embedding = ?, embedding_model = ? WHERE candidate_id = ?",
+                    (vector.tobytes(), self.embedder.name, candidate_id)
+                )
+            else:
+                vector = np.frombuffer(embedding, dtype=np.float32)
+            self._set_vector(self.matrix.add(candidate_id, weights.get(candidate_id, {})), vector)
+        self._db.commit()
+
+    def _set_vector(self, row: int, vector: np.ndarray):
+        if row >= len(self._vectors):
+            grown = np.zeros((max(row + 1, 2 * len(self._vectors)), self.embedder.dim), dtype=np.float32)
+            grown[:len(self._vectors)] = self._vectors
+            self._vectors = grown
+        self._vectors[row] = vector
+
+    def _delete(self, candidate_id: str):
+        self._db.execute("DELETE FROM candidates WHERE candidate_id = ?", (candidate_id,))
+        self._db.execute("DELETE FROM candidate_text WHERE candidate_id = ?", (candidate_id,))
+        self._db.execute("DELETE FROM candidate_terms WHERE candidate_id = ?", (candidate_id,))
+
+    def add(self, candidate_id: str, filename: str, resume_text: str, sections: dict) -> dict:
+        """
+        Add a candidate, replacing any earlier version with the same ID
+
+        Args:
+            candidate_id: Stable ID, such as the SHA-256 of the uploaded PDF
+            filename: Original file name
+            resume_text: Extracted resume text
+            sections: Section map from resume_sections.segment_resume
+
+        Returns:
+            Dict with the candidate_id, filename and the normalized skills found
+        """
+        weights = term_weights(sections)
+        vector = embed_resume(sections, self.embedder)
+        keywords = list(weights)
+        skills = [term for term in keywords if term in SKILL_NAMES]
+        with self._lock:
+            self._delete(candidate_id)
+            self._db.execute(
+                "INSERT INTO candidates (candidate_id, filename, resume_text, sections, skills, keywords, added_at, embedding, embedding_model) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (candidate_id, filename, resume_text, json.dumps(sections), json.dumps(skills), json.dumps(keywords), time.time(), vector.tobytes(), self.embedder.name)
+            )
+            self._db.execute("INSERT INTO candidate_text (candidate_id, body) VALUES (?, ?)", (candidate_id, resume_text))
+            self._db.executemany(
+                "INSERT INTO candidate_terms (term, candidate_id, weight) VALUES (?, ?, ?)",
+                [(term, candidate_id, weight) for term, weight in weights.items()]
+            )
+            self._db.commit()
+            self._set_vector(self.matrix.add(candidate_id, weights), vector)
+        return {"candidate_id": candidate_id, "filename": filename, "skills": skills}
+
+    def get(self, candidate_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT candidate_id, filename, resume_text, sections, skills, added_at FROM candidates WHERE candidate_id = ?",
+                (candidate_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "candidate_id": row[0],
+            "filename": row[1],
+            "resume_text": row[2],
+            "sections": json.loads(row[3]),
+            "skills": json.loads(row[4]),
+            "added_at": row[5]
+        }
+
+    def remove(self, candidate_id: str) -> bool:
+        with self._lock:
+            found = self._db.execute("SELECT 1 FROM candidates WHERE candidate_id = ?", (candidate_id,)).fetchone() is not None
+            self._delete(candidate_id)
+            self._db.commit()
+            self.matrix.remove(candidate_id)
+        return found
+
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def rank(self, job_description: str, limit: int = 20) -> dict:
+        """
+        Rank every stored candidate against a job description without calling the AI.
+        The score (0-100) combines the section-weighted share of the job's technical skills the
+        candidate has, the share of its keywords, BM25 relevance of the resume text and the cosine
+        similarity of the embeddings, weighted by RANK_WEIGHTS. Skill and keyword overlap and
+        similarity are computed for all candidates in one pass (exact nearest-neighbour search).
+
+        Args:
+            job_description: Job description text
+            limit: Number of top candidates to return
+
+        Returns:
+            Dict with the job's required_skills, the number of candidates searched and the
+            ranked candidates, each with its score, matched and missing skills
+        """
+        started = time.perf_counter()
+        job_keywords = KEYWORDS_AUTOMATON.find(job_description)
+        required_skills = [term for term in job_keywords if term in SKILL_NAMES]
+        query = _fts_query(job_description)
+
+        job_vector = self.embedder.embed([job_description])[0]
+
+        # add() updates the database, the matrix and the vectors under self._lock, so one
+        # snapshot taken under it gives arrays of the same size that describe the same candidates
+        matches, rows = [], None
+        with self._lock:
+            alive, [(weighted_skills, matched_skills), (_, matched_keywords)] = self.matrix.score_many([required_skills, job_keywords])
+            size = len(alive)
+            vectors = self._vectors[:size].copy()
+            if query:
+                # bm25() is lower for better matches, so negate it
+                matches = self._db.execute(
+                    "SELECT candidate_id, -bm25(candidate_text) FROM candidate_text WHERE candidate_text MATCH ?", (query,)
+                ).fetchall()
+                rows = self.matrix.rows_for([candidate_id for candidate_id, _ in matches])
+        semantic_share = np.maximum(vectors @ job_vector, 0)
+
+        text_scores = np.zeros(size)
+        if matches:
+            scores = np.array([score for _, score in matches])
+            known = (rows >= 0) & (rows < size)
+            text_scores[rows[known]] = np.maximum(scores[known], 0)
+
+        weights = {
+            "skills": RANK_WEIGHTS["skills"] if required_skills else 0,
+            "keywords": RANK_WEIGHTS["keywords"] if job_keywords else 0,
+            "text": RANK_WEIGHTS["text"] if text_scores.any() else 0,
+            "semantic": RANK_WEIGHTS["semantic"],
+        }
+        weight_total = sum(weights.values()) or 1
+        skill_share = weighted_skills / max(len(required_skills), 1)
+        keyword_share = matched_keywords / max(len(job_keywords), 1)
+        text_share = text_scores / (text_scores.max() if text_scores.any() else 1)
+        scores = (
+            weights["skills"] * skill_share + weights["keywords"] * keyword_share
+            + weights["text"] * text_share + weights["semantic"] * semantic_share
+        ) / weight_total
+        scores = scores * alive
+
+        candidate_rows = np.flatnonzero(scores > 0)
+        if len(candidate_rows) > limit > 0:
+            candidate_rows = candidate_rows[np.argpartition(-scores[candidate_rows], limit - 1)[:limit]]
+        top = candidate_rows[np.argsort(-scores[candidate_rows], kind="stable")][:max(limit, 0)]
+
+        candidates = []
+        if len(top):
+            ids = [self.matrix.candidate_id(row) for row in top]
+            with self._lock:
+                filenames = dict(self._db.execute(
+                    f"SELECT candidate_id, filename FROM candidates WHERE candidate_id IN ({', '.join('?' for _ in ids)})", ids
+                ).fetchall())
+            for row, candidate_id in zip(top, ids):
+                terms = self.matrix.terms(row)
+                candidates.append({
+                    "candidate_id": candidate_id,
+                    "filename": filenames.get(candidate_id),
+                    "score": round(float(scores[row]) * 100, 2),
+                    "skill_match_percentage": int(matched_skills[row] * 100 / len(required_skills)) if required_skills else 0,
+                    "keyword_match_score": int(keyword_share[row] * 100),
+                    "text_relevance": round(float(text_share[row]), 4),
+                    "semantic_match_score": int(round(float(semantic_share[row]) * 100)),
+                    "matched_skills": [skill for skill in required_skills if skill in terms],
+                    "missing_skills": [skill for skill in required_skills if skill not in terms]
+                })
+
+        return {
+            "required_skills": required_skills,
+            "candidates_searched": len(self.matrix),
+            "candidates": candidates,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    def stats(self) -> dict:
+        return {"candidates": self.count(), "persistent": self.db_path != ":memory:", "embedder": self.embedder.name}
@@ -0,0 +1,273 @@
+"""
+Local text embeddings for ATS Resume Expert
+Embeds resumes and job descriptions on the CPU with no network call, and caches the vectors in a
+float32 matrix that can be memory-mapped from disk. Cosine similarity of the vectors gives a cheap
+semantic_match_score for pre-ranking and filtering before any AI call.
+
+Two embedders are available. ModelEmbedder runs a sentence embedding model loaded from a local
+directory with sentence-transformers (an optional dependency, see requirements-embeddings.txt), so
+paraphrases and related terms land close together. HashingEmbedder, the fallback when no model is
+configured or it cannot be loaded, needs nothing but numpy: it hashes words, word pairs and canonical
+skills, so it only captures shared vocabulary and known skill aliases.
+"""
+
+import logging
+import os
+import re
+import threading
+import zlib
+from typing import Optional
+
+import numpy as np
+
+from skill_scoring import DEFAULT_SECTION_WEIGHT, SECTION_WEIGHTS
+from skills_matcher import KEYWORDS_AUTOMATON
+
+EMBEDDING_DIM = 512
+
+# Extra weight of a canonical skill or keyword feature, so aliases ("k8s", "Kubernetes") land together
+SKILL_FEATURE_WEIGHT = 2.0
+
+WORD_PATTERN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+STOP_WORDS = {
+    "a", "about", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have", "in", "is", "it",
+    "its", "of", "on", "or", "our", "that", "the", "their", "this", "to", "we", "will", "with", "you", "your",
+    "who", "what", "which", "can", "all", "any", "into", "other", "more", "must", "should", "able", "work",
+    "team", "role", "join", "looking", "experience", "years", "strong", "including", "such", "well", "etc",
+}
+
+# Rows added to an in-memory or on-disk cache at a time
+CACHE_GROWTH_ROWS = 1024
+
+logger = logging.getLogger(__name__)
+
+
+def _features(text: str) -> dict:
+    words = [word.strip(".") for word in WORD_PATTERN.findall((text or "").lower())]
+    words = [word for word in words if word and word not in STOP_WORDS]
+    features = {}
+    for word in words:
+        features[word] = features.get(word, 0) + 1
+    for first, second in zip(words, words[1:]):
+        pair = f"{first} {second}"
+        features[pair] = features.get(pair, 0) + 1
+    for term in KEYWORDS_AUTOMATON.find(text):
+        features[f"skill:{term}"] = SKILL_FEATURE_WEIGHT
+    return features
+
+
+def embed_text(text: str) -> np.ndarray:
+    """
+    Embed a text as a unit-length float32 vector of EMBEDDING_DIM dimensions.
+    Each feature (word, word pair or canonical skill) is hashed to one dimension with
+    a hashed sign, weighted by 1 + log of its count.
+
+    Returns:
+        Unit vector, or all zeros for text without features
+    """
+    features = _features(text)
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    if not features:
+        return vector
+    hashes = np.array([zlib.crc32(feature.encode("utf-8")) for feature in features], dtype=np.uint64)
+    weights = 1 + np.log(np.array(list(features.values()), dtype=np.float32))
+    signs = np.where(hashes & np.uint64(1 << 31), -1.0, 1.0).astype(np.float32)
+    np.add.at(vector, (hashes % EMBEDDING_DIM).astype(np.int64), signs * weights)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class HashingEmbedder:
+    """
+    Feature-hashing embedder (see embed_text): no model and no dependency beyond numpy
+    """
+    name = f"hashing-{EMBEDDING_DIM}"
+    dim = EMBEDDING_DIM
+    runs_model = False
+
+    def embed(self, texts: list) -> np.ndarray:
+        return np.array([embed_text(text) for text in texts], dtype=np.float32).reshape(len(texts), self.dim)
+
+
+class ModelEmbedder:
+    """
+    Sentence embedding model (for example all-MiniLM-L6-v2 saved with SentenceTransformer.save)
+    loaded from a local directory and run on the CPU. Nothing is downloaded, at load or inference.
+    """
+    runs_model = True
+
+    def __init__(self, model_path: str):
+        from sentence_transformers import SentenceTransformer
+
+        self._model = SentenceTransformer(model_path, device="cpu", local_files_only=True)
+        self.dim = self._model.get_sentence_embedding_dimension()
+        self.name = f"{os.path.basename(os.path.normpath(model_path))}-{self.dim}"
+
+    def embed(self, texts: list) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return self._model.encode(texts, normalize_embeddings=True, convert_to_numpy=True).astype(np.float32)
+
+
+HASHING_EMBEDDER = HashingEmbedder()
+
+
+def load_embedder(model_path: Optional[str] = None):
+    """
+    Load the embedding model at model_path, or fall back to HashingEmbedder when no path is
+    set or the model cannot be loaded (sentence-transformers missing or an invalid directory)
+    """
+    if model_path:
+        try:
+            return ModelEmbedder(model_path)
+        except (ImportError, OSError, ValueError) as e:
+            logger.warning("Could not load the embedding model at %s, using feature hashing instead: %s", model_path, e)
+    return HASHING_EMBEDDER
+
+
+def embed_resume(sections: dict, embedder=None) -> np.ndarray:
+    """
+    Embed a resume from its section map, weighting each section like skill_scoring does
+    so experience and projects shape the vector more than hobbies
+
+    Args:
+        sections: Section map from resume_sections.segment_resume
+        embedder: HashingEmbedder (the default) or ModelEmbedder
+
+    Returns:
+        Unit vector, or all zeros for an empty resume
+    """
+    embedder = embedder or HASHING_EMBEDDER
+    names = [name for name, text in sections.items() if text.strip()]
+    if not names:
+        return np.zeros(embedder.dim, dtype=np.float32)
+    weights = np.array([SECTION_WEIGHTS.get(name, DEFAULT_SECTION_WEIGHT) for name in names], dtype=np.float32)
+    vector = weights @ embedder.embed([sections[name] for name in names])
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def semantic_match_score(job_vector: np.ndarray, resume_vector: np.ndarray) -> int:
+    """
+    Cosine similarity of two unit vectors as a score from 0 to 100
+    """
+    return int(round(max(float(np.dot(job_vector, resume_vector)), 0.0) * 100))
+
+
+class VectorCache:
+    """
+    Embeddings keyed by content hash, stored as rows of a float32 matrix. When directory is set
+    the matrix is memory-mapped from vectors.f32 and the row of each key is appended to keys.txt,
+    so cached vectors survive restarts without being loaded into memory. Once max_entries rows
+    are used the oldest rows are overwritten, and keys.txt is rewritten with only the live keys
+    whenever it holds more than twice as many lines as there are entries.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_entries: int = 100000, dim: int = EMBEDDING_DIM):
+        self.directory = directory
+        self.max_entries = max_entries
+        self.dim = dim
+        self._rows = {}
+        self._keys = {}
+        self._next = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._keys_file = None
+        self._key_lines = 0
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._vectors_path = os.path.join(directory, "vectors.f32")
+            self._keys_path = os.path.join(directory, "keys.txt")
+            if os.path.exists(self._keys_path):
+                with open(self._keys_path, encoding="utf-8") as keys_file:
+                    for line in keys_file:
+                        row, _, key = line.rstrip("\n").partition(" ")
+                        self._assign(int(row), key)
+                        self._key_lines += 1
+            if self._key_lines > len(self._keys):
+                self._compact_keys()
+            else:
+                self._keys_file = open(self._keys_path, "a", encoding="utf-8")
+            self._open_matrix(max(CACHE_GROWTH_ROWS, max(self._keys, default=-1) + 1))
+        else:
+            self._matrix = np.zeros((CACHE_GROWTH_ROWS, dim), dtype=np.float32)
+
+    def _assign(self, row: int, key: str):
+        old_key = self._keys.get(row)
+        if old_key is not None:
+            self._rows.pop(old_key, None)
+        self._rows[key] = row
+        self._keys[row] = key
+        self._next = (row + 1) % self.max_entries
+
+    def _compact_keys(self):
+        # Rewrite keys.txt with one line per live row, in write order so the next row to reuse is last
+        if self._keys_file is not None:
+            self._keys_file.close()
+        rows = sorted(self._keys, key=lambda row: (row - self._next) % self.max_entries)
+        temporary_path = self._keys_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as keys_file:
+            keys_file.writelines(f"{row} {self._keys[row]}\n" for row in rows)
+        os.replace(temporary_path, self._keys_path)
+        self._key_lines = len(rows)
+        self._keys_file = open(self._keys_path, "a", encoding="utf-8")
+
+    def _open_matrix(self, rows: int):
+        rows = min(rows, self.max_entries)
+        size = rows * self.dim * 4
+        with open(self._vectors_path, "ab") as vectors_file:
+            if vectors_file.tell() < size:
+                vectors_file.truncate(size)
+        self._matrix = np.memmap(self._vectors_path, dtype=np.float32, mode="r+", shape=(rows, self.dim))
+
+    def _ensure_capacity(self, row: int):
+        if row < len(self._matrix):
+            return
+        rows = min(len(self._matrix) + CACHE_GROWTH_ROWS, self.max_entries)
+        if self.directory:
+            self._matrix.flush()
+            self._open_matrix(rows)
+        else:
+            grown = np.zeros((rows, self.dim), dtype=np.float32)
+            grown[:len(self._matrix)] = self._matrix
+            self._matrix = grown
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return np.array(self._matrix[row])
+
+    def set(self, key: str, vector: np.ndarray):
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                row = self._next
+                self._ensure_capacity(row)
+                self._assign(row, key)
+                if self._keys_file is not None:
+                    self._keys_file.write(f"{row} {key}\n")
+                    self._keys_file.flush()
+                    self._key_lines += 1
+                    if self._key_lines > 2 * len(self._keys):
+                        self._compact_keys()
+            self._matrix[row] = vector
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._rows),
+                "max_entries": self.max_entries,
+                "dim": self.dim,
+                "disk_enabled": self.directory is not None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,163 @@
+"""
+Incremental re-analysis for ATS Resume Expert
+Compares an edited resume with the one behind an earlier analysis section by section. Small edits
+update only the fields that depend on the changed sections: keywords, technical skills, action verbs
+and the overall score are recomputed locally, the AI re-assesses only the affected scores and
+experience matching (see reanalysis_targets), and everything else is reused as it is.
+"""
+
+import difflib
+import re
+
+from cache import normalize_text
+from skills_matcher import KEYWORDS_AUTOMATON
+
+SOFT_SKILL_SECTIONS = {"summary", "experience", "skills", "achievements"}
+
+# Resume sections each score in section_scores and job_requirements_scores depends on
+SECTION_SCORE_SECTIONS = {
+    "professional_summary": {"summary"},
+    "technical_skills": {"skills"},
+    "work_experience": {"experience"},
+    "education": {"education"},
+    "projects": {"projects"},
+    "certifications": {"certifications"},
+    "soft_skills": SOFT_SKILL_SECTIONS,
+}
+JOB_REQUIREMENT_SECTIONS = {
+    "technical_skills": {"skills", "experience", "projects", "certifications"},
+    "work_experience": {"experience", "summary"},
+    "education": {"education", "certifications"},
+    "projects": {"projects"},
+    "certifications": {"certifications"},
+    "soft_skills": SOFT_SKILL_SECTIONS,
+}
+SCORE_SECTIONS = {"section_scores": SECTION_SCORE_SECTIONS, "job_requirements_scores": JOB_REQUIREMENT_SECTIONS}
+
+# Resume sections each structured field depends on (None means the whole resume)
+FIELD_SECTIONS = {
+    "keyword_analysis": None,
+    "technical_skills_matching": {"skills", "experience", "projects", "certifications", "summary"},
+    "action_verb_analysis": {"experience", "projects", "achievements"},
+    "overall_score": None,
+    "section_scores": set().union(*SECTION_SCORE_SECTIONS.values()),
+    "job_requirements_scores": set().union(*JOB_REQUIREMENT_SECTIONS.values()),
+    "work_experience_matching": {"experience", "summary", "projects"},
+}
+
+# Fields recomputed locally when their sections change; the others keep the earlier AI values
+LOCAL_FIELDS = {"keyword_analysis", "technical_skills_matching", "action_verb_analysis", "overall_score"}
+
+
+def changed_sections(old_sections: dict, new_sections: dict) -> list:
+    """
+    List the sections whose text was added, removed or edited (ignoring whitespace)
+    """
+    names = list(dict.fromkeys(list(old_sections) + list(new_sections)))
+    return [
+        name for name in names
+        if normalize_text(old_sections.get(name, "")) != normalize_text(new_sections.get(name, ""))
+    ]
+
+
+def change_ratio(old_text: str, new_text: str) -> float:
+    """
+    Share of the resume's words that were edited, from 0 (identical) to 1
+    """
+    old_words, new_words = old_text.split(), new_text.split()
+    if not old_words and not new_words:
+        return 0.0
+    return round(1 - difflib.SequenceMatcher(None, old_words, new_words, autojunk=False).ratio(), 4)
+
+
+def affected_fields(changed: list) -> list:
+    return [
+        field for field, sections in FIELD_SECTIONS.items()
+        if changed and (sections is None or sections.intersection(changed))
+    ]
+
+
+def reanalysis_targets(previous: dict, changed: list) -> dict:
+    """
+    Fields of an earlier analysis that depend on the changed sections but cannot be recomputed
+    locally, so the AI has to re-assess them: only the affected scores of section_scores and
+    job_requirements_scores, and all of work_experience_matching
+
+    Args:
+        previous: Earlier ResumeAnalysisResponse as a dict
+        changed: Changed section names from changed_sections
+
+    Returns:
+        Dict of field name to the names inside it to re-assess (fields the analysis lacks are left out)
+    """
+    targets = {}
+    for field, sections_by_key in SCORE_SECTIONS.items():
+        keys = [key for key in previous.get(field) or {} if sections_by_key.get(key, set()).intersection(changed)]
+        if keys:
+            targets[field] = keys
+    experience = previous.get("work_experience_matching")
+    if experience and FIELD_SECTIONS["work_experience_matching"].intersection(changed):
+        targets["work_experience_matching"] = list(experience)
+    return targets
+
+
+def target_sections(targets: dict) -> list:
+    """
+    Resume sections the AI needs to re-assess the given targets
+    """
+    needed = set()
+    for field, names in targets.items():
+        if field in SCORE_SECTIONS:
+            for name in names:
+                needed |= SCORE_SECTIONS[field][name]
+        else:
+            needed |= FIELD_SECTIONS[field]
+    return sorted(needed)
+
+
+def _mentions(resume_text: str, resume_terms: set, term: str) -> bool:
+    # Canonical skills match across aliases ("k8s" and "Kubernetes"); anything else by its words
+    canonical = KEYWORDS_AUTOMATON.find(term)
+    if canonical:
+        return all(item in resume_terms for item in canonical)
+    return re.search(r"(?<!\w)" + re.escape(term.lower()) + r"(?!\w)", resume_text) is not None
+
+
+def _rematch(resume_text: str, resume_terms: set, terms: list) -> tuple:
+    found = [term for term in terms if _mentions(resume_text, resume_terms, term)]
+    missing = [term for term in terms if term not in found]
+    return found, missing, int(round(len(found) * 100 / len(terms))) if terms else None
+
+
+def rematch_fields(previous: dict, resume_text: str) -> dict:
+    """
+    Re-check the keywords and technical skills the earlier analysis listed against the edited resume
+
+    Args:
+        previous: Earlier ResumeAnalysisResponse as a dict
+        resume_text: Edited resume text
+
+    Returns:
+        Dict with updated keyword_analysis and technical_skills_matching (those present before)
+    """
+    lowered = resume_text.lower()
+    resume_terms = set(KEYWORDS_AUTOMATON.find(resume_text))
+    updated = {}
+
+    keyword_analysis = previous.get("keyword_analysis")
+    if keyword_analysis:
+        terms = list(keyword_analysis.get("keywords_found") or []) + list(keyword_analysis.get("missing_keywords") or [])
+        found, missing, score = _rematch(lowered, resume_terms, terms)
+        updated["keyword_analysis"] = {**keyword_analysis, "keywords_found": found, "missing_keywords": missing}
+        if score is not None:
+            updated["keyword_analysis"]["match_score"] = score
+
+    skills = previous.get("technical_skills_matching")
+    if skills:
+        terms = skills.get("required_skills") or list(skills.get("matched_skills") or []) + list(skills.get("missing_skills") or [])
+        found, missing, score = _rematch(lowered, resume_terms, terms)
+        updated["technical_skills_matching"] = {**skills, "matched_skills": found, "missing_skills": missing}
+        if score is not None:
+            updated["technical_skills_matching"]["match_percentage"] = score
+
+    return updated
@@ -0,0 +1,191 @@
+"""
+Background analysis jobs for ATS Resume Expert
+Long analyses run in a local worker pool and clients poll for the result by job ID.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Optional
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+class InMemoryJobStore:
+    """
+    Job store kept in process memory. Jobs are lost on restart.
+    """
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def save(self, job: dict):
+        with self._lock:
+            self._jobs[job["job_id"]] = dict(job)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def purge_finished_before(self, cutoff: float) -> int:
+        with self._lock:
+            expired = [job_id for job_id, job in self._jobs.items() if job["status"] in FINISHED_STATES and job["updated_at"] < cutoff]
+            for job_id in expired:
+                del self._jobs[job_id]
+            return len(expired)
+
+
+class SQLiteJobStore:
+    """
+    Job store backed by a SQLite file, so job status and results survive restarts.
+    """
+
+    def __init__(self, db_path: str):
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            "job_id TEXT PRIMARY KEY, status TEXT, analysis_type TEXT, "
+            "created_at REAL, updated_at REAL, result TEXT, error TEXT)"
+        )
+        self._db.commit()
+
+    def save(self, job: dict):
+        result = json.dumps(job["result"]) if job.get("result") is not None else None
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO jobs (job_id, status, analysis_type, created_at, updated_at, result, error) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job["job_id"], job["status"], job["analysis_type"], job["created_at"], job["updated_at"], result, job.get("error"))
+            )
+            self._db.commit()
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT job_id, status, analysis_type, created_at, updated_at, result, error FROM jobs WHERE job_id = ?",
+                (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "job_id": row[0],
+            "status": row[1],
+            "analysis_type": row[2],
+            "created_at": row[3],
+            "updated_at": row[4],
+            "result": json.loads(row[5]) if row[5] is not None else None,
+            "error": row[6]
+        }
+
+    def purge_finished_before(self, cutoff: float) -> int:
+        placeholders = ", ".join("?" for _ in FINISHED_STATES)
+        with self._lock:
+            cursor = self._db.execute(
+                f"DELETE FROM jobs WHERE status IN ({placeholders}) AND updated_at < ?",
+                (*FINISHED_STATES, cutoff)
+            )
+            self._db.commit()
+            return cursor.rowcount
+
+
+class JobManager:
+    """
+    Runs analysis coroutines as background tasks with at most max_workers running at once.
+    Finished jobs are purged from the store result_ttl_seconds after they finish.
+    """
+
+    def __init__(self, store, max_workers: int = 4, result_ttl_seconds: float = 3600):
+        self.store = store
+        self.max_workers = max_workers
+        self.result_ttl_seconds = result_ttl_seconds
+        self._semaphore = None
+        self._tasks = {}
+
+    def _update(self, job: dict, **fields):
+        job.update(fields, updated_at=time.time())
+        self.store.save(job)
+
+    def purge_expired(self):
+        if self.result_ttl_seconds > 0:
+            self.store.purge_finished_before(time.time() - self.result_ttl_seconds)
+
+    def submit(self, analysis_type: str, work) -> dict:
+        """
+        Queue a job
+
+        Args:
+            analysis_type: Analysis type recorded on the job
+            work: Zero-argument coroutine function returning a JSON-serializable result
+
+        Returns:
+            The queued job record
+        """
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        self.purge_expired()
+
+        now = time.time()
+        job = {
+            "job_id": uuid.uuid4().hex,
+            "status": QUEUED,
+            "analysis_type": analysis_type,
+            "created_at": now,
+            "updated_at": now,
+            "result": None,
+            "error": None
+        }
+        self.store.save(job)
+        self._tasks[job["job_id"]] = asyncio.create_task(self._run(job, work))
+        return dict(job)
+
+    async def _run(self, job: dict, work):
+        try:
+            async with self._semaphore:
+                self._update(job, status=RUNNING)
+                result = await work()
+            stored = self.store.get(job["job_id"])
+            if stored is not None and stored["status"] == CANCELLED:
+                return
+            self._update(job, status=COMPLETED, result=result)
+        except asyncio.CancelledError:
+            self._update(job, status=CANCELLED)
+        except Exception as e:
+            self._update(job, status=FAILED, error=str(getattr(e, "detail", e)))
+        finally:
+            self._tasks.pop(job["job_id"], None)
+
+    def get(self, job_id: str) -> Optional[dict]:
+        self.purge_expired()
+        return self.store.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[dict]:
+        """
+        Cancel a queued or running job. Finished jobs are returned unchanged.
+        """
+        job = self.store.get(job_id)
+        if job is None or job["status"] in FINISHED_STATES:
+            return job
+        task = self._tasks.get(job_id)
+        if task is not None:
+            task.cancel()
+        else:
+            # Job belongs to another worker or was lost on restart
+            job.update(status=CANCELLED, updated_at=time.time())
+            self.store.save(job)
+        job["status"] = CANCELLED
+        return job
+
+    def stats(self) -> dict:
+        return {"active_jobs": len(self._tasks), "max_workers": self.max_workers}
@@ -0,0 +1,217 @@
+"""
+Prometheus-style metrics for ATS Resume Expert
+Counters, gauges and histograms with labels, rendered in the Prometheus text exposition format
+so /metrics can be scraped without extra dependencies.
+"""
+
+import threading
+import time
+from typing import Callable, Optional
+
+# Histogram buckets in seconds, from fast local stages up to slow LLM calls
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        if not self.labelnames and self.kind in ("counter", "gauge"):
+            # Unlabelled series are exported as 0 before their first update
+            self._values[()] = 0
+
+    def _key(self, labels: dict) -> tuple:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: tuple) -> dict:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> list:
+        with self._lock:
+            return [(self.name, self._labels(key), value) for key, value in self._values.items()]
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing count
+    """
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down, such as requests in flight
+    """
+    kind = "gauge"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class _Timer:
+    """
+    Context manager that observes its duration on a histogram. The outcome label,
+    when the histogram has one, is "success", "timeout" for HTTP 504 errors or
+    "error" for other exceptions, unless the block sets timer.outcome itself.
+    """
+
+    def __init__(self, histogram, labels: dict):
+        self.histogram = histogram
+        self.labels = labels
+        self.outcome = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        labels = dict(self.labels)
+        if "outcome" in self.histogram.labelnames:
+            if exc is not None:
+                labels["outcome"] = "timeout" if getattr(exc, "status_code", None) == 504 else "error"
+            else:
+                labels["outcome"] = self.outcome or "success"
+        self.histogram.observe(time.perf_counter() - self.started, **labels)
+        return False
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values (durations in seconds) over cumulative buckets
+    """
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float("inf"),)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    entry["counts"][index] += 1
+                    break
+            entry["sum"] += value
+            entry["count"] += 1
+
+    def time(self, **labels) -> _Timer:
+        """
+        Time a block of code. The outcome label is filled in automatically.
+        """
+        return _Timer(self, labels)
+
+    def samples(self) -> list:
+        samples = []
+        with self._lock:
+            for key, entry in self._values.items():
+                labels = self._labels(key)
+                cumulative = 0
+                for bound, count in zip(self.buckets, entry["counts"]):
+                    cumulative += count
+                    samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+                samples.append((f"{self.name}_sum", labels, entry["sum"]))
+                samples.append((f"{self.name}_count", labels, entry["count"]))
+        return samples
+
+
+class _CallbackMetric:
+    """
+    Metric whose samples are read from a function at scrape time, for counters kept elsewhere
+    """
+
+    def __init__(self, name: str, kind: str, documentation: str, func: Callable):
+        self.name = name
+        self.kind = kind
+        self.documentation = documentation
+        self.func = func
+
+    def samples(self) -> list:
+        return [(self.name, labels, value) for labels, value in self.func()]
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together by /metrics
+    """
+
+    def __init__(self):
+        self._metrics = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames=(), buckets: Optional[tuple] = None) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets or DEFAULT_BUCKETS))
+
+    def callback(self, name: str, kind: str, documentation: str, func: Callable):
+        """
+        Register a metric computed at scrape time
+
+        Args:
+            name: Metric name
+            kind: "counter" or "gauge"
+            documentation: HELP text
+            func: Zero-argument function returning a list of (labels dict, value) pairs
+        """
+        return self._register(_CallbackMetric(name, kind, documentation, func))
+
+    def render(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
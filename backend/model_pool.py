@@ -0,0 +1,83 @@
+"""
+Pool of Gemini model clients for ATS Resume Expert
+Each API key gets its own configured client, so requests never touch genai.configure's global state.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+import google.ai.generativelanguage as glm
+import google.generativeai as genai
+
+
+class ModelPool:
+    """
+    Keyed pool of GenerativeModel instances bound to a single API key each.
+    Clients are reused across requests, evicted after idle_seconds without use,
+    and the least recently used client is dropped once max_clients is reached.
+    """
+
+    def __init__(self, model_name: str, max_clients: int = 64, idle_seconds: float = 900):
+        self.model_name = model_name
+        self.max_clients = max_clients
+        self.idle_seconds = idle_seconds
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.reused = 0
+        self.evicted = 0
+
+    def _build(self, api_key: str) -> genai.GenerativeModel:
+        model = genai.GenerativeModel(self.model_name)
+        # GenerativeModel falls back to the process-wide clients from genai.configure
+        # when these are unset, so give it clients that carry this key only
+        client_options = {"api_key": api_key}
+        model._client = glm.GenerativeServiceClient(client_options=client_options)
+        model._async_client = glm.GenerativeServiceAsyncClient(client_options=client_options)
+        return model
+
+    def _evict_idle(self, now: float):
+        while self._models:
+            key_hash, (_, last_used) = next(iter(self._models.items()))
+            if now - last_used <= self.idle_seconds and len(self._models) < self.max_clients:
+                break
+            del self._models[key_hash]
+            self.evicted += 1
+
+    def get(self, api_key: str) -> genai.GenerativeModel:
+        """
+        Get a model client bound to the given API key
+
+        Args:
+            api_key: Gemini API key the client should authenticate with
+
+        Returns:
+            A GenerativeModel that only uses this key
+        """
+        key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+        now = time.time()
+        with self._lock:
+            entry = self._models.get(key_hash)
+            if entry is not None:
+                model = entry[0]
+                self.reused += 1
+            else:
+                self._evict_idle(now)
+                model = self._build(api_key)
+                self.created += 1
+            self._models[key_hash] = (model, now)
+            self._models.move_to_end(key_hash)
+            return model
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "clients": len(self._models),
+                "max_clients": self.max_clients,
+                "idle_seconds": self.idle_seconds,
+                "created": self.created,
+                "reused": self.reused,
+                "evicted": self.evicted
+            }
@@ -0,0 +1,104 @@
+"""
+PDF text extraction for ATS Resume Expert
+Runs PyPDF2 in worker processes so CPU-bound parsing never blocks the event loop.
+Oversized, very long or slow documents are rejected instead of pinning a worker.
+"""
+
+import asyncio
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import PyPDF2 as pdf
+
+from token_budget import PAGE_BREAK
+
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_TIMEOUT_SECONDS = float(os.getenv("PDF_TIMEOUT_SECONDS", "20"))
+
+# Extra time the event loop waits before killing a worker that missed its own deadline
+KILL_GRACE_SECONDS = 2
+
+_pool = None
+
+
+class PdfLimitError(ValueError):
+    """
+    Raised when a PDF exceeds the configured size, page or time limits
+    """
+
+
+def extract_pdf_text(data: bytes, max_pages: int = 0, timeout_seconds: float = 0) -> str:
+    """
+    Extract text from every page of a PDF
+
+    Args:
+        data: Raw PDF bytes
+        max_pages: Reject documents with more pages than this (0 for no limit)
+        timeout_seconds: Stop extracting once this much time has passed (0 for no limit)
+
+    Returns:
+        Page texts, each followed by a newline and separated by form feeds (PAGE_BREAK)
+    """
+    started = time.monotonic()
+    reader = pdf.PdfReader(io.BytesIO(data))
+    page_count = len(reader.pages)
+    if max_pages and page_count > max_pages:
+        raise PdfLimitError(f"PDF has {page_count} pages. Maximum is {max_pages}")
+
+    def page_texts():
+        for page in reader.pages:
+            if timeout_seconds and time.monotonic() - started > timeout_seconds:
+                raise PdfLimitError(f"PDF text extraction took longer than {timeout_seconds:g} seconds")
+            yield f"{page.extract_text()}\n"
+
+    return PAGE_BREAK.join(page_texts())
+
+
+def get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+    return _pool
+
+
+def _reset_pool(pool: ProcessPoolExecutor):
+    # A worker stuck inside a single page never reaches its own deadline check,
+    # and ProcessPoolExecutor cannot cancel running work, so kill its processes
+    global _pool
+    if _pool is pool:
+        _pool = None
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False)
+
+
+async def extract_pdf_text_async(data: bytes) -> str:
+    """
+    Extract PDF text in the worker process pool, enforcing PDF_MAX_BYTES,
+    PDF_MAX_PAGES and PDF_TIMEOUT_SECONDS
+
+    Raises:
+        PdfLimitError: If the document exceeds one of the limits
+    """
+    if len(data) > PDF_MAX_BYTES:
+        raise PdfLimitError(f"PDF is {len(data)} bytes. Maximum is {PDF_MAX_BYTES}")
+
+    loop = asyncio.get_running_loop()
+    for attempt in range(2):
+        pool = get_pool()
+        future = loop.run_in_executor(pool, extract_pdf_text, data, PDF_MAX_PAGES, PDF_TIMEOUT_SECONDS)
+        try:
+            return await asyncio.wait_for(future, timeout=PDF_TIMEOUT_SECONDS + KILL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            _reset_pool(pool)
+            raise PdfLimitError(f"PDF text extraction took longer than {PDF_TIMEOUT_SECONDS:g} seconds")
+        except BrokenProcessPool:
+            # The pool was reset because another document timed out; retry once on a fresh pool
+            if attempt == 1:
+                raise
+            _reset_pool(pool)
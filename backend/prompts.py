@@ -286,6 +286,12 @@ ALL_ACTION_VERBS = []
 for category_verbs in ACTION_VERBS_BY_CATEGORY.values():
     ALL_ACTION_VERBS.extend(category_verbs)
 
+# Index of action verb -> categories it belongs to, in category order
+ACTION_VERB_INDEX = {}
+for category, category_verbs in ACTION_VERBS_BY_CATEGORY.items():
+    for verb in category_verbs:
+        ACTION_VERB_INDEX.setdefault(verb, []).append(category)
+
 # Prompt categories for different analysis types
 PROMPT_CATEGORIES = {
     "comprehensive_analysis": RESUME_ANALYSIS_PROMPT,
@@ -294,6 +300,14 @@ PROMPT_CATEGORIES = {
     "work_experience": WORK_EXPERIENCE_PROMPT,
 }
 
+# Resume sections each prompt category needs (see resume_sections.SECTION_HEADERS); None sends the whole resume
+PROMPT_SECTIONS = {
+    "comprehensive_analysis": None,
+    "summary_optimization": ["summary", "experience", "skills", "achievements"],
+    "skills_optimization": ["skills", "certifications", "projects"],
+    "work_experience": ["summary", "experience", "projects"],
+}
+
 def get_prompt(category: str) -> str:
     """
     Get a specific prompt by category
@@ -306,6 +320,18 @@ def get_prompt(category: str) -> str:
     """
     return PROMPT_CATEGORIES.get(category, RESUME_ANALYSIS_PROMPT)
 
+def get_prompt_sections(category: str):
+    """
+    Get the resume sections a prompt category needs
+    
+    Args:
+        category: The prompt category
+        
+    Returns:
+        List of section names, or None when the category needs the whole resume
+    """
+    return PROMPT_SECTIONS.get(category)
+
 def get_available_categories() -> list:
     """
     Get list of available prompt categories
@@ -0,0 +1,228 @@
+"""
+Per-API-key rate limiting for Gemini calls in ATS Resume Expert
+A token bucket per key paces calls, quota errors put the key into an exponential backoff
+with jitter, and retries draw on a budget so a throttled key is not hammered. Interactive
+calls go ahead of batch work, and calls that would wait too long are rejected up front.
+"""
+
+import asyncio
+import hashlib
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+
+from google.api_core import exceptions as google_exceptions
+
+# Priority lanes, lower goes first
+INTERACTIVE = 0
+BATCH = 1
+PRIORITIES = (INTERACTIVE, BATCH)
+
+# Shortest sleep while waiting for a token, so waiters do not spin
+MIN_POLL_SECONDS = 0.01
+
+
+class RateLimitExceeded(Exception):
+    """
+    Raised when a call would wait longer than its lane allows, or its key is still
+    being throttled by Gemini after the retries allowed for it
+
+    Args:
+        retry_after: Seconds after which the call is expected to succeed
+    """
+
+    def __init__(self, retry_after: float, message: str):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def is_rate_limit_error(error) -> bool:
+    """
+    Whether an exception from the Gemini SDK is a quota or rate limit (HTTP 429) error
+    """
+    if isinstance(error, google_exceptions.ResourceExhausted):
+        return True
+    message = str(error).lower()
+    return "429" in message or "quota" in message or "rate limit" in message
+
+
+class _KeyState:
+    def __init__(self, burst: float, retry_budget: float):
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.cooldown_until = 0.0
+        self.failures = 0
+        self.retry_tokens = retry_budget
+        self.waiting = [0] * len(PRIORITIES)
+
+
+class RateLimiter:
+    """
+    Token bucket scheduler keyed by the SHA-256 of the API key.
+
+    Each key may start requests_per_minute calls a minute with bursts of up to burst calls.
+    After a quota error the key cools down for backoff_base_seconds * 2^(failures - 1),
+    scaled by a random factor between 1 and 2 and capped at backoff_max_seconds. Every
+    retry spends one retry token; successful calls earn back retry_budget_ratio tokens,
+    up to retry_budget. A call whose expected wait exceeds max_wait_seconds for its lane
+    raises RateLimitExceeded instead of queueing.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 30,
+        burst: float = 5,
+        backoff_base_seconds: float = 2,
+        backoff_max_seconds: float = 60,
+        max_retries: dict = None,
+        max_wait_seconds: dict = None,
+        retry_budget: float = 10,
+        retry_budget_ratio: float = 0.2,
+        max_keys: int = 1024
+    ):
+        self.rate = requests_per_minute / 60
+        self.burst = max(burst, 1)
+        self.backoff_base_seconds = backoff_base_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.max_retries = max_retries or {INTERACTIVE: 2, BATCH: 3}
+        self.max_wait_seconds = max_wait_seconds or {INTERACTIVE: 10, BATCH: 300}
+        self.retry_budget = retry_budget
+        self.retry_budget_ratio = retry_budget_ratio
+        self.max_keys = max_keys
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+        self.rate_limited = 0
+        self.retries = 0
+        self.shed = 0
+
+    def _state(self, api_key: str) -> _KeyState:
+        key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+        with self._lock:
+            state = self._keys.get(key_hash)
+            if state is None:
+                # Forget the least recently used idle keys first
+                for old_hash in list(self._keys):
+                    if len(self._keys) < self.max_keys:
+                        break
+                    if not any(self._keys[old_hash].waiting):
+                        del self._keys[old_hash]
+                state = self._keys[key_hash] = _KeyState(self.burst, self.retry_budget)
+            self._keys.move_to_end(key_hash)
+            return state
+
+    def _refill(self, state: _KeyState, now: float):
+        if self.rate > 0:
+            state.tokens = min(self.burst, state.tokens + (now - state.updated) * self.rate)
+        state.updated = now
+
+    def _expected_wait(self, state: _KeyState, priority: int, now: float) -> float:
+        cooldown = max(state.cooldown_until - now, 0)
+        if self.rate <= 0:
+            return cooldown
+        # Calls in this lane and the lanes ahead of it take tokens first
+        ahead = sum(state.waiting[:priority + 1])
+        return cooldown + max(ahead - state.tokens, 0) / self.rate
+
+    async def acquire(self, api_key: str, priority: int = INTERACTIVE):
+        """
+        Wait until the key may start another call
+
+        Raises:
+            RateLimitExceeded: If the expected wait exceeds max_wait_seconds for the lane
+        """
+        state = self._state(api_key)
+        deadline = time.monotonic() + self.max_wait_seconds[priority]
+        state.waiting[priority] += 1
+        try:
+            while True:
+                now = time.monotonic()
+                self._refill(state, now)
+                higher_waiting = any(state.waiting[:priority])
+                if self.rate <= 0 and now >= state.cooldown_until and not higher_waiting:
+                    return
+                if now >= state.cooldown_until and not higher_waiting and state.tokens >= 1:
+                    state.tokens -= 1
+                    return
+                wait = self._expected_wait(state, priority, now)
+                if now + wait > deadline:
+                    self.shed += 1
+                    raise RateLimitExceeded(wait, f"Gemini rate limit reached for this API key. Retry after {math.ceil(wait)} seconds")
+                next_token = (1 - state.tokens) / self.rate if self.rate > 0 else 0
+                await asyncio.sleep(max(state.cooldown_until - now, next_token, MIN_POLL_SECONDS))
+        finally:
+            state.waiting[priority] -= 1
+
+    def record_success(self, api_key: str):
+        state = self._state(api_key)
+        state.failures = 0
+        state.retry_tokens = min(self.retry_budget, state.retry_tokens + self.retry_budget_ratio)
+
+    def record_rate_limited(self, api_key: str) -> float:
+        """
+        Put the key into backoff after a quota error
+
+        Returns:
+            Seconds until the key may be used again
+        """
+        state = self._state(api_key)
+        self.rate_limited += 1
+        now = time.monotonic()
+        if now < state.cooldown_until:
+            # Calls that were already in flight when the key was throttled do not extend the backoff
+            return state.cooldown_until - now
+        state.failures += 1
+        delay = min(self.backoff_base_seconds * (2 ** (state.failures - 1)), self.backoff_max_seconds) * (1 + random.random())
+        state.cooldown_until = now + delay
+        state.tokens = min(state.tokens, 0)
+        return delay
+
+    async def run(self, api_key: str, call, priority: int = INTERACTIVE):
+        """
+        Run a Gemini call under the key's rate limit, retrying quota errors with backoff
+
+        Args:
+            api_key: Key the call is billed to
+            call: Zero-argument coroutine function making the call
+            priority: INTERACTIVE or BATCH
+
+        Returns:
+            The call's result
+
+        Raises:
+            RateLimitExceeded: If the call was shed or its retries ran out
+        """
+        state = self._state(api_key)
+        attempt = 0
+        while True:
+            await self.acquire(api_key, priority)
+            try:
+                result = await call()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                cooldown = self.record_rate_limited(api_key)
+                if attempt >= self.max_retries[priority] or state.retry_tokens < 1:
+                    raise RateLimitExceeded(cooldown, f"Gemini quota exceeded for this API key. Retry after {math.ceil(cooldown)} seconds") from e
+                state.retry_tokens -= 1
+                attempt += 1
+                self.retries += 1
+                continue
+            self.record_success(api_key)
+            return result
+
+    def stats(self) -> dict:
+        with self._lock:
+            states = list(self._keys.values())
+        return {
+            "keys": len(states),
+            "requests_per_minute": self.rate * 60,
+            "burst": self.burst,
+            "waiting_interactive": sum(state.waiting[INTERACTIVE] for state in states),
+            "waiting_batch": sum(state.waiting[BATCH] for state in states),
+            "keys_in_backoff": sum(1 for state in states if state.cooldown_until > time.monotonic()),
+            "rate_limited": self.rate_limited,
+            "retries": self.retries,
+            "shed": self.shed
+        }
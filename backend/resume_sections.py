@@ -0,0 +1,73 @@
+"""
+Resume section segmentation for ATS Resume Expert
+Splits extracted resume text into canonical sections (summary, skills, experience, education, ...)
+so analysis types that only need part of the resume can send just those sections to the AI.
+"""
+
+from token_budget import clean_text, split_sections
+
+# Canonical section names and the headers that start them
+SECTION_HEADERS = {
+    "summary": ["summary", "professional summary", "career summary", "profile", "professional profile", "about me",
+                "objective", "career objective"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "competencies", "technologies",
+               "tools and technologies", "technical expertise", "areas of expertise", "skills and abilities"],
+    "experience": ["experience", "work experience", "professional experience", "employment history", "employment",
+                   "work history", "career history", "relevant experience", "internships", "internship experience"],
+    "education": ["education", "academic background", "academic qualifications", "educational qualifications",
+                  "education and training"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects", "selected projects"],
+    "certifications": ["certifications", "certificates", "licenses and certifications", "certifications and licenses",
+                       "courses", "training"],
+    "achievements": ["achievements", "accomplishments", "awards", "honors and awards", "awards and achievements",
+                     "publications"],
+    "other": ["interests", "hobbies", "hobbies and interests", "references", "languages", "volunteer",
+              "volunteering", "volunteer experience", "activities", "extracurricular activities",
+              "personal details", "personal information", "declaration"],
+}
+
+HEADER_TO_SECTION = {header: section for section, headers in SECTION_HEADERS.items() for header in headers}
+
+# Name, title and contact details before the first header
+HEADER_SECTION = "header"
+
+
+def segment_resume(resume_text: str) -> dict:
+    """
+    Split a resume into canonical sections
+
+    Args:
+        resume_text: Resume text extracted from the PDF
+
+    Returns:
+        Dict of section name to its text, in the order the sections appear. Repeated
+        sections (two "Projects" headers) are joined; text before the first header is
+        under "header".
+    """
+    sections = {}
+    for _, lines, section in split_sections(clean_text(resume_text), HEADER_TO_SECTION, HEADER_SECTION):
+        text = "\n".join(lines).strip()
+        if text:
+            sections[section] = f"{sections[section]}\n{text}" if section in sections else text
+    return sections
+
+
+def select_sections(sections: dict, needed) -> tuple:
+    """
+    Keep only the sections an analysis needs, plus the header
+
+    Args:
+        sections: Section map from segment_resume
+        needed: Section names, or None for the whole resume
+
+    Returns:
+        Tuple of (text, names of the sections kept). The text is None when the whole resume
+        should be sent: every section is needed, or none of the needed sections were found
+        (the resume has no recognizable headers).
+    """
+    if needed is None or not any(name in sections for name in needed):
+        return None, list(sections)
+    kept = [name for name in sections if name == HEADER_SECTION or name in needed]
+    if len(kept) == len(sections):
+        return None, kept
+    return "\n\n".join(sections[name] for name in kept), kept
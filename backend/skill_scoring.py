@@ -0,0 +1,157 @@
+"""
+Vectorized skill overlap scoring for ATS Resume Expert
+Keeps a sparse candidate-by-term matrix (one postings array of candidate rows and weights per
+skill or keyword) so a job description is scored against every stored candidate with a few NumPy
+operations instead of a Python loop per candidate.
+"""
+
+import threading
+
+import numpy as np
+
+from skills_matcher import KEYWORDS_AUTOMATON
+
+# Weight of a skill by the strongest resume section it appears in: skills used in experience or
+# projects count for more than skills only listed. Unknown sections (header, other) get DEFAULT_SECTION_WEIGHT.
+SECTION_WEIGHTS = {
+    "experience": 1.0,
+    "projects": 0.9,
+    "achievements": 0.9,
+    "skills": 0.8,
+    "certifications": 0.8,
+    "summary": 0.7,
+    "education": 0.6,
+}
+DEFAULT_SECTION_WEIGHT = 0.5
+
+INITIAL_ROWS = 1024
+
+
+def term_weights(sections: dict) -> dict:
+    """
+    Find the keywords and skills in each resume section and weight each by its best section
+
+    Args:
+        sections: Section map from resume_sections.segment_resume
+
+    Returns:
+        Dict of canonical term to weight between 0 and 1
+    """
+    weights = {}
+    for section, text in sections.items():
+        weight = SECTION_WEIGHTS.get(section, DEFAULT_SECTION_WEIGHT)
+        for term in KEYWORDS_AUTOMATON.find(text):
+            if weight > weights.get(term, 0):
+                weights[term] = weight
+    return weights
+
+
+class SkillMatrix:
+    """
+    Sparse matrix of candidates (rows) by terms (columns), stored column-wise: each term has
+    an array of the rows that contain it and their weights. Removing a candidate only clears
+    its row; the slot is not reused, so postings never need rewriting.
+    """
+
+    def __init__(self):
+        self._rows = {}
+        self._ids = []
+        self._row_terms = []
+        self._alive = np.zeros(INITIAL_ROWS, dtype=bool)
+        self._postings = {}
+        self._frozen = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, candidate_id: str, weights: dict) -> int:
+        """
+        Add or replace a candidate's term weights
+
+        Returns:
+            Row of the candidate
+        """
+        with self._lock:
+            self._remove(candidate_id)
+            row = len(self._ids)
+            if row == len(self._alive):
+                self._alive = np.concatenate([self._alive, np.zeros(len(self._alive), dtype=bool)])
+            self._rows[candidate_id] = row
+            self._ids.append(candidate_id)
+            self._row_terms.append(weights)
+            self._alive[row] = True
+            for term, weight in weights.items():
+                rows, values = self._postings.setdefault(term, ([], []))
+                rows.append(row)
+                values.append(weight)
+                self._frozen.pop(term, None)
+            return row
+
+    def _remove(self, candidate_id: str) -> bool:
+        row = self._rows.pop(candidate_id, None)
+        if row is None:
+            return False
+        self._alive[row] = False
+        self._row_terms[row] = {}
+        return True
+
+    def remove(self, candidate_id: str) -> bool:
+        with self._lock:
+            return self._remove(candidate_id)
+
+    def _column(self, term: str) -> tuple:
+        column = self._frozen.get(term)
+        if column is None:
+            rows, values = self._postings.get(term, ([], []))
+            column = self._frozen[term] = (np.array(rows, dtype=np.int64), np.array(values, dtype=np.float32))
+        return column
+
+    def score(self, terms: list) -> tuple:
+        """
+        Sum the weights and count the matches of the given terms for every row
+
+        Returns:
+            Tuple of (weighted, matched) arrays indexed by row; removed rows hold zeros
+        """
+        _, scores = self.score_many([terms])
+        return scores[0]
+
+    def score_many(self, term_lists: list) -> tuple:
+        """
+        Score several term lists against the same snapshot of the matrix, so every array
+        has the same length even while candidates are being added
+
+        Returns:
+            Tuple of (alive, scores): the alive mask and a (weighted, matched) tuple per term list
+        """
+        with self._lock:
+            size = len(self._ids)
+            alive = self._alive[:size].copy()
+            column_lists = [[self._column(term) for term in dict.fromkeys(terms)] for terms in term_lists]
+        scores = []
+        for columns in column_lists:
+            if not columns:
+                scores.append((np.zeros(size, dtype=np.float32), np.zeros(size, dtype=np.int64)))
+                continue
+            # Postings are append-only, so rows added after the snapshot are dropped by the slice
+            rows = np.concatenate([column[0] for column in columns])
+            values = np.concatenate([column[1] for column in columns])
+            weighted = np.bincount(rows, weights=values, minlength=size)[:size] * alive
+            matched = np.bincount(rows, minlength=size)[:size] * alive
+            scores.append((weighted, matched))
+        return alive, scores
+
+    def rows_for(self, candidate_ids) -> np.ndarray:
+        with self._lock:
+            return np.array([self._rows.get(candidate_id, -1) for candidate_id in candidate_ids], dtype=np.int64)
+
+    def alive(self) -> np.ndarray:
+        with self._lock:
+            return self._alive[:len(self._ids)].copy()
+
+    def candidate_id(self, row: int) -> str:
+        return self._ids[row]
+
+    def terms(self, row: int) -> dict:
+        return self._row_terms[row]
@@ -0,0 +1,355 @@
+"""
+Local keyword and technical skills matcher for ATS Resume Expert
+Finds known skills in a job description and resume with an Aho-Corasick automaton,
+normalizing aliases (e.g. "k8s" -> "Kubernetes"), so matching takes milliseconds without an AI call.
+"""
+
+import re
+from collections import deque
+
+# Canonical skill name -> aliases (matched case-insensitively, canonical name included automatically
+# unless it is listed in AMBIGUOUS_NAMES; surface forms in CONTEXT_TERMS need a technical context)
+TECHNICAL_SKILLS = {
+    # Languages
+    "Python": ["python3"],
+    "Java": ["java8", "java 8", "java 11", "java 17"],
+    # No bare "js": it would match the suffix of "React.js" or "Node.js"
+    "JavaScript": ["javascript", "es6", "ecmascript"],
+    "TypeScript": [],
+    "C++": ["cpp", "c plus plus"],
+    "C#": ["c sharp", "csharp"],
+    "Go": ["golang"],
+    "Rust": [],
+    "Ruby": [],
+    "PHP": [],
+    "Kotlin": [],
+    "Swift": [],
+    "Objective-C": ["objective c", "objc"],
+    "Scala": [],
+    "R": ["r programming", "rlang"],
+    "Dart": [],
+    "Bash": ["shell scripting", "shell script"],
+    "PowerShell": [],
+    "SQL": ["t-sql", "tsql", "pl/sql", "plsql"],
+    "HTML": ["html5"],
+    "CSS": ["css3"],
+    "Sass": ["scss"],
+    "GraphQL": [],
+    # Frontend
+    "React": ["react.js", "reactjs"],
+    "React Native": ["react-native"],
+    "Angular": ["angularjs", "angular.js"],
+    "Vue.js": ["vue", "vuejs"],
+    "Next.js": ["nextjs"],
+    "Nuxt.js": ["nuxt", "nuxtjs"],
+    "Svelte": [],
+    "Redux": [],
+    "jQuery": [],
+    "Tailwind CSS": ["tailwind", "tailwindcss"],
+    "Bootstrap": [],
+    "Webpack": [],
+    "Vite": [],
+    "Flutter": [],
+    # Backend
+    # No bare "node": it matches cluster nodes and graph nodes
+    "Node.js": ["nodejs", "node js"],
+    "Express.js": ["expressjs"],
+    "NestJS": ["nest.js"],
+    "Django": [],
+    "Flask": [],
+    "FastAPI": [],
+    # No bare "spring": it matches seasons ("spring 2021 internship")
+    "Spring Boot": ["springboot", "spring framework", "spring mvc"],
+    "Ruby on Rails": ["ror"],
+    ".NET": ["dotnet", "asp.net", ".net core", "dotnet core"],
+    "Laravel": [],
+    "REST APIs": ["restful", "rest api", "rest apis", "restful api", "restful apis"],
+    "gRPC": [],
+    "Microservices": ["microservice", "micro-services", "microservice architecture"],
+    "WebSockets": ["websocket"],
+    # Data stores
+    "PostgreSQL": ["postgres", "psql"],
+    "MySQL": [],
+    "SQLite": [],
+    "Microsoft SQL Server": ["sql server", "mssql", "ms sql"],
+    "Oracle Database": ["oracle db", "oracle"],
+    "MongoDB": ["mongo"],
+    "Redis": [],
+    "Cassandra": ["apache cassandra"],
+    "DynamoDB": ["dynamo db"],
+    "Elasticsearch": ["elastic search", "elk stack"],
+    "Snowflake": [],
+    "BigQuery": ["big query"],
+    "Firebase": ["firestore"],
+    # Cloud and DevOps
+    "AWS": ["amazon web services"],
+    "Azure": ["microsoft azure"],
+    "Google Cloud": ["gcp", "google cloud platform"],
+    "Docker": [],
+    "Kubernetes": ["k8s", "eks", "aks", "gke"],
+    "Helm": [],
+    "Terraform": [],
+    "Ansible": [],
+    "Pulumi": [],
+    "CloudFormation": ["aws cloudformation"],
+    "Jenkins": [],
+    "GitHub Actions": [],
+    "GitLab CI": ["gitlab ci/cd", "gitlab-ci"],
+    "CircleCI": ["circle ci"],
+    "CI/CD": ["ci cd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Linux": [],
+    "Nginx": [],
+    "Serverless": ["aws lambda", "lambda functions", "cloud functions"],
+    "Prometheus": [],
+    "Grafana": [],
+    "Datadog": [],
+    "Kafka": ["apache kafka"],
+    "RabbitMQ": [],
+    "Apache Spark": ["spark", "pyspark", "spark sql"],
+    "Airflow": ["apache airflow"],
+    "Hadoop": [],
+    # Data science and ML
+    "Machine Learning": ["ml"],
+    "Deep Learning": [],
+    "TensorFlow": [],
+    "PyTorch": [],
+    "scikit-learn": ["sklearn", "scikit learn"],
+    "Pandas": [],
+    "NumPy": [],
+    "NLP": ["natural language processing"],
+    "Computer Vision": [],
+    "LLMs": ["llm", "large language models", "large language model"],
+    "Data Analysis": ["data analytics"],
+    "Tableau": [],
+    "Power BI": ["powerbi"],
+    # Tools and practices
+    "Git": ["github", "gitlab", "bitbucket", "version control"],
+    "Jira": [],
+    "Unit Testing": ["unit tests", "tdd", "test-driven development"],
+    "Jest": [],
+    "Cypress": [],
+    "Selenium": [],
+    "Pytest": [],
+    "JUnit": [],
+    "OAuth": ["oauth2", "oauth 2.0"],
+    "System Design": ["distributed systems"],
+    "Data Structures": ["data structures and algorithms", "dsa"],
+    "Android": [],
+    "iOS": [],
+}
+
+# Non-technical keywords recruiters and ATS filters commonly look for
+GENERAL_KEYWORDS = {
+    "Agile": ["agile methodology", "agile methodologies"],
+    "Scrum": [],
+    "Kanban": [],
+    "Leadership": ["led a team", "team lead", "tech lead"],
+    "Mentoring": ["mentored", "mentorship", "coaching"],
+    "Communication": ["communication skills"],
+    "Collaboration": ["cross-functional", "cross functional", "teamwork"],
+    "Problem Solving": ["problem-solving"],
+    "Stakeholder Management": ["stakeholders"],
+    "Project Management": [],
+    "Code Review": ["code reviews"],
+    "Performance Optimization": ["performance tuning"],
+    "Security": ["application security", "cybersecurity"],
+    "Scalability": ["scalable"],
+    "Documentation": ["technical documentation"],
+    "Bachelor's Degree": ["bachelor's", "bachelors", "b.s.", "bsc", "b.tech", "btech"],
+    "Master's Degree": ["master's", "masters", "m.s.", "msc", "m.tech", "mtech"],
+}
+
+
+# Canonical names that are also everyday words or letters, so only their aliases are matched
+AMBIGUOUS_NAMES = {"Go", "R"}
+
+# Surface forms that are also everyday words ("react quickly", "at the helm", "swift delivery") or
+# names, matched only when a technical context follows: a list separator, the end of the text, a
+# version number, a word from CONTEXT_WORDS or another known term ("React, Redux", "Helm charts")
+CONTEXT_TERMS = {
+    "react", "swift", "bootstrap", "helm", "spark", "rust", "ruby", "dart", "flask", "flutter", "angular",
+    "jest", "cypress", "selenium", "pandas", "kafka", "snowflake", "airflow", "jenkins", "oracle",
+}
+CONTEXT_WORDS = {
+    "api", "apis", "app", "apps", "application", "applications", "backend", "charts", "chart", "cluster",
+    "clusters", "code", "codebase", "component", "components", "dags", "dataframes", "developer", "developers",
+    "development", "ecosystem", "engineer", "engineering", "engineers", "framework", "frameworks", "frontend",
+    "hooks", "jobs", "job", "libraries", "library", "migration", "pipeline", "pipelines", "programming",
+    "projects", "project", "query", "queries", "releases", "router", "sdk", "server", "services", "sql", "stack",
+    "streaming", "templates", "tests", "testing", "ui", "uis",
+}
+CONTEXT_SEPARATORS = set(",;:/|()[]{}.&+-\u2022")
+CONTEXT_CONNECTORS = {"and", "or"}
+NEXT_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_for_matching(text: str) -> str:
+    """
+    Lowercase and collapse whitespace so multi-word terms match across line breaks
+    """
+    return " ".join((text or "").lower().split())
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over lowercase terms. find() scans the text once and
+    returns the canonical names of every term that occurs as a whole word.
+    """
+
+    def __init__(self, terms: dict):
+        # terms maps surface form -> canonical name
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for surface, canonical in terms.items():
+            surface = normalize_for_matching(surface)
+            self._add(surface, (canonical, surface in CONTEXT_TERMS))
+        self._build_failure_links()
+
+    def _add(self, term: str, canonical: tuple):
+        state = 0
+        for char in term:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((len(term), canonical))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0) if state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _term_at(self, text: str, start: int) -> bool:
+        # Whether a known term (not itself needing context) starts at text[start]
+        state = 0
+        for index in range(start, len(text)):
+            state = self._goto[state].get(text[index])
+            if state is None:
+                return False
+            end = index + 1
+            if end == len(text) or not text[end].isalnum():
+                if any(term_length == end - start and not needs_context for term_length, (_, needs_context) in self._output[state]):
+                    return True
+        return False
+
+    def _in_context(self, text: str, end: int) -> bool:
+        position = end + 1 if text[end:end + 1] == " " else end
+        if position >= len(text) or text[position] in CONTEXT_SEPARATORS:
+            return True
+        word = NEXT_WORD_PATTERN.match(text, position)
+        if word is None:
+            return False
+        if word.group().isdigit() or word.group() in CONTEXT_WORDS or self._term_at(text, position):
+            return True
+        # "React and Redux", but not "react and respond"
+        return word.group() in CONTEXT_CONNECTORS and self._term_at(text, word.end() + 1)
+
+    def find(self, text: str, normalized: bool = False) -> list:
+        """
+        Find canonical terms in the text
+
+        Args:
+            text: Text to scan
+            normalized: Whether the text was already passed through normalize_for_matching
+
+        Returns:
+            Canonical names in order of first occurrence
+        """
+        if not normalized:
+            text = normalize_for_matching(text)
+        goto, fail, output = self._goto, self._fail, self._output
+        found = {}
+        state = 0
+        length = len(text)
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if not output[state]:
+                continue
+            end = index + 1
+            for term_length, (canonical, needs_context) in output[state]:
+                if canonical in found:
+                    continue
+                start = end - term_length
+                # Only accept whole words: "java" must not match inside "javascript"
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if end < length and text[end].isalnum():
+                    continue
+                if needs_context and not self._in_context(text, end):
+                    continue
+                found[canonical] = start
+        return sorted(found, key=found.get)
+
+
+def _surface_forms(dictionary: dict) -> dict:
+    terms = {}
+    for canonical, aliases in dictionary.items():
+        if canonical not in AMBIGUOUS_NAMES:
+            terms[canonical] = canonical
+        for alias in aliases:
+            terms[alias] = canonical
+    return terms
+
+
+# Built once at import
+SKILLS_AUTOMATON = KeywordAutomaton(_surface_forms(TECHNICAL_SKILLS))
+KEYWORDS_AUTOMATON = KeywordAutomaton(_surface_forms({**TECHNICAL_SKILLS, **GENERAL_KEYWORDS}))
+
+
+def _match(required: list, present: list) -> tuple:
+    present_set = set(present)
+    matched = [term for term in required if term in present_set]
+    missing = [term for term in required if term not in present_set]
+    percentage = int(len(matched) / len(required) * 100) if required else 0
+    return matched, missing, percentage
+
+
+def match_resume(job_description: str, resume_text: str) -> dict:
+    """
+    Compute keyword analysis and technical skills matching locally
+
+    Args:
+        job_description: Job description text
+        resume_text: Resume text
+
+    Returns:
+        Dict with keyword_analysis and technical_skills_matching shaped like the parsed AI response
+    """
+    job_text = normalize_for_matching(job_description)
+    resume = normalize_for_matching(resume_text)
+
+    job_keywords = KEYWORDS_AUTOMATON.find(job_text, normalized=True)
+    resume_keywords = KEYWORDS_AUTOMATON.find(resume, normalized=True)
+    keywords_found, missing_keywords, keyword_score = _match(job_keywords, resume_keywords)
+
+    skill_names = set(TECHNICAL_SKILLS)
+    required_skills = [term for term in job_keywords if term in skill_names]
+    matched_skills, missing_skills, skills_percentage = _match(required_skills, resume_keywords)
+
+    return {
+        "keyword_analysis": {
+            "keywords_found": keywords_found,
+            "missing_keywords": missing_keywords,
+            "match_score": keyword_score
+        },
+        "technical_skills_matching": {
+            "required_skills": required_skills,
+            "matched_skills": matched_skills,
+            "missing_skills": missing_skills,
+            "match_percentage": skills_percentage
+        }
+    }
@@ -0,0 +1,451 @@
+"""
+Structured JSON output for ATS Resume Expert analyses
+Builds a JSON schema per structured analysis type from the parser's field tables (the comprehensive
+analysis covers every field of ResumeAnalysisResponse, the work experience analysis only
+work_experience_matching), validates model output against it and renders validated data back to
+the markdown format of the type's prompt. Scores the model cannot determine stay null instead of
+getting defaults. For incremental re-analysis it also builds a schema and prompt covering only some
+fields, and rewrites those fields' lines in an existing analysis text.
+"""
+
+import json
+import math
+import re
+
+from analysis_parser import ACTION_VERB_LABELS, FIELD_TABLE, JOB_REQUIREMENT_SCORE_TABLE, SECTION_SCORE_TABLE, _suggestion_category
+
+# Scores and percentages; validation also checks they are within 0-100
+SCORE_SCHEMA = {"type": "integer", "nullable": True}
+
+# Schema types for the parser's field kinds
+KIND_SCHEMAS = {
+    "list": {"type": "array", "items": {"type": "string"}},
+    "percent": SCORE_SCHEMA,
+    "score": SCORE_SCHEMA,
+    "text": {"type": "string", "nullable": True},
+    "yes_no": {"type": "boolean", "nullable": True},
+}
+
+# Suffix written after a value of each field kind in the markdown layout
+KIND_SUFFIXES = {"percent": "%", "score": "/100"}
+
+# Longest raw output echoed back to the model in a repair prompt
+MAX_REPAIR_ECHO_CHARS = 12000
+
+FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def _object(properties: dict) -> dict:
+    return {"type": "object", "properties": properties, "required": list(properties)}
+
+
+def _field_groups() -> tuple:
+    groups = {}
+    overall_score = SCORE_SCHEMA
+    for _, group, name, _, kind in FIELD_TABLE:
+        if group == "overall":
+            overall_score = KIND_SCHEMAS[kind]
+            continue
+        groups.setdefault(group, {})[name] = KIND_SCHEMAS[kind]
+    return groups, overall_score
+
+
+def _build_schema() -> dict:
+    groups, overall_score = _field_groups()
+    groups["section_scores"] = {key: SCORE_SCHEMA for _, key, _ in SECTION_SCORE_TABLE}
+    groups["job_requirements_scores"] = {key: SCORE_SCHEMA for _, key, _ in JOB_REQUIREMENT_SCORE_TABLE}
+    groups["action_verb_analysis"] = {
+        "repeated_verbs": {"type": "array", "items": _object({"verb": {"type": "string"}, "count": {"type": "integer"}})},
+        "suggested_replacements": {"type": "array", "items": _object({
+            "original_verb": {"type": "string"},
+            "suggestions": {"type": "array", "items": {"type": "string"}}
+        })},
+        "verb_diversity_score": SCORE_SCHEMA,
+        "improvement_suggestions": {"type": "array", "items": {"type": "string"}},
+    }
+    properties = {"summary": {"type": "string"}, "overall_score": overall_score}
+    properties.update({group: _object(fields) for group, fields in groups.items()})
+    return _object(properties)
+
+
+def _build_work_experience_schema() -> dict:
+    groups, _ = _field_groups()
+    return _object({
+        "work_experience_matching": _object(groups["work_experience_matching"]),
+        **{name: {"type": "string"} for name in WRITTEN_FIELDS["work_experience"]},
+    })
+
+
+# Free-text fields of each analysis type and what the model should write in them (in markdown)
+WRITTEN_FIELDS = {
+    "comprehensive_analysis": {"summary": "the written analysis and recommendations"},
+    "work_experience": {
+        "experience_analysis": "the resume's total years, relevant areas, industry and role experience",
+        "gap_analysis": "the experience gaps and how to address them",
+        "recommendations": "recommendations for improving the work experience section",
+    },
+}
+
+# Schema of the structured fields of ResumeAnalysisResponse plus a short written summary
+ANALYSIS_SCHEMA = _build_schema()
+
+# Schema of each analysis type that can be answered in JSON
+ANALYSIS_SCHEMAS = {
+    "comprehensive_analysis": ANALYSIS_SCHEMA,
+    "work_experience": _build_work_experience_schema(),
+}
+
+JSON_OUTPUT_INSTRUCTIONS = """
+OUTPUT FORMAT (this replaces the markdown format described above):
+Respond with a single JSON object and nothing else, matching this JSON schema:
+{schema}
+Scores and percentages are integers from 0 to 100. Use null for any score or value you cannot
+determine from the resume and job description, and an empty list when nothing applies. Do not guess.
+{written}
+"""
+
+FIELD_UPDATE_PROMPT = """
+The resume was edited since it was last analyzed against this job description. The resume text
+above has only the sections needed: {sections}.
+Re-assess only the fields below for the edited resume. Their values for the earlier version were:
+{previous}
+
+Respond with a single JSON object and nothing else, matching this JSON schema:
+{schema}
+Scores and percentages are integers from 0 to 100. Keep an earlier value when the edit does not
+change it, and use null for any score or value you cannot determine. Do not guess.
+"""
+
+REPAIR_PROMPT = """
+Your previous response was not valid for the required JSON schema.
+Problems found:
+{errors}
+
+Previous response:
+{response}
+
+Return the corrected JSON object only, matching this JSON schema:
+{schema}
+"""
+
+
+def json_output_instructions(analysis_type: str) -> str:
+    """
+    Output format instructions appended to the prompt of an analysis type in ANALYSIS_SCHEMAS
+    """
+    written = "\n".join(f'Put {description}, in markdown, in "{name}".' for name, description in WRITTEN_FIELDS[analysis_type].items())
+    return JSON_OUTPUT_INSTRUCTIONS.format(schema=json.dumps(ANALYSIS_SCHEMAS[analysis_type], separators=(",", ":")), written=written)
+
+
+def field_update_schema(targets: dict) -> dict:
+    """
+    Schema of ANALYSIS_SCHEMA restricted to some fields
+
+    Args:
+        targets: Dict of group name (such as section_scores) to the names inside it to include;
+            names the schema does not have are left out
+
+    Returns:
+        JSON schema for an object holding only those groups and names
+    """
+    groups = ANALYSIS_SCHEMA["properties"]
+    return _object({
+        group: _object({name: groups[group]["properties"][name] for name in names if name in groups[group]["properties"]})
+        for group, names in targets.items()
+    })
+
+
+def build_field_update_prompt(previous: dict, sections: list, schema: dict) -> str:
+    """
+    Prompt asking the model to re-assess only the fields in schema for an edited resume
+
+    Args:
+        previous: Earlier ResumeAnalysisResponse as a dict
+        sections: Names of the resume sections sent with the prompt
+        schema: Schema from field_update_schema
+    """
+    earlier = {
+        group: {name: (previous.get(group) or {}).get(name) for name in fields["properties"]}
+        for group, fields in schema["properties"].items()
+    }
+    return FIELD_UPDATE_PROMPT.format(
+        sections=", ".join(sections),
+        previous=json.dumps(earlier, indent=2),
+        schema=json.dumps(schema, separators=(",", ":"))
+    )
+
+
+class StructuredOutputError(ValueError):
+    """
+    Raised when model output is not JSON matching the analysis type's schema
+
+    Args:
+        errors: Validation problems, one per string
+    """
+
+    def __init__(self, errors: list):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+def _validate(value, schema: dict, path: str, errors: list):
+    if value is None:
+        if not schema.get("nullable"):
+            errors.append(f"{path} must not be null")
+        return
+    expected = schema["type"]
+    if expected == "object":
+        if not isinstance(value, dict):
+            errors.append(f"{path} must be an object")
+            return
+        for name in schema["required"]:
+            if name not in value:
+                errors.append(f"{path}.{name} is missing")
+        for name, field_schema in schema["properties"].items():
+            if name in value:
+                _validate(value[name], field_schema, f"{path}.{name}", errors)
+    elif expected == "array":
+        if not isinstance(value, list):
+            errors.append(f"{path} must be a list")
+            return
+        for index, item in enumerate(value):
+            _validate(item, schema["items"], f"{path}[{index}]", errors)
+    elif expected == "integer":
+        # json.loads accepts NaN and Infinity, which int() cannot convert
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value) or value != int(value):
+            errors.append(f"{path} must be an integer")
+        elif schema is SCORE_SCHEMA and not 0 <= value <= 100:
+            errors.append(f"{path} must be between 0 and 100")
+    elif expected == "string":
+        if not isinstance(value, str):
+            errors.append(f"{path} must be a string")
+    elif expected == "boolean":
+        if not isinstance(value, bool):
+            errors.append(f"{path} must be true or false")
+
+
+def parse_structured_output(text: str, schema: dict = ANALYSIS_SCHEMA) -> dict:
+    """
+    Parse and validate a JSON analysis from the model
+
+    Args:
+        text: Raw model output, optionally wrapped in a ```json fence
+        schema: Schema the output must match (from ANALYSIS_SCHEMAS or field_update_schema)
+
+    Returns:
+        The validated analysis dict
+
+    Raises:
+        StructuredOutputError: If the output is not JSON or does not match the schema
+    """
+    text = FENCE_PATTERN.sub("", (text or "").strip())
+    start, end = text.find("{"), text.rfind("}")
+    if start == -1 or end < start:
+        raise StructuredOutputError(["response does not contain a JSON object"])
+    try:
+        data = json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError([f"invalid JSON: {e}"])
+    errors = []
+    _validate(data, schema, "$", errors)
+    if errors:
+        raise StructuredOutputError(errors)
+    return data
+
+
+def build_repair_prompt(text: str, error: StructuredOutputError, schema: dict = ANALYSIS_SCHEMA) -> str:
+    """
+    Prompt asking the model to fix its own output, listing the exact validation problems
+    """
+    return REPAIR_PROMPT.format(
+        errors="\n".join(f"- {problem}" for problem in error.errors[:20]),
+        response=(text or "")[:MAX_REPAIR_ECHO_CHARS],
+        schema=json.dumps(schema, separators=(",", ":"))
+    )
+
+
+def _without_nulls(fields: dict) -> dict:
+    return {name: value for name, value in fields.items() if value is not None}
+
+
+def structured_fields(data: dict) -> tuple:
+    """
+    Convert a validated analysis into the fields parse_analysis_response returns.
+    Values the model left null are omitted rather than replaced with defaults, and groups
+    the analysis type does not cover are empty, as when parsing its markdown.
+    """
+    action_verb_analysis = _without_nulls(data.get("action_verb_analysis", {}))
+    if action_verb_analysis:
+        action_verb_analysis["repeated_verbs"] = [
+            {"verb": item["verb"], "count": item["count"], "locations": []} for item in action_verb_analysis["repeated_verbs"]
+        ]
+        action_verb_analysis["suggested_replacements"] = [
+            {**item, "category": _suggestion_category(item["suggestions"])} for item in action_verb_analysis["suggested_replacements"]
+        ]
+    return (
+        _without_nulls(data.get("keyword_analysis", {})),
+        _without_nulls(data.get("section_scores", {})),
+        _without_nulls(data.get("job_requirements_scores", {})),
+        data.get("overall_score"),
+        _without_nulls(data.get("technical_skills_matching", {})),
+        _without_nulls(data.get("work_experience_matching", {})),
+        action_verb_analysis,
+    )
+
+
+def _format(value, suffix: str = "") -> str:
+    if value is None:
+        return "N/A"
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, list):
+        return ", ".join(value) if value else "None"
+    return f"{value}{suffix}"
+
+
+def _experience_matching_lines(experience: dict) -> list:
+    return [
+        "## EXPERIENCE MATCHING",
+        f"**Matched Experience**: {_format(experience['matched_experience'])}",
+        f"**Missing Experience**: {_format(experience['missing_experience'])}",
+        f"**Experience Level Match**: {_format(experience['experience_level_match'])}",
+        f"**Years Experience Match**: {_format(experience['years_experience_match'])}",
+        f"**Industry Relevance Score**: {_format(experience['industry_relevance'], '/100')}",
+    ]
+
+
+def _work_experience_markdown(data: dict) -> list:
+    experience = data["work_experience_matching"]
+    return [
+        "## WORK EXPERIENCE REQUIREMENTS",
+        f"**Required Experience Areas**: {_format(experience['required_experience'])}",
+        "",
+        "## RESUME EXPERIENCE ANALYSIS",
+        data["experience_analysis"].strip(),
+        "",
+        *_experience_matching_lines(experience),
+        "",
+        "## EXPERIENCE GAP ANALYSIS",
+        data["gap_analysis"].strip(),
+        "",
+        "## OPTIMIZATION RECOMMENDATIONS",
+        data["recommendations"].strip(),
+        "",
+        "## EXPERIENCE MATCH PERCENTAGE",
+        f"**Overall Experience Match**: {_format(experience['match_percentage'], '%')}",
+    ]
+
+
+def _comprehensive_markdown(data: dict) -> list:
+    keywords = data["keyword_analysis"]
+    skills = data["technical_skills_matching"]
+    experience = data["work_experience_matching"]
+    verbs = data["action_verb_analysis"]
+    lines = [
+        "## KEYWORD ANALYSIS",
+        f"**Job Description Keywords Found**: {_format(keywords['keywords_found'])}",
+        f"**Missing Keywords**: {_format(keywords['missing_keywords'])}",
+        f"**Keyword Match Score**: {_format(keywords['match_score'], '%')}",
+        "",
+        "## SECTION-WISE SCORING",
+    ]
+    lines += [f"- **{name}**: {_format(data['section_scores'][key], '/100')}" for name, key, _ in SECTION_SCORE_TABLE]
+    lines += ["", "## JOB REQUIREMENTS ANALYSIS"]
+    lines += [f"- **{name}**: {_format(data['job_requirements_scores'][key], '/100')}" for name, key, _ in JOB_REQUIREMENT_SCORE_TABLE]
+    lines += [
+        "",
+        "## TECHNICAL SKILLS MATCHING",
+        f"**Required Technical Skills**: {_format(skills['required_skills'])}",
+        f"**Matched Technical Skills**: {_format(skills['matched_skills'])}",
+        f"**Missing Technical Skills**: {_format(skills['missing_skills'])}",
+        f"**Technical Skills Match Percentage**: {_format(skills['match_percentage'], '%')}",
+        "",
+        "## WORK EXPERIENCE REQUIREMENTS",
+        f"**Required Experience Areas**: {_format(experience['required_experience'])}",
+        "",
+        *_experience_matching_lines(experience),
+        "",
+        "## ACTION VERB REPETITION ANALYSIS",
+        "**Repeated Action Verbs**: " + (", ".join(f"{item['verb']} ({item['count']})" for item in verbs["repeated_verbs"]) or "None"),
+        "**Verb Replacement Suggestions**: " + ("; ".join(
+            f"{item['original_verb']}: {', '.join(item['suggestions'])}" for item in verbs["suggested_replacements"]
+        ) or "None"),
+        f"**Verb Diversity Score**: {_format(verbs['verb_diversity_score'], '/100')}",
+        f"**Improvement Suggestions**: {_format(verbs['improvement_suggestions'])}",
+        "",
+        "## COMPREHENSIVE ANALYSIS",
+        data["summary"].strip(),
+        "",
+        "## EXPERIENCE MATCH PERCENTAGE",
+        f"**Overall Experience Match**: {_format(experience['match_percentage'], '%')}",
+        "",
+        "## OVERALL MATCH SCORE",
+        f"**Total Match Percentage**: {_format(data['overall_score'], '%')}",
+    ]
+    return lines
+
+
+MARKDOWN_RENDERERS = {
+    "comprehensive_analysis": _comprehensive_markdown,
+    "work_experience": _work_experience_markdown,
+}
+
+
+def to_markdown(data: dict, analysis_type: str = "comprehensive_analysis") -> str:
+    """
+    Render a validated analysis in the markdown layout of the analysis type's prompt, so clients
+    that display the analysis text (and parse_analysis_response) work unchanged
+    """
+    return "\n".join(MARKDOWN_RENDERERS[analysis_type](data))
+
+
+def _labelled_values(fields: dict) -> dict:
+    # Section header to {label: value as written in the markdown layout} for every value in fields
+    values = {}
+    for section, group, name, label, kind in FIELD_TABLE:
+        source = fields if group == "overall" else fields.get(group) or {}
+        if name in source:
+            values.setdefault(section, {})[label] = _format(source[name], KIND_SUFFIXES.get(kind, ""))
+    for section, group, table in (
+        ("SECTION-WISE SCORING", "section_scores", SECTION_SCORE_TABLE),
+        ("JOB REQUIREMENTS ANALYSIS", "job_requirements_scores", JOB_REQUIREMENT_SCORE_TABLE),
+    ):
+        scores = fields.get(group) or {}
+        for name, key, _ in table:
+            if key in scores:
+                values.setdefault(section, {})[f"**{name}**:"] = _format(scores[key], "/100")
+    verbs = fields.get("action_verb_analysis") or {}
+    if "repeated_verbs" in verbs:
+        repeated = ", ".join(f"{item['verb']} ({item['count']})" for item in verbs["repeated_verbs"]) or "None"
+        values.setdefault("ACTION VERB REPETITION ANALYSIS", {})[ACTION_VERB_LABELS["repeated"]] = repeated
+    if "verb_diversity_score" in verbs:
+        values.setdefault("ACTION VERB REPETITION ANALYSIS", {})[ACTION_VERB_LABELS["diversity"]] = _format(verbs["verb_diversity_score"], "/100")
+    return values
+
+
+def refresh_markdown_fields(text: str, fields: dict) -> str:
+    """
+    Rewrite the labelled lines of an analysis text (such as "**Missing Technical Skills**: ...")
+    with new values, so the text agrees with updated structured fields. Only lines under the
+    "## " section each field belongs to are rewritten; written prose is left as it is.
+
+    Args:
+        text: Analysis text in the markdown layout of the prompts
+        fields: ResumeAnalysisResponse fields to write, such as {"overall_score": 72, "section_scores": {...}}
+
+    Returns:
+        The text with the line of every given value that it has rewritten
+    """
+    values = _labelled_values(fields)
+    lines = text.split("\n")
+    section_values = {}
+    for index, line in enumerate(lines):
+        if line.startswith("## "):
+            section_values = values.get(line[3:].strip(), {})
+            continue
+        for label, value in section_values.items():
+            position = line.find(label)
+            if position != -1:
+                lines[index] = f"{line[:position + len(label)]} {value}"
+                break
+    return "\n".join(lines)
@@ -0,0 +1,239 @@
+"""
+Token budgeting for ATS Resume Expert prompts
+Counts tokens locally, cleans PyPDF2 output and trims lower-value resume and job description
+sections so a prompt fits a configurable budget before it is sent to Gemini.
+"""
+
+import re
+
+# Roughly one token per four characters of a word, the usual ratio for SentencePiece tokenizers
+TOKEN_PATTERN = re.compile(r"\w{1,4}|[^\w\s]")
+
+# Lines PyPDF2 emits for page furniture rather than content
+BOILERPLATE_PATTERNS = [
+    re.compile(r"^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$", re.IGNORECASE),
+    re.compile(r"^-+\s*\d{1,3}(\s*of\s*\d{1,3})?\s*-+$", re.IGNORECASE),
+    re.compile(r"^(resume|curriculum vitae|cv)$", re.IGNORECASE),
+    re.compile(r"^references (are )?available (up)?on request\.?$", re.IGNORECASE),
+]
+
+# Separator between the page texts of an extracted PDF
+PAGE_BREAK = "\f"
+
+# Lines at the top and bottom of each page that may be a running header or footer
+PAGE_EDGE_LINES = 2
+# Pages needed before a short line found once on every page counts as a running header or footer
+PAGE_REPEAT_MIN_PAGES = 3
+# Longest line treated as a running header or footer
+PAGE_FURNITURE_MAX_CHARS = 80
+
+# Characters from PDF fonts that carry no meaning for the model
+CHARACTER_REPLACEMENTS = {
+    "\u00a0": " ",   # non-breaking space
+    "\u00ad": "",    # soft hyphen
+    "\u200b": "",    # zero-width space
+    "\ufeff": "",    # byte order mark
+    "\uf0b7": "•",   # Symbol font bullets
+    "\uf0a7": "•",
+    "\uf076": "•",
+}
+
+# Section headers and how much they matter to the analysis. Sections with lower
+# values are removed first when a prompt is over budget; 3 is never removed.
+RESUME_SECTION_PRIORITY = {
+    "summary": 3, "professional summary": 3, "profile": 3, "objective": 3, "career objective": 3,
+    "experience": 3, "work experience": 3, "professional experience": 3, "employment history": 3, "work history": 3,
+    "skills": 3, "technical skills": 3, "core competencies": 3, "projects": 3, "personal projects": 3,
+    "achievements": 3, "accomplishments": 3,
+    "education": 2, "certifications": 2, "certificates": 2, "licenses and certifications": 2,
+    "publications": 2, "awards": 2, "honors and awards": 2, "training": 2,
+    "interests": 1, "hobbies": 1, "hobbies and interests": 1, "references": 1, "languages": 1,
+    "volunteer": 1, "volunteering": 1, "volunteer experience": 1, "activities": 1,
+    "extracurricular activities": 1, "personal details": 1, "personal information": 1, "declaration": 1,
+}
+
+JOB_SECTION_PRIORITY = {
+    "responsibilities": 3, "requirements": 3, "qualifications": 3, "what you will do": 3,
+    "what you'll do": 3, "key responsibilities": 3, "required skills": 3, "preferred qualifications": 3,
+    "nice to have": 2, "about the role": 2, "the role": 2,
+    "about us": 1, "about the company": 1, "who we are": 1, "our mission": 1, "benefits": 1,
+    "perks": 1, "perks and benefits": 1, "what we offer": 1, "compensation": 1, "salary": 1,
+    "equal opportunity": 1, "equal opportunity employer": 1, "eeo statement": 1, "how to apply": 1,
+}
+
+TRUNCATION_MARKER = "[... trimmed to fit token budget]"
+
+
+def count_tokens(text: str) -> int:
+    """
+    Approximate the Gemini token count of a text without calling the API
+    """
+    return len(TOKEN_PATTERN.findall(text or ""))
+
+
+def _page_furniture(pages: list) -> set:
+    """
+    Find running headers and footers: short lines that repeat among the top lines (or the bottom
+    lines) of at least two pages, or that appear exactly once on every page of a longer document
+    """
+    if len(pages) < 2:
+        return set()
+    tops, bottoms, per_page = {}, {}, []
+    for page in pages:
+        keys = [" ".join(line.split()).lower() for line in page.splitlines()]
+        keys = [key for key in keys if key and len(key) <= PAGE_FURNITURE_MAX_CHARS and any(char.isalnum() for char in key)]
+        for edge, edge_keys in ((tops, keys[:PAGE_EDGE_LINES]), (bottoms, keys[-PAGE_EDGE_LINES:])):
+            for key in set(edge_keys):
+                edge[key] = edge.get(key, 0) + 1
+        counts = {}
+        for key in keys:
+            counts[key] = counts.get(key, 0) + 1
+        per_page.append(counts)
+    furniture = {key for edge in (tops, bottoms) for key, count in edge.items() if count >= 2}
+    if len(pages) >= PAGE_REPEAT_MIN_PAGES:
+        furniture.update(key for key, count in per_page[0].items() if count == 1 and all(counts.get(key) == 1 for counts in per_page[1:]))
+    return furniture
+
+
+def clean_text(text: str) -> str:
+    """
+    Normalize whitespace, drop page numbers and similar PDF boilerplate, and keep only the first
+    copy of running page headers and footers. Pages are separated by PAGE_BREAK; other repeated
+    lines (a second job with the same title, a repeated bullet) are content and are kept.
+
+    Args:
+        text: Resume or job description text
+
+    Returns:
+        Cleaned text with at most one blank line between paragraphs
+    """
+    for char, replacement in CHARACTER_REPLACEMENTS.items():
+        text = (text or "").replace(char, replacement)
+
+    furniture = _page_furniture(text.split(PAGE_BREAK))
+    lines = []
+    seen = set()
+    blank = True
+    for line in text.splitlines():
+        line = " ".join(line.split())
+        if not line:
+            if not blank:
+                lines.append("")
+            blank = True
+            continue
+        if any(pattern.match(line) for pattern in BOILERPLATE_PATTERNS):
+            continue
+        key = line.lower()
+        if key in furniture:
+            if key in seen:
+                continue
+            seen.add(key)
+        lines.append(line)
+        blank = False
+    return "\n".join(lines).strip()
+
+
+def _header_key(line: str) -> str:
+    return " ".join(re.sub(r"[^a-z' ]", " ", line.lower().replace("&", " and ")).split())
+
+
+def split_sections(text: str, priorities: dict, default=3) -> list:
+    """
+    Split text into sections at lines that match a known header
+
+    Args:
+        text: Cleaned text
+        priorities: Header (lowercase, as returned by _header_key) to the value stored for its section
+        default: Value for the text before the first header
+
+    Returns:
+        List of [header, lines, value]
+    """
+    sections = [[None, [], default]]
+    for line in text.split("\n"):
+        key = _header_key(line)
+        if key in priorities and len(line) <= 40:
+            sections.append([line, [line], priorities[key]])
+        else:
+            sections[-1][1].append(line)
+    return [section for section in sections if section[1]]
+
+
+def _join(sections: list) -> str:
+    return "\n".join(line for _, lines, _ in sections for line in lines).strip()
+
+
+def _truncate(text: str, max_tokens: int) -> str:
+    kept = []
+    used = count_tokens(TRUNCATION_MARKER)
+    for line in text.split("\n"):
+        used += count_tokens(line)
+        if used > max_tokens:
+            kept.append(TRUNCATION_MARKER)
+            break
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def fit_to_budget(job_description: str, resume_text: str, instructions: str, budget: int) -> tuple:
+    """
+    Clean the job description and resume and trim them until the prompt fits the token budget.
+    Whole low-priority sections are removed first (job description boilerplate, then hobbies,
+    references and similar resume sections, then education and certifications); if that is
+    not enough both texts are cut off at a line boundary.
+
+    Args:
+        job_description: Job description text
+        resume_text: Resume text extracted from the PDF
+        instructions: Analysis prompt, which is never trimmed
+        budget: Maximum prompt tokens (0 to only clean the texts)
+
+    Returns:
+        Tuple of (job_description, resume_text, report) where report has the budget,
+        original_tokens, prompt_tokens, tokens_saved and the trimmed_sections
+    """
+    instruction_tokens = count_tokens(instructions)
+    original_tokens = count_tokens(job_description) + count_tokens(resume_text) + instruction_tokens
+
+    documents = {
+        "job_description": split_sections(clean_text(job_description), JOB_SECTION_PRIORITY),
+        "resume": split_sections(clean_text(resume_text), RESUME_SECTION_PRIORITY),
+    }
+    texts = {name: _join(sections) for name, sections in documents.items()}
+    trimmed = []
+
+    def total():
+        return instruction_tokens + sum(count_tokens(text) for text in texts.values())
+
+    if budget > 0:
+        for priority in (1, 2):
+            for name, sections in documents.items():
+                for section in sorted(sections, key=lambda section: -count_tokens("\n".join(section[1]))):
+                    if total() <= budget:
+                        break
+                    if section[2] != priority:
+                        continue
+                    sections.remove(section)
+                    texts[name] = _join(sections)
+                    trimmed.append(f"{name}: {section[0]}")
+
+        if total() > budget:
+            available = max(budget - instruction_tokens, 0)
+            names = sorted(texts, key=lambda name: count_tokens(texts[name]))
+            for index, name in enumerate(names):
+                # The smaller text may use up to half of what is left, the larger one the rest
+                allowance = available // (len(names) - index)
+                if count_tokens(texts[name]) > allowance:
+                    texts[name] = _truncate(texts[name], allowance)
+                    trimmed.append(f"{name}: truncated")
+                available -= count_tokens(texts[name])
+
+    prompt_tokens = total()
+    report = {
+        "budget": budget,
+        "original_tokens": original_tokens,
+        "prompt_tokens": prompt_tokens,
+        "tokens_saved": max(original_tokens - prompt_tokens, 0),
+        "trimmed_sections": trimmed
+    }
+    return texts["job_description"], texts["resume"], report
@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { AnalysisResult } from '../types';
+import { AnalysisResult, MultiAnalysisResult } from '../types';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000';
 
@@ -50,6 +50,39 @@ export const analyzeResume = async (
   }
 };
 
+export const analyzeResumeMulti = async (
+  jobDescription: string,
+  resumeFile: File,
+  analysisTypes: string[],
+  apiKey?: string
+): Promise<MultiAnalysisResult> => {
+  const formData = new FormData();
+  formData.append('job_description', jobDescription);
+  formData.append('resume_file', resumeFile);
+  
+  // Add API key if provided
+  if (apiKey) {
+    formData.append('api_key', apiKey);
+  }
+
+  // Repeat the query parameter once per analysis type
+  const params = new URLSearchParams();
+  analysisTypes.forEach((analysisType) => params.append('analysis_types', analysisType));
+
+  try {
+    const response = await api.post<MultiAnalysisResult>('/analyze-resume-multi', formData, { params });
+    return response.data;
+  } catch (error: any) {
+    if (error.response) {
+      throw new Error(error.response.data.detail || 'Failed to analyze resume');
+    } else if (error.request) {
+      throw new Error('No response from server. Please ensure the backend is running.');
+    } else {
+      throw new Error('Error setting up the request');
+    }
+  }
+};
+
 export const validateApiKey = async (apiKey: string): Promise<{valid: boolean, message: string}> => {
   try {
     const response = await jsonApi.post('/validate-api-key', { api_key: apiKey });
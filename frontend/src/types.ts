@@ -56,6 +56,25 @@ export interface AnalysisResult {
     match_percentage?: number;
   };
   action_verb_analysis?: ActionVerbAnalysis;
+  semantic_match_score?: number;
+  analysis_tier?: 'local' | 'light' | 'full';
+  provisional_score?: number;
+  incremental?: {
+    base_analyzed_at: number;
+    change_ratio: number;
+    changed_sections: string[];
+    recomputed_fields: string[];
+    reanalyzed_fields: string[];
+    reused_fields: string[];
+  };
+  token_budget?: {
+    budget: number;
+    original_tokens: number;
+    prompt_tokens: number;
+    tokens_saved: number;
+    trimmed_sections: string[];
+    resume_sections?: string[];
+  };
 }
 
 export interface AnalysisCategory {
@@ -136,3 +155,9 @@ export const ANALYSIS_CATEGORIES: AnalysisCategory[] = [
     description: 'Analyze marketing-related skills and experience'
   }
 ];
+
+export interface MultiAnalysisResult {
+  status: string;
+  results: Record<string, AnalysisResult>;
+  errors: Record<string, string>;
+}